@@ -0,0 +1,521 @@
+"""
+trading_bot.backtest.engine
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Vektörel geçmiş veri backtest motoru.
+
+Herhangi bir BaseStrategy alt sınıfını, sembol başına verilen 1m OHLCV
+dizileri üzerinde canlı botla aynı kurallarla çalıştırır:
+
+  * Yüksek timeframe'ler 1m veriden epoch hizalı kovalarla türetilir
+    (RESAMPLE_FROM_1M ile aynı); her adımda son satır, kovanın o ana
+    kadarki kısmi mumudur — gelecekteki mum verisi stratejiye sızmaz.
+  * Strateji, stratejinin INVALIDATING_TIMEFRAMES'indeki en küçük timeframe'in
+    her mum kapanışında değerlendirilir (SCAN_MODE=event). Adımlar
+    evaluate_batch ile parça parça, (adım, maxlen, 6) pencereleri halinde işlenir.
+  * Çıkışlar PositionWatcher._check_all_positions kurallarıyla (önce TP, sonra SL,
+    sonra TIMEOUT) ileri fiyat pencereleri üzerinde vektörel çözülür.
+    intrabar=True ise TP/SL mumun high/low değerleriyle, aksi halde kapanışlarla kontrol edilir.
+    Aynı mumda hem TP'ye hem SL'ye değilip hangisinin önce geldiği bilinemiyorsa
+    ambiguous politikası uygulanır (varsayılan "sl" — muhafazakâr); bu çıkışlar
+    sonuçta ayrıca sayılır.
+  * Sembol başına tek açık pozisyon ve COOLDOWN_MINUTES kuralı uygulanır.
+
+Çıktı, canlı botun veritabanına yazdığı SignalRecord / TradeRecord /
+MarketSnapshot satırlarıyla aynı biçimde üretilebilir.
+
+Kullanım:
+    engine = BacktestEngine(config, "ema_volume_strategy.EmaVolumeStrategy")
+    result = engine.run({"BTCUSDT": candles_1m, "ETHUSDT": ...})
+    print(result.summary())
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Dict
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from core.logger import get_logger
+from data.memory_store import (
+    BASE_TIMEFRAME,
+    CLOSE,
+    HIGH,
+    LOW,
+    OPEN,
+    TS,
+    VOLUME,
+    MarketSlice,
+    MemoryStore,
+    timeframe_ms,
+)
+from models.db_models import MarketSnapshot, SignalRecord, TradeRecord
+from strategies.base_strategy import BaseStrategy, Signal
+from strategies.loader import load_strategy
+
+if TYPE_CHECKING:
+    from core.config import TradingConfig
+
+logger = get_logger(__name__)
+
+_COLUMNS = 6
+
+
+# ── Sonuç Yapıları ────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class BacktestTrade:
+    """Kapanmış sanal pozisyon (TradeRecord karşılığı)."""
+    signal: Signal
+    close_reason: str        # "TP" | "SL" | "TIMEOUT"
+    close_price: float
+    pnl_percent: float
+    closed_at: datetime
+    ambiguous: bool = False  # aynı mumda TP ve SL; neden ambiguous politikasıyla seçildi
+
+
+@dataclass
+class BacktestResult:
+    """
+    Backtest çıktısı.
+
+    signals: Pozisyon açan sinyaller (zaman sırasıyla)
+    trades:  Kapanan pozisyonlar; veri sonunda hâlâ açık olanlar yer almaz
+    """
+    strategy: str
+    signals: list[Signal]
+    trades: list[BacktestTrade]
+    steps: int
+    elapsed_sec: float
+    ambiguous: str = "sl"
+
+    def summary(self) -> dict:
+        """Toplam işlem, kazanma oranı, ortalama/toplam PnL ve maksimum düşüş (yüzde puan)."""
+        pnl = np.array([t.pnl_percent for t in self.trades], dtype=np.float64)
+        equity = np.cumsum(pnl)
+        drawdown = np.maximum.accumulate(np.r_[0.0, equity])[1:] - equity if len(pnl) else pnl
+        reasons = [t.close_reason for t in self.trades]
+        return {
+            "strategy": self.strategy,
+            "signals": len(self.signals),
+            "trades": len(pnl),
+            "open": len(self.signals) - len(pnl),
+            "win_rate": round(float((pnl > 0).mean()) * 100, 2) if len(pnl) else 0.0,
+            "avg_pnl": round(float(pnl.mean()), 4) if len(pnl) else 0.0,
+            "total_pnl": round(float(pnl.sum()), 4),
+            "max_drawdown": round(float(drawdown.max()), 4) if len(pnl) else 0.0,
+            "tp": reasons.count("TP"),
+            "sl": reasons.count("SL"),
+            "timeout": reasons.count("TIMEOUT"),
+            "ambiguous": self.ambiguous,
+            "ambiguous_exits": sum(t.ambiguous for t in self.trades),
+            "steps": self.steps,
+            "elapsed_sec": round(self.elapsed_sec, 2),
+        }
+
+    def to_records(self) -> tuple[list[SignalRecord], list[TradeRecord], list[MarketSnapshot]]:
+        """
+        Canlı botun yazdığı ORM satırlarıyla aynı biçimde kayıtlar üretir
+        (id'ler 1'den başlayarak atanır; session.add_all ile ayrı bir DB'ye yazılabilir).
+        """
+        signals, snapshots = [], []
+        ids: Dict[int, int] = {}
+        for i, sig in enumerate(self.signals, start=1):
+            ids[id(sig)] = i
+            signals.append(SignalRecord(
+                id=i,
+                symbol=sig.symbol,
+                strategy=sig.strategy or None,
+                side=sig.side,
+                entry_price=sig.entry_price,
+                tp_price=sig.tp_price,
+                sl_price=sig.sl_price,
+                spike_ratio=sig.spike_ratio,
+                created_at=sig.timestamp,
+            ))
+            snapshots.append(MarketSnapshot(
+                signal_id=i,
+                ema_fast_value=sig.ema_fast_value,
+                ema_slow_value=sig.ema_slow_value,
+                current_volume=sig.current_volume,
+                avg_volume=sig.avg_volume,
+                candle_data_json=None,
+            ))
+        trades = [
+            TradeRecord(
+                signal_id=ids[id(t.signal)],
+                close_reason=t.close_reason,
+                close_price=t.close_price,
+                pnl_percent=t.pnl_percent,
+                closed_at=t.closed_at,
+            )
+            for t in self.trades
+        ]
+        return signals, trades, snapshots
+
+
+# ── Motor ─────────────────────────────────────────────────────────────
+
+class BacktestEngine:
+    """
+    Stratejiyi geçmiş 1m mumları üzerinde tekrar oynatır.
+
+    Args:
+        config: Strateji ve risk parametreleri (TIME_STOP_HOURS, COOLDOWN_MINUTES …)
+        strategy: "modül.Sınıf" yolu veya BaseStrategy alt sınıfı
+        intrabar: True → TP/SL mum high/low ile, False → sadece kapanışla kontrol edilir
+        ambiguous: Aynı mumda hem TP hem SL görülürse seçilecek çıkış ("sl" | "tp")
+        maxlen: Stratejiye verilen pencere uzunluğu (canlı MemoryStore ile aynı)
+        chunk_size: evaluate_batch'e tek seferde verilen adım sayısı (bellek/hız dengesi)
+    """
+
+    def __init__(
+        self,
+        config: TradingConfig,
+        strategy: str | type[BaseStrategy],
+        *,
+        intrabar: bool = True,
+        ambiguous: str = "sl",
+        maxlen: int = 200,
+        chunk_size: int = 4096,
+    ) -> None:
+        if ambiguous not in _AMBIGUOUS:
+            raise ValueError(f"ambiguous 'sl' veya 'tp' olmalı: {ambiguous!r}")
+        self._config = config
+        self._intrabar = intrabar
+        self._ambiguous = ambiguous
+        self._maxlen = maxlen
+        self._chunk_size = chunk_size
+        # Stratejinin okuduğu store: fiyat yok → giriş fiyatı adımın kapanışı olur
+        self._store = MemoryStore(maxlen=maxlen)
+        if isinstance(strategy, str):
+            self._strategy = load_strategy(config, self._store, strategy)
+        else:
+            if not issubclass(strategy, BaseStrategy):
+                raise TypeError(f"{strategy.__name__} sınıfı BaseStrategy'den türetilmemiş.")
+            self._strategy = strategy(config, self._store)
+
+        self._base_ms = timeframe_ms(BASE_TIMEFRAME)
+        for tf in self._strategy.REQUIRED_TIMEFRAMES:
+            if timeframe_ms(tf) % self._base_ms:
+                raise ValueError(f"{tf} timeframe'i {BASE_TIMEFRAME} verisinden türetilemez.")
+        self._step_tf = min(self._strategy.invalidating_timeframes, key=timeframe_ms)
+
+    @property
+    def strategy(self) -> BaseStrategy:
+        return self._strategy
+
+    def run(self, data: dict[str, np.ndarray]) -> BacktestResult:
+        """
+        Args:
+            data: {sembol: shape=(N, 6) 1m OHLCV}, zaman sıralı (boşluklar olabilir)
+
+        Senkron çalışır; event loop içinden çağrılacaksa run_in_executor kullanın.
+        """
+        started = time.perf_counter()
+        signals: list[Signal] = []
+        trades: list[BacktestTrade] = []
+        steps = 0
+
+        for symbol, candles in data.items():
+            candles = np.asarray(candles, dtype=np.float64)
+            if len(candles) < 2:
+                continue
+            sym_signals, sym_trades, sym_steps = self._run_symbol(symbol, candles)
+            signals.extend(sym_signals)
+            trades.extend(sym_trades)
+            steps += sym_steps
+
+        signals.sort(key=lambda s: (s.timestamp, s.symbol))
+        trades.sort(key=lambda t: (t.closed_at, t.signal.symbol))
+        result = BacktestResult(
+            strategy=self._strategy.name,
+            signals=signals,
+            trades=trades,
+            steps=steps,
+            elapsed_sec=time.perf_counter() - started,
+            ambiguous=self._ambiguous,
+        )
+        logger.info("backtest_complete", symbols=len(data), **result.summary())
+        return result
+
+    # ── Sinyal Üretimi ────────────────────────────────────────────────
+
+    def _run_symbol(
+        self, symbol: str, base: np.ndarray
+    ) -> tuple[list[Signal], list[BacktestTrade], int]:
+        frames = {
+            tf: _Resampled(base, timeframe_ms(tf), self._base_ms, self._maxlen)
+            for tf in self._strategy.REQUIRED_TIMEFRAMES
+        }
+        step_frame = frames.get(self._step_tf) or _Resampled(
+            base, timeframe_ms(self._step_tf), self._base_ms, self._maxlen
+        )
+        steps = step_frame.close_steps()
+
+        # Etiketler parça içi satır numaralarıdır; sinyaller satıra geri eşlenir
+        labels = [str(j) for j in range(self._chunk_size)]
+        candidates: list[tuple[int, Signal]] = []
+        for start in range(0, len(steps), self._chunk_size):
+            rows = steps[start:start + self._chunk_size]
+            market = {
+                tf: MarketSlice(tf, labels[:len(rows)], *frame.windows(rows))
+                for tf, frame in frames.items()
+            }
+            for sig in self._evaluate(market):
+                row = int(rows[int(sig.symbol)])
+                close_ms = base[row, TS] + self._base_ms
+                candidates.append((row, replace(
+                    sig,
+                    symbol=symbol,
+                    strategy=self._strategy.name,
+                    timestamp=datetime.fromtimestamp(close_ms / 1000, tz=timezone.utc),
+                )))
+
+        candidates.sort(key=lambda c: c[0])
+        signals, trades = self._resolve(base, candidates)
+        return signals, trades, len(steps)
+
+    def _evaluate(self, market: dict[str, MarketSlice]) -> list[Signal]:
+        if self._strategy.supports_batch:
+            return self._strategy.evaluate_batch(market)
+        return self._evaluate_rows(market)
+
+    def _evaluate_rows(self, market: dict[str, MarketSlice]) -> list[Signal]:
+        """Toplu API'si olmayan stratejiler: pencereler store'a yüklenip evaluate() çağrılır (yavaş yol)."""
+        store = self._store
+        labels = next(iter(market.values())).symbols
+
+        async def _run() -> list[Signal]:
+            signals = []
+            for i, label in enumerate(labels):
+                for tf, part in market.items():
+                    store.drop_candles_nowait(label, tf)
+                    count = int(part.counts[i])
+                    if count:
+                        store.load_history_nowait(label, tf, part.candles[i, -count:])
+                sig = await self._strategy.evaluate(label)
+                if sig is not None:
+                    signals.append(sig)
+            return signals
+
+        return asyncio.run(_run())
+
+    # ── Çıkış Çözümü (PositionWatcher Kuralları) ──────────────────────
+
+    def _resolve(
+        self, base: np.ndarray, candidates: list[tuple[int, Signal]]
+    ) -> tuple[list[Signal], list[BacktestTrade]]:
+        """
+        Tüm aday sinyallerin çıkışlarını vektörel hesaplar, ardından zaman sırasıyla
+        açık pozisyon ve cooldown kuralını uygular.
+        """
+        if not candidates:
+            return [], []
+        cfg = self._config
+        rows = np.array([row for row, _ in candidates], dtype=np.int64)
+        sigs = [sig for _, sig in candidates]
+        exit_row, reason, price, ambiguous = _resolve_exits(
+            base,
+            rows,
+            np.array([s.side == "LONG" for s in sigs]),
+            np.array([s.tp_price for s in sigs], dtype=np.float64),
+            np.array([s.sl_price for s in sigs], dtype=np.float64),
+            time_stop_ms=cfg.time_stop_hours * 3_600_000,
+            base_ms=self._base_ms,
+            intrabar=self._intrabar,
+            ambiguous=self._ambiguous,
+        )
+
+        cooldown_ms = cfg.cooldown_minutes * 60_000
+        close_ms = base[:, TS] + self._base_ms
+        signals: list[Signal] = []
+        trades: list[BacktestTrade] = []
+        busy_until = -np.inf       # açık pozisyonun kapanış anı (veri sonunda açıksa +inf)
+        cooldown_until = -np.inf
+        for k, sig in enumerate(sigs):
+            opened = close_ms[rows[k]]
+            if opened < busy_until or opened < cooldown_until:
+                continue
+            signals.append(sig)
+            cooldown_until = opened + cooldown_ms
+            if reason[k] == _OPEN:
+                busy_until = np.inf
+                continue
+            busy_until = close_ms[exit_row[k]]
+            close_price = float(price[k])
+            if sig.side == "LONG":
+                pnl_pct = ((close_price - sig.entry_price) / sig.entry_price) * 100
+            else:
+                pnl_pct = ((sig.entry_price - close_price) / sig.entry_price) * 100
+            trades.append(BacktestTrade(
+                signal=sig,
+                close_reason=_REASONS[reason[k]],
+                close_price=close_price,
+                pnl_percent=round(pnl_pct, 4),
+                closed_at=datetime.fromtimestamp(busy_until / 1000, tz=timezone.utc),
+                ambiguous=bool(ambiguous[k]),
+            ))
+        return signals, trades
+
+
+# ── Vektörel Yardımcılar ──────────────────────────────────────────────
+
+_OPEN, _TP, _SL, _TIMEOUT = 0, 1, 2, 3
+_REASONS = {_TP: "TP", _SL: "SL", _TIMEOUT: "TIMEOUT"}
+_AMBIGUOUS = ("sl", "tp")
+
+
+def _resolve_exits(
+    base: np.ndarray,
+    rows: np.ndarray,
+    is_long: np.ndarray,
+    tp: np.ndarray,
+    sl: np.ndarray,
+    *,
+    time_stop_ms: int,
+    base_ms: int,
+    intrabar: bool,
+    ambiguous: str = "sl",
+    batch: int = 2048,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Girişi rows[i] mumunun kapanışında olan pozisyonların çıkışını bulur.
+
+    Her pozisyon için sonraki K mum (K = zaman stopunu kapsayan mum sayısı)
+    (n, K) pencerelerinde değerlendirilir; her mumda sıra watcher ile aynıdır:
+    TP → SL → TIMEOUT. intrabar modunda seviyeye değildiyse seviyeden,
+    mum seviyenin ötesinde açıldıysa açılıştan dolum varsayılır.
+
+    Aynı mum hem TP'ye hem SL'ye değiyorsa: mum seviyelerden birinin ötesinde
+    açıldıysa o seviye önce gelmiştir; aksi halde sıra bilinemez ve
+    ambiguous ("sl" | "tp") seçilir.
+
+    Returns:
+        (çıkış mumu indeksi, neden kodu, çıkış fiyatı, belirsiz mi) — veri
+        bitene kadar kapanmayanlar _OPEN ile işaretlenir.
+    """
+    n = len(rows)
+    horizon = max(int(np.ceil(time_stop_ms / base_ms)), 1)
+    exit_row = np.full(n, -1, dtype=np.int64)
+    reason = np.full(n, _OPEN, dtype=np.int8)
+    price = np.full(n, np.nan)
+    unclear = np.zeros(n, dtype=bool)
+    last = len(base) - 1
+    offsets = np.arange(1, horizon + 1)
+
+    for a in range(0, n, batch):
+        r = rows[a:a + batch]
+        idx = r[:, None] + offsets[None, :]
+        valid = idx <= last
+        idx = np.minimum(idx, last)
+        window = base[idx]                                   # (b, K, 6)
+        entry_close = base[r, TS] + base_ms
+        long_ = is_long[a:a + batch, None]
+        tp_, sl_ = tp[a:a + batch, None], sl[a:a + batch, None]
+
+        up = window[:, :, HIGH] if intrabar else window[:, :, CLOSE]
+        down = window[:, :, LOW] if intrabar else window[:, :, CLOSE]
+        tp_hit = np.where(long_, up >= tp_, down <= tp_) & valid
+        sl_hit = np.where(long_, down <= sl_, up >= sl_) & valid
+        elapsed = window[:, :, TS] + base_ms - entry_close[:, None]
+        timeout_hit = (elapsed >= time_stop_ms) & valid
+
+        any_hit = tp_hit | sl_hit | timeout_hit
+        hit = any_hit.any(axis=1)
+        k = np.argmax(any_hit, axis=1)
+        b = np.arange(len(r))
+        at_tp, at_sl = tp_hit[b, k], sl_hit[b, k]
+        both = at_tp & at_sl
+        lv = is_long[a:a + batch]
+        tp_b, sl_b = tp[a:a + batch], sl[a:a + batch]
+        open_px = window[b, k, OPEN]
+        if intrabar:
+            # Seviyenin ötesinde açılan mumda o seviye kesin olarak önce gelmiştir
+            gap_tp = np.where(lv, open_px >= tp_b, open_px <= tp_b)
+            gap_sl = np.where(lv, open_px <= sl_b, open_px >= sl_b)
+        else:
+            gap_tp = gap_sl = np.zeros(len(r), dtype=bool)
+        tp_first = gap_tp | (~gap_sl & (ambiguous == "tp"))
+        at_tp = at_tp & (~at_sl | tp_first)
+        at_sl = at_sl & ~at_tp
+        code = np.where(at_tp, _TP, np.where(at_sl, _SL, _TIMEOUT)).astype(np.int8)
+
+        close_px = window[b, k, CLOSE]
+        if intrabar:
+            tp_fill = np.where(lv, np.maximum(open_px, tp_b), np.minimum(open_px, tp_b))
+            sl_fill = np.where(lv, np.minimum(open_px, sl_b), np.maximum(open_px, sl_b))
+            px = np.where(at_tp, tp_fill, np.where(at_sl, sl_fill, close_px))
+        else:
+            px = close_px
+
+        exit_row[a:a + batch] = np.where(hit, idx[b, k], -1)
+        reason[a:a + batch] = np.where(hit, code, _OPEN)
+        price[a:a + batch] = np.where(hit, px, np.nan)
+        unclear[a:a + batch] = hit & both & ~gap_tp & ~gap_sl
+
+    return exit_row, reason, price, unclear
+
+
+class _Resampled:
+    """
+    1m verisinden türetilmiş tek bir timeframe.
+
+    Her 1m satırı için ait olduğu kova (group) ve o satıra kadarki kısmi mum
+    (partial) tutulur; kapanmış kovalar ayrı bir dizide (closed) toplanır.
+    """
+
+    def __init__(self, base: np.ndarray, tf_ms: int, base_ms: int, maxlen: int) -> None:
+        self.maxlen = maxlen
+        ts = base[:, TS]
+        bucket = ts - ts % tf_ms
+        is_start = np.r_[True, bucket[1:] != bucket[:-1]]
+        starts = np.flatnonzero(is_start)
+        self.group = np.cumsum(is_start) - 1
+        ends = np.r_[starts[1:], len(base)] - 1
+        # Kovanın son dakikası mevcutsa kapanmıştır (sondaki yarım kova ve boşluklu kovalar hariç)
+        self._steps = ends[ts[ends] + base_ms >= bucket[ends] + tf_ms]
+
+        self._full: np.ndarray | None = None
+        if tf_ms == base_ms:
+            # Temel timeframe: pencere doğrudan 1m dizisinin kayan görünümü (kopyasız)
+            padded = np.vstack([np.full((maxlen - 1, _COLUMNS), np.nan), base])
+            self._full = sliding_window_view(padded, (maxlen, _COLUMNS))[:, 0]
+            return
+
+        # Kova içi kısmi high/low/volume: (kova, dakika) ızgarasında birikimli
+        slot = ((ts - bucket) // base_ms).astype(np.int64)
+        grid_shape = (len(starts), tf_ms // base_ms)
+        partial = base.copy()
+        partial[:, TS] = bucket
+        partial[:, OPEN] = base[starts[self.group], OPEN]
+        for col, fill, acc in ((HIGH, -np.inf, np.maximum), (LOW, np.inf, np.minimum), (VOLUME, 0.0, np.add)):
+            grid = np.full(grid_shape, fill)
+            grid[self.group, slot] = base[:, col]
+            partial[:, col] = acc.accumulate(grid, axis=1)[self.group, slot]
+        self.partial = partial
+
+        # Kapanmış kovalar: her kovanın son satırındaki kısmi mum = tam mum
+        padded = np.vstack([np.full((maxlen - 1, _COLUMNS), np.nan), partial[ends]])
+        self._windows = sliding_window_view(padded, (maxlen - 1, _COLUMNS))[:, 0]
+
+    def close_steps(self) -> np.ndarray:
+        """Bu timeframe'de mumun kapandığı 1m satırları."""
+        return self._steps
+
+    def windows(self, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """rows adımları için sağa hizalı (len(rows), maxlen, 6) pencereler ve geçerli uzunluklar."""
+        groups = self.group[rows]
+        counts = np.minimum(groups, self.maxlen - 1) + 1
+        if self._full is not None:
+            if rows[-1] - rows[0] + 1 == len(rows):
+                return self._full[rows[0]:rows[-1] + 1], counts
+            return self._full[rows], counts
+        candles = np.empty((len(rows), self.maxlen, _COLUMNS))
+        candles[:, :-1] = self._windows[groups]
+        candles[:, -1] = self.partial[rows]
+        candles.flags.writeable = False
+        return candles, counts
@@ -0,0 +1,269 @@
+"""
+trading_bot.backtest.replay
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Kaydedilmiş canlı akışı (FEED_RECORD_DIR) gerçek pipeline üzerinden tekrar oynatır.
+
+Canlı bottaki bileşenlerin aynıları kurulur — MemoryStore, stratejiler,
+strateji tarama döngüsü (SCAN_MODE'a göre), SignalDispatcher ve
+PositionWatcher — sadece WebSocket istemcisinin yerini FeedReplayClient alır.
+Tüm bileşenler kayıttaki alım zamanlarıyla ilerleyen bir VirtualClock
+paylaşır: cooldown'lar, zaman stopları, tarama aralıkları ve
+Signal.timestamp oynatma hızından bağımsız olarak kayıttaki zamanla işler.
+Telegram gönderimi kapalıdır, sinyaller ayrı bir veritabanına yazılır.
+
+  * Regresyon: bir günlük trafiği dakikalar içinde oynatıp üretilen sinyal
+    kümesini --out ile JSONL olarak kaydedin; başka bir kod sürümünün
+    çıktısıyla --compare ile karşılaştırın.
+  * Yük testi: --speed max ile pipeline gerçek piyasanın çok üzerindeki
+    mesaj hızlarında çalıştırılır (replay_complete logunda msg_per_sec).
+
+Karşılaştırma (strateji, sembol, yön, Signal.timestamp dakikası) üzerinden yapılır.
+
+Kullanım:
+    python -m backtest.replay --feed feed_log --speed 60 --out signals.jsonl \
+        [--start 2026-10-16T00:00] [--end 2026-10-17T00:00] [--symbols BTCUSDT,ETHUSDT] \
+        [--compare baseline.jsonl] [--db sqlite+aiosqlite:///replay.db] [--no-preload]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from dataclasses import replace
+from datetime import datetime, timezone
+from pathlib import Path
+
+import aiohttp
+
+from core.clock import VirtualClock
+from core.config import TradingConfig
+from core.database import close_db, init_db
+from core.logger import get_logger, setup_logging
+from data.kline_cache import KlineCache
+from data.memory_store import MemoryStore, split_timeframes, timeframe_ms
+from data.replay import FeedReplayClient, first_frame_ms, recorded_symbols
+from data.rest_client import RateBudget
+from execution.position_watcher import PositionWatcher
+from execution.signal_dispatcher import SignalDispatcher
+from main import select_scan_loop
+from strategies.base_strategy import Signal
+from strategies.indicator_cache import IndicatorCache
+from strategies.indicator_engine import IndicatorEngine
+from strategies.loader import load_strategies, required_timeframes
+
+logger = get_logger(__name__)
+
+# Preload'da oynatma başlangıcından önce yüklenen kapanmış mum sayısı
+_PRELOAD_CANDLES = 250
+# Kayıt bittikten sonra son kapanış olaylarının işlenmesi için verilen süre
+_DRAIN_SECONDS = 1.0
+
+
+class _RecordingDispatcher(SignalDispatcher):
+    """Gönderilen sinyalleri bellekte de tutar."""
+
+    def __init__(self, config: TradingConfig, watcher: PositionWatcher, clock: VirtualClock) -> None:
+        super().__init__(config, watcher, clock=clock)
+        self.sent: list[dict] = []
+
+    async def dispatch(self, signal: Signal) -> None:
+        self.sent.append({
+            "strategy": signal.strategy,
+            "symbol": signal.symbol,
+            "side": signal.side,
+            "timestamp": signal.timestamp.isoformat(),
+            "entry_price": signal.entry_price,
+            "tp_price": signal.tp_price,
+            "sl_price": signal.sl_price,
+            "spike_ratio": signal.spike_ratio,
+        })
+        await super().dispatch(signal)
+
+
+async def run_replay(
+    config: TradingConfig,
+    directory: str | Path,
+    *,
+    speed: float = 1.0,
+    start_ms: int | None = None,
+    end_ms: int | None = None,
+    symbols: list[str] | None = None,
+    preload: bool = True,
+) -> list[dict]:
+    """
+    Kaydı canlı pipeline üzerinden oynatır ve gönderilen sinyalleri döndürür.
+
+    config.db_url sinyal/işlem kayıtlarının yazılacağı veritabanıdır;
+    Telegram gönderimi her zaman kapatılır.
+    """
+    config = replace(config, telegram_bot_token="")
+    scan_loop = select_scan_loop(config)
+    first_ms = first_frame_ms(directory, start_ms)
+    if first_ms is None:
+        logger.warning("replay_empty", directory=str(directory))
+        return []
+    symbols = symbols or recorded_symbols(directory, start_ms)
+
+    await init_db(config.db_url)
+    clock = VirtualClock(first_ms / 1000)
+    store = MemoryStore(maxlen=200, columnar=config.columnar_store)
+    watcher = PositionWatcher(config, store, clock=clock)
+
+    strategies = load_strategies(config, store)
+    required_tfs = required_timeframes(strategies)
+    indicator_engine = IndicatorEngine(store, clock=clock)
+    indicator_cache = IndicatorCache(max_bytes=config.indicator_cache_mb * 1024 * 1024)
+    for strategy in strategies:
+        strategy.attach_indicator_engine(indicator_engine)
+        strategy.attach_indicator_cache(indicator_cache)
+        strategy.attach_clock(clock)
+
+    stream_tfs = required_tfs
+    if config.resample_from_1m:
+        stream_tfs, derived_tfs = split_timeframes(required_tfs)
+        store.enable_resampling(derived_tfs)
+    preload_tfs = list(dict.fromkeys([*stream_tfs, *required_tfs]))
+
+    if preload:
+        await _preload_before(config, store, symbols, preload_tfs, first_ms)
+
+    client = FeedReplayClient(
+        config, store, symbols, directory,
+        speed=speed, start_ms=start_ms, end_ms=end_ms, timeframes=stream_tfs, clock=clock,
+    )
+    dispatcher = _RecordingDispatcher(config, watcher, clock)
+
+    feed = asyncio.create_task(client.start(), name="replay")
+    tasks = [
+        asyncio.create_task(watcher.run(), name="position_watcher"),
+        asyncio.create_task(
+            scan_loop(
+                config, strategies, dispatcher, watcher, store, symbols, indicator_cache, clock=clock
+            ),
+            name="scan_loop",
+        ),
+    ]
+    try:
+        await feed
+        await asyncio.sleep(_DRAIN_SECONDS)
+    finally:
+        await client.stop()
+        await watcher.stop()
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await close_db()
+
+    logger.info("replay_signals", count=len(dispatcher.sent), frames=client.frames)
+    return dispatcher.sent
+
+
+async def _preload_before(
+    config: TradingConfig,
+    store: MemoryStore,
+    symbols: list[str],
+    timeframes: list[str],
+    first_ms: int,
+) -> None:
+    """Oynatma başlangıcından önceki kapanmış mumları kline önbelleğinden (gerekirse REST) yükler."""
+    cache = KlineCache(config.kline_cache_dir or "kline_cache", budget=RateBudget(config.rest_weight_per_minute))
+    async with aiohttp.ClientSession() as session:
+        for tf in timeframes:
+            step = timeframe_ms(tf)
+            # Başlangıç anında henüz kapanmamış mum akıştan gelir
+            end = first_ms - first_ms % step
+            for symbol in symbols:
+                try:
+                    candles = await cache.fetch_range(
+                        session, symbol, tf, end - _PRELOAD_CANDLES * step, end
+                    )
+                except Exception as e:
+                    logger.warning("replay_preload_failed", symbol=symbol, timeframe=tf, error=str(e))
+                    continue
+                if len(candles):
+                    store.load_history_nowait(symbol, tf, candles)
+    await cache.flush_async()
+    logger.info("replay_preload_complete", symbols=len(symbols), timeframes=timeframes, kline_cache=cache.stats())
+
+
+# ── Sinyal Karşılaştırma ──────────────────────────────────────────────
+
+def _signal_key(sig: dict) -> tuple:
+    minute = sig["timestamp"][:16]   # YYYY-MM-DDTHH:MM
+    return (sig["strategy"], sig["symbol"], sig["side"], minute)
+
+
+def compare_signals(current: list[dict], baseline: list[dict]) -> dict:
+    """İki oynatmanın sinyal kümelerini (strateji, sembol, yön, sinyal dakikası) üzerinden karşılaştırır."""
+    cur = {_signal_key(s) for s in current}
+    base = {_signal_key(s) for s in baseline}
+    return {
+        "matched": len(cur & base),
+        "only_current": sorted(cur - base),
+        "only_baseline": sorted(base - cur),
+    }
+
+
+def _load_jsonl(path: str) -> list[dict]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _parse_time(value: str | None) -> int | None:
+    """Epoch ms veya ISO 8601 (UTC varsayılır) zamanı ms'ye çevirir."""
+    if not value:
+        return None
+    if value.isdigit():
+        return int(value)
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1000)
+
+
+# ── Komut Satırı ──────────────────────────────────────────────────────
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Kaydedilmiş akışı canlı pipeline üzerinden oynatır")
+    parser.add_argument("--feed", default=None, help="Kayıt dizini (varsayılan: FEED_RECORD_DIR)")
+    parser.add_argument("--speed", default="1", help="Hız çarpanı (1, 60, …) veya 'max'")
+    parser.add_argument("--start", default=None, help="Başlangıç (epoch ms veya ISO, UTC)")
+    parser.add_argument("--end", default=None, help="Bitiş (epoch ms veya ISO, UTC)")
+    parser.add_argument("--symbols", default=None, help="Virgülle ayrılmış semboller (varsayılan: kayıttakiler)")
+    parser.add_argument("--db", default="sqlite+aiosqlite:///replay.db", help="Sinyal/işlem veritabanı")
+    parser.add_argument("--out", default=None, help="Gönderilen sinyallerin yazılacağı JSONL dosyası")
+    parser.add_argument("--compare", default=None, help="Karşılaştırılacak önceki --out çıktısı")
+    parser.add_argument("--no-preload", action="store_true", help="Başlangıç öncesi geçmiş mumları yükleme")
+    args = parser.parse_args()
+
+    config = TradingConfig()
+    setup_logging(config.log_level)
+    directory = args.feed or config.feed_record_dir
+    if not directory:
+        parser.error("--feed veya FEED_RECORD_DIR gerekli")
+
+    signals = asyncio.run(run_replay(
+        replace(config, db_url=args.db),
+        directory,
+        speed=0.0 if args.speed == "max" else float(args.speed),
+        start_ms=_parse_time(args.start),
+        end_ms=_parse_time(args.end),
+        symbols=[s.strip().upper() for s in args.symbols.split(",") if s.strip()] if args.symbols else None,
+        preload=not args.no_preload,
+    ))
+    print(f"{len(signals)} sinyal")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            for sig in signals:
+                f.write(json.dumps(sig) + "\n")
+    if args.compare:
+        diff = compare_signals(signals, _load_jsonl(args.compare))
+        print(f"eşleşen: {diff['matched']}")
+        for label in ("only_current", "only_baseline"):
+            for key in diff[label]:
+                print(f"{label}: {' '.join(key)}")
+
+
+if __name__ == "__main__":
+    main()
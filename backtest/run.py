@@ -0,0 +1,95 @@
+"""
+trading_bot.backtest.run
+~~~~~~~~~~~~~~~~~~~~~~~~~
+Backtest komut satırı aracı ve geçmiş veri yükleyici.
+
+1m mumlar önce diskteki kline önbelleğinden (KLINE_CACHE_DIR) okunur;
+sadece önbelleğin kapsamadığı aralıklar REST'ten paralel sayfalarla
+(REST_WEIGHT_PER_MINUTE bütçesiyle) çekilip önbelleğe akıtılır.
+
+Kullanım:
+    python -m backtest.run --symbols BTCUSDT,ETHUSDT --days 30 \
+        [--strategy ema_volume_strategy.EmaVolumeStrategy] [--close-only]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import aiohttp
+import numpy as np
+
+from backtest.engine import BacktestEngine
+from core.config import TradingConfig
+from core.logger import get_logger, setup_logging
+from data.kline_cache import KlineCache
+from data.memory_store import BASE_TIMEFRAME
+from data.rest_client import RateBudget
+
+logger = get_logger(__name__)
+
+
+async def load_candles(
+    symbols: list[str],
+    start_ms: int,
+    end_ms: int,
+    cache: KlineCache,
+    max_concurrent: int = 4,
+) -> dict[str, np.ndarray]:
+    """Sembollerin [start_ms, end_ms) aralığındaki kapanmış 1m mumları (önbellek öncelikli)."""
+    semaphore = asyncio.Semaphore(max_concurrent)
+    data: dict[str, np.ndarray] = {}
+
+    async with aiohttp.ClientSession() as session:
+        async def _load(symbol: str) -> None:
+            async with semaphore:
+                try:
+                    data[symbol] = await cache.fetch_range(
+                        session, symbol, BASE_TIMEFRAME, start_ms, end_ms
+                    )
+                except Exception as e:
+                    logger.error("backtest_data_failed", symbol=symbol, error=str(e))
+
+        await asyncio.gather(*[_load(s) for s in symbols])
+    await cache.flush_async()
+
+    logger.info("backtest_data_loaded", symbols=len(data), kline_cache=cache.stats())
+    return {s: data[s] for s in symbols if s in data}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Geçmiş veri üzerinde strateji backtest'i")
+    parser.add_argument("--symbols", required=True, help="Virgülle ayrılmış semboller")
+    parser.add_argument("--days", type=float, default=30)
+    parser.add_argument("--strategy", default=None, help="modül.Sınıf (varsayılan: ACTIVE_STRATEGY'nin ilki)")
+    parser.add_argument("--close-only", action="store_true", help="TP/SL sadece kapanışlarla kontrol edilir")
+    parser.add_argument("--ambiguous", default="sl", choices=("sl", "tp"),
+                        help="Aynı mumda hem TP hem SL görülürse seçilecek çıkış")
+    args = parser.parse_args()
+
+    config = TradingConfig()
+    setup_logging(config.log_level)
+
+    end_ms = int(time.time() * 1000)
+    start_ms = end_ms - int(args.days * 86_400_000)
+    symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
+    cache = KlineCache(
+        config.kline_cache_dir or "kline_cache",
+        budget=RateBudget(config.rest_weight_per_minute),
+    )
+
+    data = asyncio.run(load_candles(symbols, start_ms, end_ms, cache))
+    engine = BacktestEngine(
+        config,
+        args.strategy or config.active_strategies[0],
+        intrabar=not args.close_only,
+        ambiguous=args.ambiguous,
+    )
+    result = engine.run(data)
+    for key, value in result.summary().items():
+        print(f"{key:>14}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+trading_bot.backtest.sweep
+~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Strateji parametre taraması (grid search).
+
+Verilen parametre ızgarasının her kombinasyonu için TradingConfig'in bir
+kopyası (dataclasses.replace) oluşturulur ve BacktestEngine aynı geçmiş
+veri üzerinde çalıştırılır:
+
+  * Kombinasyonlar spawn ile açılan bir süreç havuzunda paralel koşar.
+  * 1m mum dizileri bir kez geçici .npy dosyalarına yazılır; işçiler bunları
+    salt okunur memory map olarak açar — diziler pickle edilmez, sayfalar
+    tüm işçiler arasında işletim sisteminin sayfa önbelleğinden paylaşılır.
+  * Sonuç, kazanma oranı, ortalama PnL ve maksimum düşüşü içeren,
+    seçilen metriğe göre sıralanmış bir tablodur.
+
+Kullanım:
+    python -m backtest.sweep --symbols BTCUSDT,ETHUSDT --days 30 \
+        --grid ema_fast=5,9,13 --grid ema_slow=21,34 --grid rr_ratio=1.2:2.0:0.2 \
+        [--strategy ema_volume_strategy.EmaVolumeStrategy] [--processes 8] \
+        [--sort avg_pnl] [--min-trades 10] [--top 20] [--csv sweep.csv]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import itertools
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import fields, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from backtest.engine import BacktestEngine
+from backtest.run import load_candles
+from core.config import TradingConfig
+from core.logger import get_logger, setup_logging
+from data.kline_cache import KlineCache
+from data.rest_client import RateBudget
+
+if TYPE_CHECKING:
+    from strategies.base_strategy import BaseStrategy
+
+logger = get_logger(__name__)
+
+# Tabloda gösterilen metrikler (BacktestResult.summary anahtarları)
+METRICS = ("trades", "win_rate", "avg_pnl", "total_pnl", "max_drawdown", "tp", "sl", "timeout")
+# Küçük olanın daha iyi olduğu metrikler
+_ASCENDING = {"max_drawdown", "sl", "timeout"}
+# Birlikte tanımlandığında sıralı olması gereken parametre çiftleri (küçük, büyük)
+_ORDERED_PAIRS = (("ema_fast", "ema_slow"), ("volume_spike_min", "volume_spike_max"))
+
+
+# ── Izgara ────────────────────────────────────────────────────────────
+
+def parse_grid(specs: list[str], config: TradingConfig) -> dict[str, list]:
+    """
+    "alan=v1,v2,..." veya "alan=başlangıç:bitiş:adım" (bitiş dahil) ifadelerini
+    ayrıştırır. Değerler TradingConfig'deki alanın tipine çevrilir.
+    """
+    names = {f.name for f in fields(config)}
+    grid: dict[str, list] = {}
+    for spec in specs:
+        name, sep, raw = spec.partition("=")
+        name = name.strip().lower()
+        if not sep or not raw.strip():
+            raise ValueError(f"Geçersiz ızgara ifadesi: {spec!r} (beklenen: alan=değerler)")
+        if name not in names:
+            raise ValueError(f"TradingConfig'de {name!r} alanı yok.")
+        kind = type(getattr(config, name))
+        if kind not in (int, float):
+            raise ValueError(f"{name} sayısal bir alan değil.")
+
+        if ":" in raw:
+            start, stop, step = (float(x) for x in raw.split(":"))
+            if step <= 0:
+                raise ValueError(f"{name} için adım pozitif olmalı.")
+            # Kayan nokta birikimi bitiş değerini kaçırmasın
+            values = [start + i * step for i in range(int((stop - start) / step + 1e-9) + 1)]
+        else:
+            values = [float(x) for x in raw.split(",") if x.strip()]
+        grid[name] = sorted({int(round(v)) if kind is int else round(v, 10) for v in values})
+    return grid
+
+
+def expand_grid(grid: dict[str, list]) -> list[dict[str, Any]]:
+    """Izgaranın kartezyen çarpımı; anlamsız kombinasyonlar (ema_fast >= ema_slow …) atlanır."""
+    names = list(grid)
+    combos = []
+    for values in itertools.product(*(grid[n] for n in names)):
+        params = dict(zip(names, values))
+        if any(
+            lo in params and hi in params and params[lo] >= params[hi]
+            for lo, hi in _ORDERED_PAIRS
+        ):
+            continue
+        combos.append(params)
+    return combos
+
+
+# ── Tarama ────────────────────────────────────────────────────────────
+
+class ParameterSweep:
+    """
+    Parametre ızgarasını süreç havuzunda backtest eder.
+
+    Args:
+        config: Temel parametreler; her kombinasyon bunun üzerine yazılır
+        strategy: "modül.Sınıf" yolu veya BaseStrategy alt sınıfı (modül düzeyinde tanımlı)
+        processes: İşçi süreç sayısı (0 → CPU sayısı)
+        intrabar, ambiguous, maxlen, chunk_size: BacktestEngine'e aynen geçirilir
+    """
+
+    def __init__(
+        self,
+        config: TradingConfig,
+        strategy: str | type[BaseStrategy],
+        *,
+        processes: int = 0,
+        intrabar: bool = True,
+        ambiguous: str = "sl",
+        maxlen: int = 200,
+        chunk_size: int = 4096,
+    ) -> None:
+        self._config = config
+        self._strategy = strategy
+        self._processes = processes or os.cpu_count() or 1
+        self._engine_kwargs = {
+            "intrabar": intrabar, "ambiguous": ambiguous, "maxlen": maxlen, "chunk_size": chunk_size,
+        }
+
+    def run(
+        self,
+        data: dict[str, np.ndarray],
+        grid: dict[str, list],
+        *,
+        sort_by: str = "avg_pnl",
+        min_trades: int = 0,
+    ) -> list[dict[str, Any]]:
+        """
+        Args:
+            data: {sembol: shape=(N, 6) 1m OHLCV}
+            grid: {config alanı: değerler}
+            sort_by: Sıralama metriği (max_drawdown küçükten büyüğe, diğerleri tersine)
+            min_trades: Daha az işlem üreten kombinasyonlar sıralamada sona atılır
+
+        Returns:
+            Kombinasyon başına {parametreler..., metrikler...} satırları, sıralı.
+        """
+        if sort_by not in METRICS:
+            raise ValueError(f"Bilinmeyen sıralama metriği: {sort_by} ({', '.join(METRICS)})")
+        combos = expand_grid(grid)
+        if not combos or not data:
+            return []
+
+        started = time.perf_counter()
+        workers = min(self._processes, len(combos))
+        with tempfile.TemporaryDirectory(prefix="sweep-") as tmp:
+            paths = _dump(data, Path(tmp))
+            logger.info("sweep_started", combinations=len(combos), processes=workers, symbols=len(paths))
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self._config, self._strategy, self._engine_kwargs, paths),
+            ) as pool:
+                futures = {pool.submit(_run_combo, params): i for i, params in enumerate(combos)}
+                done: dict[int, dict] = {}
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        done[i] = future.result()
+                    except Exception as e:
+                        logger.warning("sweep_combo_failed", params=combos[i], error=str(e))
+
+        # Izgara sırasıyla eklenir; eşit metrikli kombinasyonların sırası kararlı kalır
+        rows = [{**combos[i], **{m: done[i][m] for m in METRICS}} for i in sorted(done)]
+        descending = sort_by not in _ASCENDING
+        rows.sort(key=lambda r: (
+            r["trades"] < min_trades,
+            -r[sort_by] if descending else r[sort_by],
+        ))
+        logger.info(
+            "sweep_complete",
+            combinations=len(combos),
+            failed=len(combos) - len(rows),
+            elapsed_sec=round(time.perf_counter() - started, 2),
+        )
+        return rows
+
+
+def format_table(rows: list[dict[str, Any]], params: list[str], top: int | None = None) -> str:
+    """Satırları sabit genişlikli metin tablosu olarak biçimlendirir."""
+    columns = ["#", *params, *METRICS]
+    body = [
+        [str(i), *(str(r[c]) for c in params), *(str(r[m]) for m in METRICS)]
+        for i, r in enumerate(rows[:top] if top else rows, start=1)
+    ]
+    widths = [max(len(c), *(len(line[i]) for line in body)) if body else len(c)
+              for i, c in enumerate(columns)]
+    lines = ["  ".join(c.rjust(w) for c, w in zip(columns, widths))]
+    lines.append("  ".join("-" * w for w in widths))
+    lines.extend("  ".join(v.rjust(w) for v, w in zip(line, widths)) for line in body)
+    return "\n".join(lines)
+
+
+def _dump(data: dict[str, np.ndarray], directory: Path) -> dict[str, str]:
+    """Dizileri işçilerin memory map ile açacağı .npy dosyalarına yazar."""
+    paths = {}
+    for i, (symbol, candles) in enumerate(data.items()):
+        path = directory / f"{i}.npy"
+        np.save(path, np.ascontiguousarray(candles, dtype=np.float64))
+        paths[symbol] = str(path)
+    return paths
+
+
+# ── İşçi Süreç Tarafı ─────────────────────────────────────────────────
+
+_worker: dict = {}
+
+
+def _init_worker(
+    config: TradingConfig,
+    strategy: str | type[BaseStrategy],
+    engine_kwargs: dict[str, Any],
+    paths: dict[str, str],
+) -> None:
+    setup_logging(config.log_level)
+    _worker["config"] = config
+    _worker["strategy"] = strategy
+    _worker["engine_kwargs"] = engine_kwargs
+    _worker["data"] = {symbol: np.load(path, mmap_mode="r") for symbol, path in paths.items()}
+
+
+def _run_combo(params: dict[str, Any]) -> dict:
+    config = replace(_worker["config"], **params)
+    engine = BacktestEngine(config, _worker["strategy"], **_worker["engine_kwargs"])
+    return engine.run(_worker["data"]).summary()
+
+
+# ── Komut Satırı ──────────────────────────────────────────────────────
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Strateji parametre taraması")
+    parser.add_argument("--symbols", required=True, help="Virgülle ayrılmış semboller")
+    parser.add_argument("--days", type=float, default=30)
+    parser.add_argument("--strategy", default=None, help="modül.Sınıf (varsayılan: ACTIVE_STRATEGY'nin ilki)")
+    parser.add_argument("--grid", action="append", required=True,
+                        help="alan=v1,v2,... veya alan=başlangıç:bitiş:adım (tekrarlanabilir)")
+    parser.add_argument("--processes", type=int, default=0, help="İşçi sayısı (0 → CPU sayısı)")
+    parser.add_argument("--sort", default="avg_pnl", choices=METRICS)
+    parser.add_argument("--min-trades", type=int, default=0)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--csv", default=None, help="Tüm satırların yazılacağı CSV dosyası")
+    parser.add_argument("--close-only", action="store_true", help="TP/SL sadece kapanışlarla kontrol edilir")
+    parser.add_argument("--ambiguous", default="sl", choices=("sl", "tp"),
+                        help="Aynı mumda hem TP hem SL görülürse seçilecek çıkış")
+    args = parser.parse_args()
+
+    config = TradingConfig()
+    setup_logging(config.log_level)
+    grid = parse_grid(args.grid, config)
+
+    end_ms = int(time.time() * 1000)
+    start_ms = end_ms - int(args.days * 86_400_000)
+    symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
+    cache = KlineCache(
+        config.kline_cache_dir or "kline_cache",
+        budget=RateBudget(config.rest_weight_per_minute),
+    )
+    data = asyncio.run(load_candles(symbols, start_ms, end_ms, cache))
+
+    sweep = ParameterSweep(
+        config,
+        args.strategy or config.active_strategies[0],
+        processes=args.processes,
+        intrabar=not args.close_only,
+        ambiguous=args.ambiguous,
+    )
+    rows = sweep.run(data, grid, sort_by=args.sort, min_trades=args.min_trades)
+    print(format_table(rows, list(grid), top=args.top))
+
+    if args.csv and rows:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+trading_bot.benchmarks.memory_store_bench
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+MemoryStore ingestion ve tarama verimi ölçümü.
+
+"before" → eski tasarım: her çağrı paylaşılan asyncio.Lock üzerinden await edilir.
+"after"  → kilitsiz, senkron *_nowait erişimcileri.
+
+Her iki senaryoda da mark-price akışı ve tarama okumaları aynı event loop'ta
+eşzamanlı koşar; böylece kilit çekişmesi ölçüme dahil olur.
+
+Kullanım:
+    python -m benchmarks.memory_store_bench [--symbols 300] [--rounds 200]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from data.memory_store import MemoryStore
+
+
+class _LockedStore:
+    """Eski (global asyncio.Lock'lu) MemoryStore davranışının birebir taklidi."""
+
+    def __init__(self, store: MemoryStore) -> None:
+        self._store = store
+        self._lock = asyncio.Lock()
+
+    async def update_candle(self, symbol, timeframe, candle, *, is_closed):
+        async with self._lock:
+            self._store.update_candle_nowait(symbol, timeframe, candle, is_closed=is_closed)
+
+    async def update_price(self, symbol, price):
+        async with self._lock:
+            self._store.update_price_nowait(symbol, price)
+
+    async def get_candles(self, symbol, timeframe):
+        async with self._lock:
+            return self._store.get_candles_nowait(symbol, timeframe)
+
+    async def get_price(self, symbol):
+        async with self._lock:
+            return self._store.get_price_nowait(symbol)
+
+
+async def _run_locked(symbols: list[str], rounds: int) -> tuple[float, float]:
+    store = _LockedStore(MemoryStore(maxlen=200))
+
+    async def ingest() -> float:
+        t0 = time.perf_counter()
+        for r in range(rounds):
+            for i, sym in enumerate(symbols):
+                await store.update_candle(sym, "1m", [r, 1, 2, 0.5, 1.5, 10 + i], is_closed=True)
+                await store.update_price(sym, 1.5 + r)
+            await asyncio.sleep(0)
+        return time.perf_counter() - t0
+
+    async def scan() -> float:
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            for sym in symbols:
+                await store.get_candles(sym, "1m")
+                await store.get_price(sym)
+            await asyncio.sleep(0)
+        return time.perf_counter() - t0
+
+    return tuple(await asyncio.gather(ingest(), scan()))
+
+
+async def _run_lockfree(symbols: list[str], rounds: int) -> tuple[float, float]:
+    store = MemoryStore(maxlen=200)
+
+    async def ingest() -> float:
+        t0 = time.perf_counter()
+        for r in range(rounds):
+            for i, sym in enumerate(symbols):
+                store.update_candle_nowait(sym, "1m", [r, 1, 2, 0.5, 1.5, 10 + i], is_closed=True)
+                store.update_price_nowait(sym, 1.5 + r)
+            await asyncio.sleep(0)
+        return time.perf_counter() - t0
+
+    async def scan() -> float:
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            for sym in symbols:
+                store.get_candles_nowait(sym, "1m")
+                store.get_price_nowait(sym)
+            await asyncio.sleep(0)
+        return time.perf_counter() - t0
+
+    return tuple(await asyncio.gather(ingest(), scan()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MemoryStore verim ölçümü")
+    parser.add_argument("--symbols", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i}USDT" for i in range(args.symbols)]
+    ops = args.symbols * args.rounds
+
+    for label, runner in (("before (asyncio.Lock)", _run_locked), ("after (lock-free)", _run_lockfree)):
+        ingest_sec, scan_sec = asyncio.run(runner(symbols, args.rounds))
+        print(
+            f"{label:<24} ingest: {ops / ingest_sec:>12,.0f} candle+price/s   "
+            f"scan: {ops / scan_sec:>12,.0f} candles+price reads/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+trading_bot.core.clock
+~~~~~~~~~~~~~~~~~~~~~~~
+Zamana bağlı mantık için enjekte edilebilir saat.
+
+Zaman stopu, sanal pozisyon açılış zamanı, cooldown'lar, Signal.timestamp
+ve döngü beklemeleri doğrudan datetime.now / asyncio.sleep yerine bir
+Clock üzerinden okunur:
+
+  * SystemClock  — gerçek zaman (canlı bot, varsayılan)
+  * VirtualClock — zamanı sürücü ilerletir (replay akışı, test). sleep()
+    bekleyenler sanal süre dolduğunda uyanır; 4 saatlik zaman stopu veya
+    30 dakikalık cooldown saniyeler içinde çalıştırılabilir.
+
+Kullanım:
+    clock = VirtualClock(start=1_700_000_000)
+    watcher = PositionWatcher(config, store, clock=clock)
+    await clock.advance(4 * 3600)    # watcher'ın tüm kontrol turları sırayla işlenir
+
+Gerçek G/Ç bekleyen adımlar (DB yazımı) ``async with clock.hold():`` içinde
+çalışır; VirtualClock bu süre boyunca ilerlemez, böylece replay sonucu G/Ç
+süresinden bağımsızdır. SystemClock'ta hold() etkisizdir.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import AsyncIterator
+
+
+class Clock(ABC):
+    """Saat arayüzü; zaman epoch saniyesi olarak ifade edilir."""
+
+    @abstractmethod
+    def time(self) -> float:
+        """Şimdiki zaman (epoch saniyesi)."""
+
+    def time_ms(self) -> int:
+        return int(self.time() * 1000)
+
+    def now(self) -> datetime:
+        """UTC, timezone-aware şimdiki zaman."""
+        return datetime.fromtimestamp(self.time(), tz=timezone.utc)
+
+    @abstractmethod
+    async def sleep(self, seconds: float) -> None:
+        """Saate göre seconds kadar bekler."""
+
+    @asynccontextmanager
+    async def hold(self) -> AsyncIterator[None]:
+        """Blok süresince saatin ilerlemesini durdurur (gerçek saatte etkisiz)."""
+        yield
+
+
+class SystemClock(Clock):
+    """Gerçek zaman."""
+
+    def time(self) -> float:
+        return time.time()
+
+    def now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+
+SYSTEM_CLOCK = SystemClock()
+
+
+class VirtualClock(Clock):
+    """
+    Sadece advance() / advance_to() ile ilerleyen sanal saat.
+
+    İlerletme, aradaki uyanma zamanlarının her birinde durur ve event loop'a
+    sıra verir; böylece periyodik döngüler (ör. her 10 sn'de bir kontrol)
+    büyük bir sıçramada da her turu sırayla, doğru sanal zamanla çalıştırır.
+    """
+
+    def __init__(self, start: float = 0.0) -> None:
+        self._now = float(start)
+        # (uyanma zamanı, sıra, future)
+        self._timers: list[tuple[float, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        # Açık hold() blokları; sıfır olmadan saat ilerletilmez
+        self._holds = 0
+        self._released = asyncio.Event()
+
+    def time(self) -> float:
+        return self._now
+
+    async def sleep(self, seconds: float) -> None:
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._timers, (self._now + seconds, next(self._seq), future))
+        await future
+
+    @property
+    def next_deadline(self) -> float | None:
+        """Bekleyen en yakın uyanma zamanı (iptal edilmişler dahil olabilir)."""
+        return self._timers[0][0] if self._timers else None
+
+    @asynccontextmanager
+    async def hold(self) -> AsyncIterator[None]:
+        self._holds += 1
+        try:
+            yield
+        finally:
+            self._holds -= 1
+            if not self._holds:
+                self._released.set()
+
+    async def _settle(self) -> None:
+        """Açık hold() blokları kapanana kadar bekler."""
+        while self._holds:
+            self._released.clear()
+            await self._released.wait()
+
+    async def advance(self, seconds: float) -> None:
+        """Saati seconds kadar ilerletir."""
+        await self.advance_to(self._now + seconds)
+
+    async def advance_to(self, timestamp: float) -> None:
+        """
+        Saati timestamp'e kadar ilerletir; geri gitmez.
+        Açık hold() blokları (ve uyanan görevlerin açtıkları) önce beklenir.
+        """
+        await self._settle()
+        timers = self._timers
+        while timers and timers[0][0] <= timestamp:
+            deadline = timers[0][0]
+            self._now = max(self._now, deadline)
+            while timers and timers[0][0] <= deadline:
+                _deadline, _seq, future = heapq.heappop(timers)
+                if not future.done():
+                    future.set_result(None)
+            # Uyanan görevler bir sonraki sleep'lerine kadar çalışsın
+            await asyncio.sleep(0)
+            await self._settle()
+        self._now = max(self._now, timestamp)
@@ -10,10 +10,12 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
-from dotenv import load_dotenv
+from dotenv import dotenv_values, load_dotenv
 
 # Proje kök dizinindeki .env dosyasını yükle
 _env_path = Path(__file__).resolve().parents[1] / ".env"
+# Süreç ortamından gelen değişkenler .env'den önceliklidir (yeniden yüklemede de korunur)
+_process_env_keys = frozenset(os.environ)
 load_dotenv(_env_path, override=False)
 
 
@@ -29,6 +31,10 @@ def _env_float(key: str, default: float = 0.0) -> float:
     return float(os.environ.get(key, default))
 
 
+def _env_bool(key: str, default: bool = False) -> bool:
+    return os.environ.get(key, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
 @dataclass(frozen=True)
 class TradingConfig:
     """Tüm bot parametrelerini tek noktadan yöneten immutable yapılandırma."""
@@ -44,6 +50,8 @@ class TradingConfig:
     # ── Zamanlama ─────────────────────────────────────────────────────
     scan_interval_seconds: int = field(default_factory=lambda: _env_int("SCAN_INTERVAL_SECONDS", 300))
     trade_control_seconds: int = field(default_factory=lambda: _env_int("TRADE_CONTROL_SECONDS", 10))
+    # "interval" → SCAN_INTERVAL_SECONDS'da bir tam tarama, "event" → mum kapanışında anında tarama
+    scan_mode: str = field(default_factory=lambda: _env("SCAN_MODE", "interval"))
 
     # ── EMA Strateji Parametreleri ────────────────────────────────────
     ema_fast: int = field(default_factory=lambda: _env_int("EMA_FAST", 9))
@@ -62,12 +70,52 @@ class TradingConfig:
     cooldown_minutes: int = field(default_factory=lambda: _env_int("COOLDOWN_MINUTES", 30))
 
     # ── Sistem ────────────────────────────────────────────────────────
+    # Virgülle ayrılmış liste: "ema_volume_strategy.EmaVolumeStrategy,rsi_macd_strategy.RsiMacdStrategy"
     active_strategy: str = field(default_factory=lambda: _env("ACTIVE_STRATEGY", "ema_volume_strategy.EmaVolumeStrategy"))
     max_parallel_tasks: int = field(default_factory=lambda: _env_int("MAX_PARALLEL_TASKS", 15))
+    # >0 → strateji değerlendirmesi bu kadar süreçlik havuzda çalışır (0 = event loop içinde)
+    eval_processes: int = field(default_factory=lambda: _env_int("EVAL_PROCESSES", 0))
     db_url: str = field(default_factory=lambda: _env("DB_URL", "sqlite+aiosqlite:///trading_bot.db"))
     log_level: str = field(default_factory=lambda: _env("LOG_LEVEL", "INFO"))
     max_tracked_signals: int = field(default_factory=lambda: _env_int("MAX_TRACKED_SIGNALS", 3))
+    columnar_store: bool = field(default_factory=lambda: _env_bool("COLUMNAR_STORE", False))
+    # Stratejiler arası paylaşılan indikatör önbelleğinin üst sınırı (MB)
+    indicator_cache_mb: int = field(default_factory=lambda: _env_int("INDICATOR_CACHE_MB", 64))
+    # True → strateji modülleri ve .env değiştiğinde stratejiler yeniden yüklenir (SIGHUP her zaman)
+    strategy_hot_reload: bool = field(default_factory=lambda: _env_bool("STRATEGY_HOT_RELOAD", False))
+
+    # ── Warm Restart (Disk Snapshot) ──────────────────────────────────
+    # MemoryStore snapshot dizini; boş → kapalı
+    snapshot_dir: str = field(default_factory=lambda: _env("SNAPSHOT_DIR", ""))
+    snapshot_interval_seconds: int = field(default_factory=lambda: _env_int("SNAPSHOT_INTERVAL_SECONDS", 300))
+    # Kapanmış mumların diskteki kline önbelleği (preload + backtest); boş → kapalı
+    kline_cache_dir: str = field(default_factory=lambda: _env("KLINE_CACHE_DIR", ""))
+    # Geçmiş veri çekimlerinin paylaştığı REST ağırlık bütçesi (Binance limiti 2400/dk)
+    rest_weight_per_minute: int = field(default_factory=lambda: _env_int("REST_WEIGHT_PER_MINUTE", 1200))
 
     # ── WebSocket ─────────────────────────────────────────────────────
     ws_kline_timeframes: list[str] = field(default_factory=lambda: ["1m", "5m"])
     ws_reconnect_delay: int = field(default_factory=lambda: _env_int("WS_RECONNECT_DELAY", 5))
+    # Tek combined-stream bağlantısındaki en fazla kline stream'i; fazlası yeni bağlantılara dağıtılır
+    ws_streams_per_connection: int = field(default_factory=lambda: _env_int("WS_STREAMS_PER_CONNECTION", 200))
+    # True → sembol başına tek 1m kline stream'i açılır, 5m/15m/1h/4h vb. store içinde türetilir
+    resample_from_1m: bool = field(default_factory=lambda: _env_bool("RESAMPLE_FROM_1M", False))
+    # Ham WebSocket çerçevelerinin sıkıştırılmış kaydı (yeniden üretim için); boş → kapalı
+    feed_record_dir: str = field(default_factory=lambda: _env("FEED_RECORD_DIR", ""))
+    feed_record_segment_minutes: int = field(default_factory=lambda: _env_int("FEED_RECORD_SEGMENT_MINUTES", 60))
+
+    @property
+    def active_strategies(self) -> list[str]:
+        """ACTIVE_STRATEGY listesindeki strateji yolları (boşluklar ve boş öğeler atılır)."""
+        return [item.strip() for item in self.active_strategy.split(",") if item.strip()]
+
+
+def reload_config() -> TradingConfig:
+    """
+    .env dosyasını yeniden okuyup yeni bir TradingConfig döndürür.
+    Süreç ortamında (shell/systemd) tanımlı değişkenler ezilmez.
+    """
+    for key, value in dotenv_values(_env_path).items():
+        if value is not None and key not in _process_env_keys:
+            os.environ[key] = value
+    return TradingConfig()
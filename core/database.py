@@ -7,6 +7,7 @@ bu modül sadece bağlantı ve tablo oluşturma işlemlerini sağlar.
 """
 from __future__ import annotations
 
+from sqlalchemy import inspect, text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -38,10 +39,31 @@ async def init_db(db_url: str) -> None:
 
     async with _engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_add_missing_columns, Base.metadata)
 
     logger.info("database_initialized", db_url=db_url)
 
 
+def _add_missing_columns(conn, metadata) -> None:
+    """
+    Var olan tablolara modelde sonradan eklenmiş (nullable) sütunları ekler.
+    create_all mevcut tabloları değiştirmediği için eski veritabanı dosyaları
+    yeni sütunlarla (örn. signals.strategy) bu sayede uyumlu kalır.
+    """
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    for table in metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {col["name"] for col in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present or not column.nullable:
+                continue
+            col_type = column.type.compile(dialect=conn.dialect)
+            conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}'))
+            logger.info("database_column_added", table=table.name, column=column.name)
+
+
 def get_session() -> AsyncSession:
     """
     Yeni bir async session döndürür.
@@ -0,0 +1,213 @@
+"""
+trading_bot.data.feed_recorder
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Ham WebSocket akışı için sıkıştırılmış, segmentli, sadece eklemeli kayıt.
+
+Bir sinyal şüpheli göründüğünde botun o anda gördüğü veriyi birebir
+yeniden üretebilmek için her çerçeve, yerel alım zamanıyla birlikte saklanır:
+
+  * Sıcak yol (WebSocket okuyucusu) sadece record() çağırır: alım zamanı ve
+    ham metin bir deque'ya eklenir — ayrıştırma, sıkıştırma veya I/O yoktur.
+    Kuyruk doluysa çerçeve düşürülür ve sayılır; okuyucu asla bekletilmez.
+  * Arka plan yazıcı thread'i kuyruğu FLUSH aralıklarıyla boşaltır, toplu
+    olarak gzip ile sıkıştırır ve segment dosyasının sonuna tam bir gzip
+    üyesi olarak ekler (zlib sıkıştırma sırasında GIL'i bırakır).
+    Çökme durumunda en fazla son flush aralığı kaybolur; dosya geçerli kalır.
+  * Segmentler süreye göre döner: <dir>/feed-<başlangıç_ms>.log.gz
+
+Satır biçimi (sıkıştırılmış içerik):
+    <alım_ns>\\t<stream>\\t<ham çerçeve>\\n
+
+Ek yük stats() ile ölçülür: yazıcı thread'in CPU süresi, kayıt süresine
+oranı ve düşürülen çerçeve sayısı; her segment kapanışında loglanır.
+"""
+from __future__ import annotations
+
+import gzip
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Iterator
+
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+_PREFIX = "feed-"
+_SUFFIX = ".log.gz"
+_FLUSH_SECONDS = 0.5
+_COMPRESS_LEVEL = 1     # hız öncelikli; JSON akışında yine ~7-12x sıkıştırır
+
+
+class FeedRecorder:
+    """
+    Ham çerçeveleri arka planda diske yazan kaydedici.
+
+    Args:
+        directory: Segment dosyalarının yazılacağı dizin
+        segment_minutes: Bir segmentin kapsadığı süre
+        max_queue: Yazılmayı bekleyen en fazla çerçeve; aşılırsa yeni çerçeveler düşürülür
+
+    Kullanım:
+        recorder = FeedRecorder("feed_log")
+        recorder.start()
+        recorder.record("kline", raw)     # WebSocket okuyucusundan
+        recorder.stop()                   # kalan kuyruğu yazar
+    """
+
+    def __init__(self, directory: str | Path, segment_minutes: int = 60, max_queue: int = 200_000) -> None:
+        self._dir = Path(directory)
+        self._segment_ns = max(1, segment_minutes) * 60 * 1_000_000_000
+        self._max_queue = max_queue
+        self._queue: deque[tuple[int, str, str]] = deque()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+
+        self._segment: Path | None = None
+        self._segment_end_ns = 0
+        self._started = 0.0
+
+        # İstatistikler (sayaçlar sadece ilgili thread tarafından artırılır)
+        self._frames = 0
+        self._dropped = 0
+        self._raw_bytes = 0
+        self._written_bytes = 0
+        self._writer_cpu = 0.0
+
+    # ── Public API ────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Yazıcı thread'ini başlatır."""
+        if self._thread is not None:
+            return
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._stopping = False
+        self._started = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="feed_recorder", daemon=True)
+        self._thread.start()
+        logger.info("feed_recorder_started", directory=str(self._dir))
+
+    def record(self, stream: str, raw: str | bytes) -> None:
+        """Sıcak yol: çerçeveyi alım zamanıyla kuyruğa ekler (bloklamaz)."""
+        if len(self._queue) >= self._max_queue:
+            self._dropped += 1
+            return
+        self._queue.append((time.time_ns(), stream, raw))
+
+    def stop(self) -> None:
+        """Kuyrukta kalanları yazıp thread'i durdurur."""
+        if self._thread is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+        logger.info("feed_recorder_stopped", **self.stats())
+
+    def stats(self) -> dict:
+        """Kayıt sayaçları ve yazıcı thread'inin CPU yükü."""
+        elapsed = time.monotonic() - self._started if self._started else 0.0
+        return {
+            "frames": self._frames,
+            "dropped": self._dropped,
+            "queued": len(self._queue),
+            "raw_mb": round(self._raw_bytes / 1e6, 2),
+            "written_mb": round(self._written_bytes / 1e6, 2),
+            "compression": round(self._raw_bytes / self._written_bytes, 1) if self._written_bytes else 0.0,
+            "writer_cpu_sec": round(self._writer_cpu, 3),
+            "writer_cpu_pct": round(self._writer_cpu / elapsed * 100, 3) if elapsed else 0.0,
+        }
+
+    # ── Yazıcı Thread ─────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(_FLUSH_SECONDS)
+            self._wake.clear()
+            stopping = self._stopping
+            cpu = time.thread_time()
+            try:
+                self._flush()
+            except Exception as e:
+                logger.error("feed_recorder_write_error", error=str(e))
+            self._writer_cpu += time.thread_time() - cpu
+            if stopping:
+                return
+
+    def _flush(self) -> None:
+        """Kuyruğu boşaltır; her segmente düşen kısmı tek bir gzip üyesi olarak ekler."""
+        queue = self._queue
+        lines: list[str] = []
+        while queue:
+            recv_ns, stream, raw = queue.popleft()
+            if recv_ns >= self._segment_end_ns:
+                self._write(lines)
+                lines = []
+                self._rotate(recv_ns)
+            if isinstance(raw, bytes):
+                raw = raw.decode("utf-8", "replace")
+            if "\n" in raw:
+                # JSON'da ham satır sonu sadece boşluk olabilir; satır biçimini korur
+                raw = raw.replace("\r", " ").replace("\n", " ")
+            lines.append(f"{recv_ns}\t{stream}\t{raw}\n")
+        self._write(lines)
+
+    def _write(self, lines: list[str]) -> None:
+        if not lines or self._segment is None:
+            return
+        payload = "".join(lines).encode()
+        blob = gzip.compress(payload, compresslevel=_COMPRESS_LEVEL)
+        with open(self._segment, "ab") as f:
+            f.write(blob)
+        self._frames += len(lines)
+        self._raw_bytes += len(payload)
+        self._written_bytes += len(blob)
+
+    def _rotate(self, recv_ns: int) -> None:
+        if self._segment is not None:
+            logger.info("feed_segment_closed", segment=self._segment.name, **self.stats())
+        start_ns = recv_ns - recv_ns % self._segment_ns
+        self._segment = self._dir / f"{_PREFIX}{start_ns // 1_000_000}{_SUFFIX}"
+        self._segment_end_ns = start_ns + self._segment_ns
+
+
+# ── Okuma ─────────────────────────────────────────────────────────────
+
+def iter_feed(
+    directory: str | Path,
+    start_ms: int | None = None,
+    end_ms: int | None = None,
+) -> Iterator[tuple[int, str, str]]:
+    """
+    Kaydedilmiş çerçeveleri alım sırasıyla (alım_ns, stream, ham) olarak döndürür.
+    Son segmentin yarım kalmış gzip üyesi (çökme) uyarı loglanarak atlanır.
+    """
+    start_ns = start_ms * 1_000_000 if start_ms is not None else None
+    end_ns = end_ms * 1_000_000 if end_ms is not None else None
+    segments = sorted(
+        Path(directory).glob(f"{_PREFIX}*{_SUFFIX}"),
+        key=lambda p: int(p.name[len(_PREFIX):-len(_SUFFIX)]),
+    )
+    for i, path in enumerate(segments):
+        # Sonraki segment başlangıçtan önceyse bu segment tamamen aralık dışındadır
+        if start_ms is not None and i + 1 < len(segments):
+            if int(segments[i + 1].name[len(_PREFIX):-len(_SUFFIX)]) <= start_ms:
+                continue
+        if end_ms is not None and int(path.name[len(_PREFIX):-len(_SUFFIX)]) >= end_ms:
+            break
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            try:
+                for line in f:
+                    if not line.endswith("\n"):
+                        break   # yarım yazılmış son satır
+                    recv, stream, raw = line.rstrip("\n").split("\t", 2)
+                    recv_ns = int(recv)
+                    if start_ns is not None and recv_ns < start_ns:
+                        continue
+                    if end_ns is not None and recv_ns >= end_ns:
+                        return
+                    yield recv_ns, stream, raw
+            except (EOFError, gzip.BadGzipFile) as e:
+                logger.warning("feed_segment_truncated", segment=path.name, error=str(e))
@@ -0,0 +1,432 @@
+"""
+trading_bot.data.kline_cache
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Kapanmış mumlar için diskte kalıcı, memory-mapped kline önbelleği.
+
+Kapanmış mumlar değişmez; preload, yeniden başlatma ve backtest aynı
+mumları tekrar tekrar indirmek yerine buradan okur, REST'ten sadece
+eksik aralıklar çekilir. Uzun aralıklar paralel sayfalarla, paylaşılan
+ağırlık bütçesi altında indirilir ve sayfalar doğrudan diske akıtılır.
+
+Dizin yapısı:
+    <cache_dir>/index.json                   # anahtar → geçerli dosya + kapsanan aralıklar
+    <cache_dir>/<tf>/<SYMBOL>-<n>.npy        # shape=(N, 6) float64, açılış zamanına göre sıralı
+
+Kapsama (coverage), REST'ten eksiksiz çekildiği bilinen [başlangıç, bitiş)
+açılış zamanı aralıklarıdır; borsa kesintisi veya listeleme öncesi gibi
+gerçekten mum olmayan boşluklar kapsanmış sayılır ve yeniden istenmez.
+Veri dosyaları event loop'u bloklamamak için thread'de yazılır. index.json
+her seferinde değil, bir toplu işin (preload, backtest yüklemesi) sonunda
+flush() ile bir kez yazılır; yerini alan eski dosyalar da ancak index'ten
+sonra silinir (snapshot ile aynı düzen) — yazım yarıda kesilse bile diskteki
+index her zaman geçerli dosyaları gösterir.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict
+
+import numpy as np
+
+from core.logger import get_logger
+from data.memory_store import TS, timeframe_ms
+from data.rest_client import RateBudget, iter_klines_range, request_klines
+
+if TYPE_CHECKING:
+    import aiohttp
+
+logger = get_logger(__name__)
+
+_INDEX = "index.json"
+_VERSION = 1
+_PAGE_LIMIT = 1000
+# /fapi/v1/klines yanıtında bir mum satırının yaklaşık JSON boyutu (12 alanlı dizi)
+_KLINE_JSON_BYTES = 160
+# Binance limiti 2400/dk; WebSocket dışı diğer istekler için pay bırakılır
+_DEFAULT_WEIGHT_PER_MINUTE = 1200
+_EMPTY = np.empty((0, 6), dtype=np.float64)
+
+
+def _merge_intervals(intervals: list[list[int]]) -> list[list[int]]:
+    merged: list[list[int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+class KlineCache:
+    """
+    Sembol/timeframe başına tek .npy dosyasında tutulan kapanmış mum önbelleği.
+
+    Kullanım:
+        cache = KlineCache("kline_cache")
+        candles = await cache.fetch_range(session, "BTCUSDT", "1m", start_ms, end_ms)
+        recent = await cache.fetch_recent(session, "BTCUSDT", "5m", limit=250)
+        await cache.flush_async()   # toplu işin sonunda index.json
+        cache.stats()  # {"hit_rate": …, "bytes_saved": …}
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        budget: RateBudget | None = None,
+        max_concurrent: int = 8,
+    ) -> None:
+        self._dir = Path(directory)
+        self._budget = budget or RateBudget(_DEFAULT_WEIGHT_PER_MINUTE)
+        self._max_concurrent = max_concurrent
+        self._index: Dict[str, dict] = {}
+        self._arrays: Dict[str, np.ndarray] = {}   # açık memmap'ler
+        # Aynı anahtara eşzamanlı yazımlar sıralanır (dosya yazımı thread'de sürer)
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # flush() bekleyen index değişikliği ve index yazılınca silinecek eski dosyalar
+        self._dirty = False
+        self._stale: list[str] = []
+        # Sayaçlar (mum bazında): önbellekten sunulan / REST'ten çekilen
+        self.hits = 0
+        self.misses = 0
+        self.requests = 0
+        self._load_index()
+
+    # ── Okuma ─────────────────────────────────────────────────────────
+
+    def read(
+        self, symbol: str, timeframe: str, start_ms: float | None = None, end_ms: float | None = None
+    ) -> np.ndarray:
+        """Önbellekteki [start_ms, end_ms) açılış zamanlı mumlar (salt-okunur memmap görünümü)."""
+        arr = self._array(self._key(symbol, timeframe))
+        if not len(arr):
+            return _EMPTY
+        ts = arr[:, TS]
+        lo = 0 if start_ms is None else int(np.searchsorted(ts, start_ms, side="left"))
+        hi = len(arr) if end_ms is None else int(np.searchsorted(ts, end_ms, side="left"))
+        return arr[lo:hi]
+
+    def coverage(self, symbol: str, timeframe: str) -> list[tuple[int, int]]:
+        """Eksiksiz olduğu bilinen [başlangıç, bitiş) aralıkları."""
+        entry = self._index.get(self._key(symbol, timeframe))
+        return [tuple(iv) for iv in entry["coverage"]] if entry else []
+
+    def missing(
+        self, symbol: str, timeframe: str, start_ms: int, end_ms: int
+    ) -> list[tuple[int, int]]:
+        """[start_ms, end_ms) içinde önbelleğin kapsamadığı alt aralıklar."""
+        gaps = []
+        cursor = start_ms
+        for lo, hi in self.coverage(symbol, timeframe):
+            if hi <= cursor:
+                continue
+            if lo >= end_ms:
+                break
+            if lo > cursor:
+                gaps.append((cursor, lo))
+            cursor = max(cursor, hi)
+        if cursor < end_ms:
+            gaps.append((cursor, end_ms))
+        return gaps
+
+    # ── Yazma ─────────────────────────────────────────────────────────
+
+    def write(
+        self, symbol: str, timeframe: str, candles: np.ndarray, start_ms: int, end_ms: int
+    ) -> None:
+        """
+        [start_ms, end_ms) aralığının eksiksiz mumlarını önbelleğe katar ve index'i yazar.
+        Aralık dışındaki satırlar atılır; aynı açılış zamanlı satırlarda yenisi geçerlidir.
+        Senkron yardımcıdır; event loop içinden _write_async kullanılır.
+        """
+        if end_ms <= start_ms:
+            return
+        key = self._key(symbol, timeframe)
+        self._commit(key, self._merge_file(key, symbol, timeframe, candles, start_ms, end_ms), start_ms, end_ms)
+        self.flush()
+
+    def flush(self) -> None:
+        """Bekleyen index değişikliklerini yazar, ardından yerini alan eski dosyaları siler."""
+        if self._dirty:
+            self._persist(*self._take_pending())
+
+    async def flush_async(self) -> None:
+        """flush() gibi; index anlık görüntüsü loop'ta alınır, disk yazımı thread'de yapılır."""
+        if self._dirty:
+            await asyncio.to_thread(self._persist, *self._take_pending())
+
+    def _take_pending(self) -> tuple[str, list[str]]:
+        payload = json.dumps({"version": _VERSION, "keys": self._index})
+        stale, self._stale = self._stale, []
+        self._dirty = False
+        return payload, stale
+
+    def _persist(self, payload: str, stale: list[str]) -> None:
+        self._write_index(payload)
+        for name in stale:
+            try:
+                (self._dir / name).unlink(missing_ok=True)
+            except OSError:
+                pass  # Windows: eski dosya hâlâ map'liyse bir sonraki yazımda kalır
+
+    async def _write_async(
+        self, symbol: str, timeframe: str, candles: np.ndarray, start_ms: int, end_ms: int
+    ) -> None:
+        """write() gibi; dosya thread'de yazılır, index bir sonraki flush()'a kalır."""
+        if end_ms <= start_ms:
+            return
+        key = self._key(symbol, timeframe)
+        async with self._lock(key):
+            name = await asyncio.to_thread(
+                self._merge_file, key, symbol, timeframe, candles, start_ms, end_ms
+            )
+            self._commit(key, name, start_ms, end_ms)
+
+    def _merge_file(
+        self, key: str, symbol: str, timeframe: str, candles: np.ndarray, start_ms: int, end_ms: int
+    ) -> str:
+        """Aralığın mumlarını mevcut dosyayla birleştirip yeni dosyaya yazar (thread'de çalışabilir)."""
+        candles = np.asarray(candles, dtype=np.float64).reshape(-1, 6)
+        candles = candles[(candles[:, TS] >= start_ms) & (candles[:, TS] < end_ms)]
+
+        old = self._array(key)
+        merged = np.concatenate([candles, old]) if len(old) else candles
+        if len(old):
+            # İlk görülen (yeni) satır kalır, sonra açılış zamanına göre sıralanır
+            _, first = np.unique(merged[:, TS], return_index=True)
+            merged = merged[first]
+        else:
+            merged = merged[np.argsort(merged[:, TS], kind="stable")]
+        return self._write_file(symbol, timeframe, [merged])
+
+    # ── REST ile Birlikte ─────────────────────────────────────────────
+
+    async def fetch_range(
+        self,
+        session: aiohttp.ClientSession,
+        symbol: str,
+        timeframe: str,
+        start_ms: int,
+        end_ms: int,
+    ) -> np.ndarray:
+        """
+        [start_ms, end_ms) aralığındaki kapanmış mumları döndürür (backtest için).
+        Önce önbellekten okunur; kapsanmayan alt aralıklar paralel sayfalarla
+        indirilip geçici dosyaya akıtılır, ardından önbellek dosyasıyla birleştirilir.
+        Bellek kullanımı aralığın uzunluğundan bağımsızdır; dönen dizi memmap görünümüdür.
+        """
+        step = timeframe_ms(timeframe)
+        end_ms = min(int(end_ms), self._closed_until(step))
+        if end_ms <= start_ms:
+            return _EMPTY
+
+        fetched = 0
+        for lo, hi in self.missing(symbol, timeframe, int(start_ms), end_ms):
+            fetched += await self._stream_gap(session, symbol, timeframe, lo, hi)
+
+        result = self.read(symbol, timeframe, start_ms, end_ms)
+        self.hits += max(len(result) - fetched, 0)
+        return result
+
+    async def fetch_recent(
+        self,
+        session: aiohttp.ClientSession,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+    ) -> np.ndarray:
+        """
+        Son `limit` mumu (en sondaki açık mum dahil) döndürür — preload için.
+        Önbelleğin kesintisiz kapsadığı baş kısım diskten, kalan kuyruk tek REST isteğiyle gelir.
+        """
+        step = timeframe_ms(timeframe)
+        open_ts = self._closed_until(step)
+        start = open_ts - (limit - 1) * step
+
+        tail_start = start
+        for lo, hi in self.coverage(symbol, timeframe):
+            if lo <= tail_start < hi:
+                tail_start = min(hi, open_ts)
+                break
+
+        cached = self.read(symbol, timeframe, start, tail_start)
+        tail = await self._request(
+            session, symbol, timeframe, tail_start, None,
+            limit=int((open_ts - tail_start) // step) + 1,
+        )
+        # Açık mum hariç kuyruk kalıcı hale getirilir
+        await self._write_async(symbol, timeframe, tail, tail_start, open_ts)
+        self.hits += len(cached)
+        return np.concatenate([cached, tail]) if len(cached) else tail
+
+    def stats(self) -> dict:
+        """Önbellek isabet oranı ve REST'e gitmeyerek tasarruf edilen tahmini bayt."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "requests": self.requests,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "bytes_saved": self.hits * _KLINE_JSON_BYTES,
+        }
+
+    # ── Dahili ────────────────────────────────────────────────────────
+
+    async def _stream_gap(
+        self,
+        session: aiohttp.ClientSession,
+        symbol: str,
+        timeframe: str,
+        start_ms: int,
+        end_ms: int,
+    ) -> int:
+        """Kapsanmayan tek bir aralığı sayfa sayfa .part dosyasına yazar ve önbelleğe katar."""
+        key = self._key(symbol, timeframe)
+        (self._dir / timeframe).mkdir(parents=True, exist_ok=True)
+        part = self._dir / timeframe / f"{symbol.upper()}-{time.time_ns()}.part"
+        count = 0
+        covered_until = start_ms
+        try:
+            with open(part, "wb") as fh:
+                try:
+                    async for _lo, hi, rows in iter_klines_range(
+                        session, symbol, timeframe, start_ms, end_ms,
+                        budget=self._budget, max_concurrent=self._max_concurrent,
+                    ):
+                        await asyncio.to_thread(
+                            fh.write, np.ascontiguousarray(rows, dtype=np.float64).tobytes()
+                        )
+                        count += len(rows)
+                        covered_until = hi
+                        self.requests += 1
+                        self.misses += len(rows)
+                finally:
+                    fh.flush()
+                    # Hata olsa bile sırayla inmiş sayfalar kalıcı olur
+                    if covered_until > start_ms:
+                        async with self._lock(key):
+                            name = await asyncio.to_thread(
+                                self._insert_file, key, symbol, timeframe, part, count, start_ms
+                            )
+                            self._commit(key, name, start_ms, covered_until)
+        finally:
+            part.unlink(missing_ok=True)
+        return count
+
+    def _insert_file(
+        self, key: str, symbol: str, timeframe: str, part: Path, count: int, start_ms: int
+    ) -> str:
+        """Kapsanmayan aralığın .part satırlarını mevcut dosyaya sırayla ekleyip yeni dosya yazar."""
+        new = np.memmap(part, dtype=np.float64, mode="r", shape=(count, 6)) if count else _EMPTY
+        old = self._array(key)
+        at = int(np.searchsorted(old[:, TS], start_ms, side="left")) if len(old) else 0
+        name = self._write_file(symbol, timeframe, [old[:at], new, old[at:]])
+        del new
+        return name
+
+    def _commit(self, key: str, name: str, start_ms: int, end_ms: int) -> None:
+        """Yeni dosyayı ve genişleyen kapsamı index'e işler; disk index'i flush()'ta yazılır."""
+        entry = self._index.get(key, {"file": None, "coverage": []})
+        coverage = _merge_intervals([*entry["coverage"], [int(start_ms), int(end_ms)]])
+        self._index[key] = {"file": name, "coverage": coverage}
+        self._arrays.pop(key, None)
+        if entry["file"]:
+            self._stale.append(entry["file"])
+        self._dirty = True
+
+    def _lock(self, key: str) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    async def _request(
+        self,
+        session: aiohttp.ClientSession,
+        symbol: str,
+        timeframe: str,
+        start_ms: int,
+        end_ms: int | None,
+        limit: int = _PAGE_LIMIT,
+    ) -> np.ndarray:
+        rows = await request_klines(
+            session, symbol, timeframe,
+            limit=min(limit, _PAGE_LIMIT),
+            start_ms=start_ms,
+            end_ms=None if end_ms is None else end_ms - 1,
+            budget=self._budget,
+        )
+        self.requests += 1
+        self.misses += len(rows)
+        return rows
+
+    @staticmethod
+    def _closed_until(step: int) -> int:
+        """Şu an açık olan mumun açılış zamanı = kapanmış mumların bitiş sınırı."""
+        now_ms = int(time.time() * 1000)
+        return now_ms - now_ms % step
+
+    @staticmethod
+    def _key(symbol: str, timeframe: str) -> str:
+        return f"{symbol.upper()}|{timeframe}"
+
+    def _array(self, key: str) -> np.ndarray:
+        arr = self._arrays.get(key)
+        if arr is not None:
+            return arr
+        entry = self._index.get(key)
+        if entry is None or not entry["file"]:
+            return _EMPTY
+        try:
+            arr = np.load(self._dir / entry["file"], mmap_mode="r")
+        except (OSError, ValueError) as e:
+            logger.warning("kline_cache_read_failed", key=key, error=str(e))
+            self._index.pop(key, None)
+            return _EMPTY
+        self._arrays[key] = arr
+        return arr
+
+    def _write_file(self, symbol: str, timeframe: str, parts: list[np.ndarray]) -> str:
+        """Sıralı parçaları yeni bir .npy dosyasına art arda yazar; dosyanın göreli yolunu döndürür."""
+        folder = self._dir / timeframe
+        folder.mkdir(parents=True, exist_ok=True)
+        name = f"{timeframe}/{symbol.upper()}-{time.time_ns()}.npy"
+
+        total = sum(len(p) for p in parts)
+        mm = np.lib.format.open_memmap(
+            self._dir / name, mode="w+", dtype=np.float64, shape=(total, 6)
+        )
+        offset = 0
+        for chunk in parts:
+            # Büyük memmap parçaları dilim dilim kopyalanır (sabit bellek)
+            for a in range(0, len(chunk), 1 << 18):
+                piece = chunk[a:a + (1 << 18)]
+                mm[offset:offset + len(piece)] = piece
+                offset += len(piece)
+        mm.flush()
+        del mm
+        return name
+
+    def _load_index(self) -> None:
+        path = self._dir / _INDEX
+        if not path.exists():
+            return
+        try:
+            header = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning("kline_cache_index_invalid", error=str(e))
+            return
+        if header.get("version") != _VERSION:
+            logger.warning("kline_cache_version_mismatch", found=header.get("version"))
+            return
+        self._index = header.get("keys", {})
+        logger.info("kline_cache_opened", directory=str(self._dir), keys=len(self._index))
+
+    def _write_index(self, payload: str) -> None:
+        self._dir.mkdir(parents=True, exist_ok=True)
+        tmp = self._dir / f"{_INDEX}.tmp"
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, self._dir / _INDEX)
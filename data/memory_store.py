@@ -7,10 +7,9 @@ Strateji modülü veriyi buradan NumPy dizisi olarak okur.
 """
 from __future__ import annotations
 
-import asyncio
-from collections import defaultdict, deque
+import time
 from dataclasses import dataclass, field
-from typing import Dict, Tuple
+from typing import Callable, Dict, Iterator, Tuple
 
 import numpy as np
 
@@ -22,107 +21,878 @@ logger = get_logger(__name__)
 TS, OPEN, HIGH, LOW, CLOSE, VOLUME = 0, 1, 2, 3, 4, 5
 _COLUMNS = 6
 
+# Binance interval birimleri → milisaniye
+_TF_UNIT_MS = {"m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
+
+
+def timeframe_ms(timeframe: str) -> int:
+    """'1m', '15m', '4h', '1d' gibi bir interval'in süresini milisaniye olarak döndürür."""
+    try:
+        return int(timeframe[:-1]) * _TF_UNIT_MS[timeframe[-1]]
+    except (KeyError, ValueError):
+        raise ValueError(f"Desteklenmeyen timeframe: '{timeframe}'") from None
+
+
+# Türetilmiş timeframe'lerin kaynağı olan temel akış
+BASE_TIMEFRAME = "1m"
+
+
+def is_resamplable(timeframe: str) -> bool:
+    """
+    Timeframe'in 1m akışından epoch hizalı olarak türetilebilir olup olmadığı.
+    Gün içi kovalar (1 günü tam bölen m/h interval'leri) ve 1d desteklenir;
+    haftalık/aylık mumlar Binance'te epoch'a hizalı olmadığından hariçtir.
+    """
+    if timeframe == BASE_TIMEFRAME or timeframe[-1:] not in ("m", "h", "d"):
+        return False
+    try:
+        ms = timeframe_ms(timeframe)
+    except ValueError:
+        return False
+    return ms <= _TF_UNIT_MS["d"] and _TF_UNIT_MS["d"] % ms == 0
+
+
+def split_timeframes(required: list[str]) -> tuple[list[str], list[str]]:
+    """
+    Stratejinin istediği timeframe'leri (stream edilecek, türetilecek) olarak ayırır.
+    Türetilebilen her şey tek bir 1m akışından üretilir.
+    """
+    derived = [tf for tf in required if is_resamplable(tf)]
+    stream = [BASE_TIMEFRAME] + [tf for tf in required if tf != BASE_TIMEFRAME and tf not in derived]
+    return stream, derived
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+# Hiç mumu olmayan anahtarlar için paylaşılan boş (salt-okunur) dizi
+_EMPTY = np.empty((0, _COLUMNS), dtype=np.float64)
+_EMPTY.flags.writeable = False
+
 
 @dataclass
 class CandleBuffer:
-    """Tek bir sembol+timeframe için sabit uzunluklu mum tamponu."""
+    """
+    Tek bir sembol+timeframe için sabit kapasiteli float64 ring buffer.
+
+    Veri (2 * maxlen, 6) boyutlu önceden ayrılmış bir dizide "ayna" düzeniyle
+    tutulur: her mum hem ``pos`` hem ``pos + maxlen`` satırına yazılır.
+    Böylece halka sarmış olsa bile son N mum her zaman bitişik bir dilimdir;
+    append/update_last O(1), to_numpy() ise kopyasız salt-okunur görünümdür.
+    """
     maxlen: int = 200
-    _deque: deque = field(default_factory=lambda: deque(maxlen=200))
+    _data: np.ndarray = field(init=False, repr=False)
+    _head: int = field(init=False, default=0)    # Bir sonraki yazım konumu [0, maxlen)
+    _count: int = field(init=False, default=0)
+    revision: int = field(init=False, default=0)  # MemoryStore'un verdiği son yazım sırası
 
     def __post_init__(self) -> None:
-        self._deque = deque(maxlen=self.maxlen)
+        self._data = np.zeros((2 * self.maxlen, _COLUMNS), dtype=np.float64)
+
+    def _write(self, pos: int, candle) -> None:
+        self._data[pos] = candle
+        self._data[pos + self.maxlen] = candle
 
     def append(self, candle: list[float]) -> None:
         """[timestamp, open, high, low, close, volume] formatında mum ekler."""
-        self._deque.append(candle)
+        self._write(self._head, candle)
+        self._head = (self._head + 1) % self.maxlen
+        if self._count < self.maxlen:
+            self._count += 1
 
     def update_last(self, candle: list[float]) -> None:
         """Açık (henüz kapanmamış) mumu günceller — aynı timestamp ise üzerine yazar."""
-        if self._deque and self._deque[-1][TS] == candle[TS]:
-            self._deque[-1] = candle
-        else:
-            self._deque.append(candle)
+        if self._count:
+            last = (self._head - 1) % self.maxlen
+            if self._data[last, TS] == candle[TS]:
+                self._write(last, candle)
+                return
+        self.append(candle)
+
+    def extend(self, candles: np.ndarray) -> None:
+        """shape=(N, 6) mum dizisini tek vektörel kopyayla ekler."""
+        n = len(candles)
+        if n == 0:
+            return
+        if n >= self.maxlen:
+            # Tampon tamamen yenileniyor → halkayı sıfırdan hizala
+            candles = candles[-self.maxlen:]
+            self._data[:self.maxlen] = candles
+            self._data[self.maxlen:] = candles
+            self._head = 0
+            self._count = self.maxlen
+            return
+
+        positions = (self._head + np.arange(n)) % self.maxlen
+        self._data[positions] = candles
+        self._data[positions + self.maxlen] = candles
+        self._head = (self._head + n) % self.maxlen
+        self._count = min(self._count + n, self.maxlen)
+
+    @property
+    def last_timestamp(self) -> float | None:
+        """Son mumun açılış zamanı (ms); tampon boşsa None."""
+        if not self._count:
+            return None
+        return float(self._data[(self._head - 1) % self.maxlen, TS])
 
     def to_numpy(self) -> np.ndarray:
-        """Tamponu shape=(N, 6) NumPy dizisine çevirir."""
-        if not self._deque:
-            return np.empty((0, _COLUMNS), dtype=np.float64)
-        return np.array(list(self._deque), dtype=np.float64)
+        """
+        Tamponu shape=(N, 6) salt-okunur NumPy görünümü olarak döndürür.
+
+        Görünüm kopya değildir; bir sonraki yazıma kadar geçerlidir.
+        Saklanacaksa çağıran taraf .copy() almalıdır.
+        """
+        end = self._head + self.maxlen
+        view = self._data[end - self._count:end]
+        view.flags.writeable = False
+        return view
+
+    def __len__(self) -> int:
+        return self._count
+
+
+@dataclass(frozen=True)
+class MarketSlice:
+    """
+    Bir timeframe için tüm piyasanın kesiti.
+
+    candles[i] → symbols[i] sembolünün sağa hizalı (maxlen, 6) mum penceresi.
+    Son sütun (candles[:, -1]) her sembolün en güncel mumudur; geçmişi
+    eksik satırların başı NaN ile doludur, geçerli uzunluk counts[i]'dedir.
+    """
+    timeframe: str
+    symbols: list[str]
+    candles: np.ndarray    # shape=(n_symbols, maxlen, 6), salt-okunur
+    counts: np.ndarray     # shape=(n_symbols,), int64
+
+    def groups(
+        self, rows: np.ndarray | None = None
+    ) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        """
+        Satırları geçerli uzunluğa göre gruplar: (satır indeksleri, (k, count, 6) blok).
+
+        Aynı uzunluktaki semboller tek blokta NaN içermeden işlenir; böylece
+        özyinelemeli indikatörler (EMA, RSI …) sembol bazlı hesapla birebir aynı
+        sonucu verir. Sürekli akışta sembollerin çoğu maxlen'e ulaştığından
+        genellikle tek grup oluşur.
+        """
+        rows = np.arange(len(self.symbols)) if rows is None else np.asarray(rows, dtype=np.int64)
+        counts = self.counts[rows]
+        for count in np.unique(counts):
+            if count == 0:
+                continue
+            idx = rows[counts == count]
+            yield idx, self.candles[idx, -int(count):]
+
+
+class MarketTensor:
+    """
+    Tek bir timeframe için sütunsal (n_symbols, maxlen, 6) mum tensörü.
+
+    Her sembol sabit bir satıra atanır (symbol → row indeksi sembol tensörde
+    kaldığı sürece kararlıdır); remove() ile boşalan satırlar yeni sembollere
+    yeniden verilir, böylece sembol rotasyonunda tensör büyümez.
+    Satırlar CandleBuffer ile aynı "ayna" düzenindedir: (2 * maxlen) uzunlukta
+    tutulur ve her mum hem ``head`` hem ``head + maxlen`` konumuna yazılır;
+    böylece append/extend kaydırma yapmadan O(1) / O(N) çalışır. Okumalar
+    her satırın son maxlen mumunu sağa hizalı verir, böylece kesitsel
+    taramalar (örn. tüm sembollerin spike oranı) tek bir vektörel NumPy
+    geçişiyle yapılabilir.
+    """
+
+    def __init__(self, timeframe: str, maxlen: int = 200, capacity: int = 64) -> None:
+        self.timeframe = timeframe
+        self._maxlen = maxlen
+        self._data = np.full((capacity, 2 * maxlen, _COLUMNS), np.nan, dtype=np.float64)
+        self._counts = np.zeros(capacity, dtype=np.int64)
+        # Satır başına bir sonraki yazım konumu [0, maxlen)
+        self._heads = np.zeros(capacity, dtype=np.int64)
+        self._window = np.arange(maxlen)
+        self._index: Dict[str, int] = {}
+        # Satır → sembol; remove() ile boşalan satırlarda ""
+        self._symbols: list[str] = []
+        self._free: list[int] = []
+
+    def row(self, symbol: str) -> int:
+        """Sembolün satır indeksini döndürür; yoksa boş ya da yeni bir satır ayırır."""
+        idx = self._index.get(symbol)
+        if idx is not None:
+            return idx
+
+        if self._free:
+            idx = self._free.pop()
+            self._index[symbol] = idx
+            self._symbols[idx] = symbol
+            return idx
+
+        idx = len(self._symbols)
+        if idx == len(self._data):
+            # Kapasite dolu → ikiye katla
+            grow = len(self._data)
+            self._data = np.concatenate(
+                [self._data, np.full((grow, 2 * self._maxlen, _COLUMNS), np.nan)]
+            )
+            self._counts = np.concatenate([self._counts, np.zeros(grow, dtype=np.int64)])
+            self._heads = np.concatenate([self._heads, np.zeros(grow, dtype=np.int64)])
+
+        self._index[symbol] = idx
+        self._symbols.append(symbol)
+        return idx
+
+    def append(self, symbol: str, candle) -> None:
+        """Yeni mumu satırın halkasına yazar (kaydırmasız, O(1))."""
+        idx = self.row(symbol)
+        head = self._heads[idx]
+        self._data[idx, head] = candle
+        self._data[idx, head + self._maxlen] = candle
+        self._heads[idx] = (head + 1) % self._maxlen
+        if self._counts[idx] < self._maxlen:
+            self._counts[idx] += 1
+
+    def update_last(self, symbol: str, candle) -> None:
+        """Aynı timestamp'li son mumun üzerine yazar, değilse ekler."""
+        idx = self.row(symbol)
+        last = (self._heads[idx] - 1) % self._maxlen
+        if self._counts[idx] and self._data[idx, last, TS] == candle[TS]:
+            self._data[idx, last] = candle
+            self._data[idx, last + self._maxlen] = candle
+        else:
+            self.append(symbol, candle)
+
+    def extend(self, symbol: str, candles: np.ndarray) -> None:
+        """shape=(N, 6) diziyi satırın halkasına tek vektörel yazımla ekler."""
+        n = min(len(candles), self._maxlen)
+        if n == 0:
+            return
+        idx = self.row(symbol)
+        positions = (self._heads[idx] + np.arange(n)) % self._maxlen
+        self._data[idx, positions] = candles[-n:]
+        self._data[idx, positions + self._maxlen] = candles[-n:]
+        self._heads[idx] = (self._heads[idx] + n) % self._maxlen
+        self._counts[idx] = min(self._counts[idx] + n, self._maxlen)
+
+    def clear(self, symbol: str) -> None:
+        """Sembolün satırını boşaltır (satır ataması korunur)."""
+        idx = self._index.get(symbol)
+        if idx is not None:
+            self._data[idx] = np.nan
+            self._counts[idx] = 0
+            self._heads[idx] = 0
+
+    def remove(self, symbol: str) -> bool:
+        """
+        Sembolün satırını boşaltıp serbest bırakır; satır sonraki yeni sembole verilir.
+        Returns: Sembol tensörde var mıydı.
+        """
+        if symbol not in self._index:
+            return False
+        self.clear(symbol)
+        idx = self._index.pop(symbol)
+        self._symbols[idx] = ""
+        self._free.append(idx)
+        return True
+
+    @property
+    def symbol_index(self) -> Dict[str, int]:
+        """Kararlı symbol → satır eşlemesinin kopyası."""
+        return dict(self._index)
+
+    def _gather(self, rows: np.ndarray) -> np.ndarray:
+        """Satırların sağa hizalı (len(rows), maxlen, 6) pencerelerini kopyalar."""
+        return self._data[rows[:, None], self._heads[rows][:, None] + self._window]
+
+    def take(self, symbols: list[str], out: np.ndarray | None = None) -> MarketSlice:
+        """
+        Verilen sembollerin kesitini kopya olarak döndürür; tensörde olmayanlar boş kalır.
+        out verilirse (n, maxlen, 6) kesit bu diziye yazılır.
+        """
+        rows = np.array([self._index.get(s, -1) for s in symbols], dtype=np.int64)
+        present = rows >= 0
+        candles = np.empty((len(symbols), self._maxlen, _COLUMNS)) if out is None else out
+        candles[:] = np.nan
+        counts = np.zeros(len(symbols), dtype=np.int64)
+        candles[present] = self._gather(rows[present])
+        counts[present] = self._counts[rows[present]]
+        candles.flags.writeable = False
+        return MarketSlice(self.timeframe, list(symbols), candles, counts)
+
+    def snapshot(self) -> MarketSlice:
+        """
+        Tüm sembollerin kesitini salt-okunur olarak döndürür.
+        Boş satır yoksa ve tüm satırların halka başı aynıysa (sürekli akışta
+        olağan durum) kopyasız görünümdür; değilse dolu satırların pencereleri
+        tek bir indekslemeyle kopyalanır.
+        """
+        n = len(self._symbols)
+        heads = self._heads[:n]
+        if self._free:
+            rows = np.array([i for i, sym in enumerate(self._symbols) if sym], dtype=np.int64)
+            candles = self._gather(rows)
+            counts = self._counts[rows]
+            symbols = [self._symbols[i] for i in rows]
+        else:
+            if n and (heads == heads[0]).all():
+                candles = self._data[:n, heads[0]:heads[0] + self._maxlen]
+            else:
+                candles = self._gather(np.arange(n))
+            counts = self._counts[:n]
+            symbols = list(self._symbols)
+        candles.flags.writeable = False
+        counts.flags.writeable = False
+        return MarketSlice(self.timeframe, symbols, candles, counts)
 
     def __len__(self) -> int:
-        return len(self._deque)
+        return len(self._index)
+
+
+class CandleResampler:
+    """
+    1m mum akışından tek bir yüksek timeframe için OHLCV mumlarını artımlı üretir.
+
+    Kova sınırları epoch'a hizalıdır (Binance ile aynı): 5m → :00, :05 …,
+    4h → 00:00, 04:00 … UTC. Her sembol için kovadaki kapanmış 1m mumların
+    kısmi toplamı tutulur; açık 1m mum her güncellemede bu toplamla birleştirilir.
+    Yeni bir kova başladığında kısmi toplam 1m tamponundaki geçmişten tohumlanır;
+    açılıştan sonraki ilk kova, 1m geçmişi kovanın başını kapsamıyorsa eksik kalabilir.
+    Kovanın son dakikasının kapanış mesajı kaybolursa kova, sonraki kovanın ilk
+    mesajında eldeki son türetilmiş haliyle kapatılır (close_stale).
+    """
+
+    def __init__(self, timeframe: str) -> None:
+        self.timeframe = timeframe
+        self._ms = timeframe_ms(timeframe)
+        # {symbol: [bucket_ts, open, high, low, volume, last_folded_ts]}
+        self._partial: Dict[str, list[float]] = {}
+        # {symbol: son yazılan türetilmiş mum} — kovası henüz kapalı yazılmamış olanlar
+        self._open: Dict[str, list[float]] = {}
+
+    def _seed(self, bucket: float, ts: float, history: np.ndarray) -> list[float]:
+        part = [bucket, np.nan, -np.inf, np.inf, 0.0, -np.inf]
+        if len(history):
+            times = history[:, TS]
+            rows = history[(times >= bucket) & (times < ts)]
+            if len(rows):
+                part = [
+                    bucket,
+                    float(rows[0, OPEN]),
+                    float(rows[:, HIGH].max()),
+                    float(rows[:, LOW].min()),
+                    float(rows[:, VOLUME].sum()),
+                    float(rows[-1, TS]),
+                ]
+        return part
+
+    def update(
+        self, symbol: str, candle, is_closed: bool, history: np.ndarray
+    ) -> tuple[list[float], bool]:
+        """
+        1m güncellemesini işler.
+
+        Args:
+            history: Sembolün 1m tamponu (güncel mum dahil) — sadece tohumlamada okunur.
+
+        Returns:
+            (türetilmiş mum, kapandı mı) — kova son dakikasıyla kapandığında True.
+        """
+        ts = float(candle[TS])
+        bucket = ts - ts % self._ms
+        part = self._partial.get(symbol)
+        if part is None or part[0] != bucket:
+            part = self._partial[symbol] = self._seed(bucket, ts, history)
+
+        closed = is_closed and ts + _TF_UNIT_MS["m"] >= bucket + self._ms
+        if ts <= part[5]:
+            # Bu dakika zaten kısmi toplama katlandı (tekrar gelen kapanış mesajı)
+            derived = [bucket, part[1], part[2], part[3], float(candle[CLOSE]), part[4]]
+        elif np.isnan(part[1]):
+            derived = [bucket, float(candle[OPEN]), float(candle[HIGH]), float(candle[LOW]),
+                       float(candle[CLOSE]), float(candle[VOLUME])]
+        else:
+            derived = [bucket, part[1], max(part[2], float(candle[HIGH])),
+                       min(part[3], float(candle[LOW])), float(candle[CLOSE]),
+                       part[4] + float(candle[VOLUME])]
+
+        if is_closed and ts > part[5]:
+            # Kapanan 1m mumu kısmi toplama kat
+            part[1], part[2], part[3], part[4], part[5] = derived[1], derived[2], derived[3], derived[5], ts
+
+        if closed:
+            self._open.pop(symbol, None)
+        else:
+            self._open[symbol] = derived
+        return derived, closed
+
+    def close_stale(self, symbol: str, ts: float) -> list[float] | None:
+        """
+        ts sonraki bir kovaya aitken önceki kova hiç kapalı yazılmadıysa (son
+        dakikanın kapanış mesajı kayboldu) o kovanın son türetilmiş mumunu
+        döndürür; çağıran bu mumu update()'ten önce kapalı olarak yazmalıdır.
+        """
+        last = self._open.get(symbol)
+        if last is None or ts - ts % self._ms <= last[0]:
+            return None
+        del self._open[symbol]
+        return last
+
+    def discard(self, symbol: str) -> None:
+        self._partial.pop(symbol, None)
+        self._open.pop(symbol, None)
+
+
+# Fiyat kaynağı kodları (PriceTable.source sütunu)
+PRICE_SOURCE_NONE, PRICE_SOURCE_MARK, PRICE_SOURCE_KLINE = 0, 1, 2
+
+
+class PriceTable:
+    """
+    Sembol id'si ile indekslenen dizi tabanlı son fiyat tablosu.
+
+    Sütunlar: price (float64, bilinmiyorsa NaN), updated_at (int64, ms) ve
+    source (int8: mark / kline close). Mark price akışının tüm yükü
+    update(ids, prices, ts) ile tek vektörel yazımda işlenir.
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        self._index: Dict[str, int] = {}
+        self._symbols: list[str] = []
+        self._price = np.full(capacity, np.nan, dtype=np.float64)
+        self._updated_at = np.zeros(capacity, dtype=np.int64)
+        self._source = np.zeros(capacity, dtype=np.int8)
+        # discard() ile boşalan slotlar — yeni sembollere yeniden verilir
+        self._free: list[int] = []
+
+    def symbol_id(self, symbol: str) -> int:
+        """Sembolün kararlı id'sini döndürür; yoksa yeni id atar."""
+        idx = self._index.get(symbol)
+        if idx is not None:
+            return idx
+
+        if self._free:
+            idx = self._free.pop()
+            self._index[symbol] = idx
+            self._symbols[idx] = symbol
+            return idx
+
+        idx = len(self._symbols)
+        if idx == len(self._price):
+            grow = len(self._price)
+            self._price = np.concatenate([self._price, np.full(grow, np.nan)])
+            self._updated_at = np.concatenate([self._updated_at, np.zeros(grow, dtype=np.int64)])
+            self._source = np.concatenate([self._source, np.zeros(grow, dtype=np.int8)])
+
+        self._index[symbol] = idx
+        self._symbols.append(symbol)
+        return idx
+
+    def discard(self, symbol: str) -> bool:
+        """
+        Sembolün slotunu boşaltır (fiyat NaN'a döner); slot sonraki yeni sembole verilir.
+        Id'ler yalnızca anlık kullanıldığından (tutulmadığından) yeniden kullanım güvenlidir.
+        Returns: Sembol tabloda var mıydı.
+        """
+        idx = self._index.pop(symbol, None)
+        if idx is None:
+            return False
+        self._price[idx] = np.nan
+        self._updated_at[idx] = 0
+        self._source[idx] = 0
+        self._symbols[idx] = ""
+        self._free.append(idx)
+        return True
+
+    def symbol_ids(self, symbols: list[str]) -> np.ndarray:
+        """Sembol listesini id dizisine çevirir (eksik olanlara id atanır)."""
+        return np.fromiter((self.symbol_id(s) for s in symbols), dtype=np.intp, count=len(symbols))
+
+    def update(self, ids: np.ndarray, prices: np.ndarray, ts: int, source: int) -> None:
+        """Birden çok fiyatı tek vektörel yazımla günceller."""
+        self._price[ids] = prices
+        self._updated_at[ids] = ts
+        self._source[ids] = source
+
+    def set(self, symbol: str, price: float, ts: int, source: int) -> None:
+        idx = self.symbol_id(symbol)
+        self._price[idx] = price
+        self._updated_at[idx] = ts
+        self._source[idx] = source
+
+    def get(self, symbol: str) -> float | None:
+        idx = self._index.get(symbol)
+        if idx is None:
+            return None
+        price = self._price[idx]
+        return None if np.isnan(price) else float(price)
+
+    def get_many(self, symbols: list[str]) -> np.ndarray:
+        """Sembollerin fiyatlarını dizi olarak döndürür (bilinmeyenler NaN)."""
+        ids = np.fromiter((self._index.get(s, -1) for s in symbols), dtype=np.intp, count=len(symbols))
+        out = np.full(len(symbols), np.nan, dtype=np.float64)
+        known = ids >= 0
+        out[known] = self._price[ids[known]]
+        return out
+
+    def to_dict(self) -> Dict[str, float]:
+        n = len(self._symbols)
+        prices = self._price[:n]
+        return {
+            sym: float(prices[i])
+            for i, sym in enumerate(self._symbols)
+            if sym and not np.isnan(prices[i])
+        }
 
 
 class MemoryStore:
     """
-    Thread-safe bellek içi mum deposu.
+    Bellek içi mum ve fiyat deposu (kilitsiz, tek yazıcılı).
+
+    Tüm okuma/yazmalar aynı event loop içinde ve await noktası olmadan
+    yapılır; bu yüzden asyncio.Lock gerekmez. Senkron ``*_nowait``
+    erişimcileri sıcak yol (WebSocket handler'ları, tarama döngüsü) içindir;
+    async metotlar geriye dönük uyumluluk için bunların ince sarmalayıcılarıdır.
+    Depo başka bir thread'den YAZILMAMALIDIR.
 
     Kullanım:
         store = MemoryStore()
-        store.update_candle("BTCUSDT", "1m", candle_list)
-        arr = await store.get_candles("BTCUSDT", "1m")  # np.ndarray
+        store.update_candle_nowait("BTCUSDT", "1m", candle_list, is_closed=True)
+        arr = store.get_candles_nowait("BTCUSDT", "1m")      # salt-okunur görünüm
+        arr = await store.get_candles("BTCUSDT", "1m")       # aynı veri, kopya
+
+    columnar=True ise mumlar ayrıca timeframe başına bir MarketTensor'a da
+    yazılır ve get_market() ile tüm piyasa tek çağrıda okunabilir.
+
+    enable_resampling(["5m", "15m"]) çağrıldıktan sonra bu timeframe'ler
+    1m akışından türetilir; ayrı kline stream'ine gerek kalmaz.
     """
 
-    def __init__(self, maxlen: int = 200) -> None:
+    def __init__(self, maxlen: int = 200, *, columnar: bool = False) -> None:
         self._maxlen = maxlen
-        self._lock = asyncio.Lock()
+        self._columnar = columnar
         # {("BTCUSDT","1m"): CandleBuffer, ...}
-        self._buffers: Dict[Tuple[str, str], CandleBuffer] = defaultdict(
-            lambda: CandleBuffer(maxlen=self._maxlen)
-        )
+        self._buffers: Dict[Tuple[str, str], CandleBuffer] = {}
         # Son mark/ticker fiyatları — position_watcher tarafından kullanılır
-        self._last_prices: Dict[str, float] = {}
+        self._prices = PriceTable()
+        # {"1m": MarketTensor, ...} — sadece columnar modda doldurulur
+        self._tensors: Dict[str, MarketTensor] = {}
+        # {"5m": CandleResampler, ...} — 1m akışından türetilen timeframe'ler
+        self._resamplers: Dict[str, CandleResampler] = {}
+        # {("BTCUSDT","1m"): int} — her mum kapanışında artan sürüm sayacı
+        self._versions: Dict[Tuple[str, str], int] = {}
+        # Silinen sembollerin en yüksek sürümü — geri eklenen sembolün sürümü
+        # buradan devam eder, böylece eski sürümle çakışıp taramada atlanmaz
+        self._version_floor = 0
+        # Store genelinde her yazımda artan sıra — tampon revizyonları için
+        self._revision = 0
+        # Her mum yazımında çağrılan dinleyiciler: f(symbol, timeframe, candle, is_closed)
+        self._listeners: list[Callable[[str, str, list[float], bool], None]] = []
+
+    @property
+    def maxlen(self) -> int:
+        return self._maxlen
 
     # ── Mum Operasyonları ─────────────────────────────────────────────
 
-    async def update_candle(
+    def _buffer(self, symbol: str, timeframe: str) -> CandleBuffer:
+        buf = self._buffers.get((symbol, timeframe))
+        if buf is None:
+            buf = self._buffers[(symbol, timeframe)] = CandleBuffer(maxlen=self._maxlen)
+        return buf
+
+    def enable_resampling(self, timeframes: list[str]) -> None:
+        """Verilen timeframe'leri 1m akışından türetmeye başlar."""
+        for tf in timeframes:
+            if not is_resamplable(tf):
+                raise ValueError(f"'{tf}' 1m akışından türetilemez.")
+            self._resamplers.setdefault(tf, CandleResampler(tf))
+        logger.info("resampling_enabled", timeframes=list(self._resamplers))
+
+    def add_candle_listener(self, callback: Callable[[str, str, list[float], bool], None]) -> None:
+        """
+        Her canlı mum yazımında (türetilmiş timeframe'ler dahil) senkron çağrılacak
+        dinleyici ekler. Toplu geçmiş yüklemeleri (load_history) bildirilmez.
+        """
+        self._listeners.append(callback)
+
+    def remove_candle_listener(self, callback: Callable[[str, str, list[float], bool], None]) -> None:
+        """add_candle_listener() ile eklenen dinleyiciyi kaldırır."""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _touch(self, buf: CandleBuffer) -> None:
+        self._revision += 1
+        buf.revision = self._revision
+
+    def get_revision_nowait(self, symbol: str, timeframe: str) -> int:
+        """
+        Tamponun son yazım revizyonu. Açık mum güncellemeleri dahil her yazımda
+        değişir ve tampon silinip yeniden oluşturulsa bile tekrar etmez;
+        indikatör önbelleği anahtarı olarak kullanılır.
+        """
+        buf = self._buffers.get((symbol, timeframe))
+        return buf.revision if buf is not None else 0
+
+    def _write_candle(self, symbol: str, timeframe: str, candle, is_closed: bool) -> None:
+        buf = self._buffer(symbol, timeframe)
+        buf.update_last(candle)
+        self._touch(buf)
+        if self._columnar:
+            self._tensor(timeframe).update_last(symbol, candle)
+        if is_closed:
+            self._bump_version(symbol, timeframe)
+        for listener in self._listeners:
+            try:
+                listener(symbol, timeframe, candle, is_closed)
+            except Exception as e:
+                logger.error("candle_listener_error", symbol=symbol, timeframe=timeframe, error=str(e))
+
+    def _bump_version(self, symbol: str, timeframe: str) -> None:
+        key = (symbol, timeframe)
+        self._versions[key] = self._versions.get(key, self._version_floor) + 1
+
+    def get_version_nowait(self, symbol: str, timeframe: str) -> int:
+        """
+        Sembol+timeframe için monoton artan sürüm numarası.
+        Her mum kapanışında (ve toplu geçmiş yüklemede) artar; tarama döngüsü
+        son değerlendirmeden beri değişmeyen sembolleri atlamak için kullanır.
+        """
+        return self._versions.get((symbol, timeframe), 0)
+
+    def update_candle_nowait(
         self, symbol: str, timeframe: str, candle: list[float], *, is_closed: bool
     ) -> None:
         """
         WebSocket'ten gelen mumu depoya yazar.
-        is_closed=True ise yeni mum olarak eklenir, False ise son mum güncellenir.
+        Aynı timestamp'li son mumun üzerine yazılır, yeni timestamp ise eklenir;
+        böylece açık mumun kapanış mesajı tampona ikinci kez eklenmez.
+        Temel (1m) mumlar türetilmiş timeframe'leri de günceller.
         """
-        async with self._lock:
-            buf = self._buffers[(symbol, timeframe)]
-            if is_closed:
-                buf.append(candle)
-            else:
-                buf.update_last(candle)
+        self._write_candle(symbol, timeframe, candle, is_closed)
+
+        if timeframe == BASE_TIMEFRAME and self._resamplers:
+            history = self._buffers[(symbol, timeframe)].to_numpy()
+            for tf, resampler in self._resamplers.items():
+                stale = resampler.close_stale(symbol, float(candle[TS]))
+                if stale is not None:
+                    logger.warning("resampled_bucket_closed_late", symbol=symbol, timeframe=tf,
+                                   bucket=int(stale[TS]))
+                    self._write_candle(symbol, tf, stale, True)
+                derived, closed = resampler.update(symbol, candle, is_closed, history)
+                self._write_candle(symbol, tf, derived, closed)
+
+    def get_candles_nowait(self, symbol: str, timeframe: str) -> np.ndarray:
+        """
+        Belirtilen sembol+timeframe için salt-okunur NumPy görünümü döndürür.
+
+        Görünüm kopyasızdır ve tamponun bir sonraki yazımına kadar geçerlidir:
+        yalnızca aynı senkron adımda (arada await olmadan) kullanılmalıdır.
+        await ötesinde tutulacaksa get_candles() (kopya) veya .copy() kullanın.
+        """
+        buf = self._buffers.get((symbol, timeframe))
+        return buf.to_numpy() if buf is not None else _EMPTY
+
+    def get_candle_count_nowait(self, symbol: str, timeframe: str) -> int:
+        """Depodaki mum sayısını döndürür."""
+        buf = self._buffers.get((symbol, timeframe))
+        return len(buf) if buf is not None else 0
+
+    def load_history_nowait(self, symbol: str, timeframe: str, candles: np.ndarray) -> None:
+        """
+        REST'ten gelen shape=(N, 6) geçmiş mum dizisini tek operasyonla depoya yazar.
+
+        Depoda zaten mum varsa, son mumdan eski satırlar atlanır; son mumla
+        aynı timestamp'li satır (henüz açık mum) üzerine yazılır.
+        """
+        candles = np.asarray(candles, dtype=np.float64)
+        if candles.size == 0:
+            return
+
+        buf = self._buffer(symbol, timeframe)
+        last_ts = buf.last_timestamp
+        if last_ts is not None:
+            candles = candles[candles[:, TS] >= last_ts]
+            if len(candles) and candles[0, TS] == last_ts:
+                self.update_candle_nowait(symbol, timeframe, candles[0], is_closed=False)
+                candles = candles[1:]
+
+        buf.extend(candles)
+        self._touch(buf)
+        if self._columnar:
+            self._tensor(timeframe).extend(symbol, candles)
+        if len(candles):
+            self._bump_version(symbol, timeframe)
+
+    def drop_candles_nowait(self, symbol: str, timeframe: str) -> None:
+        """Sembol+timeframe tamponunu boşaltır (örn. geçmişle arasında boşluk varsa)."""
+        self._buffers.pop((symbol, timeframe), None)
+        self._bump_version(symbol, timeframe)
+        resampler = self._resamplers.get(timeframe)
+        if resampler is not None:
+            resampler.discard(symbol)
+        tensor = self._tensors.get(timeframe)
+        if tensor is not None:
+            tensor.remove(symbol)
+
+    def evict_symbol_nowait(self, symbol: str) -> int:
+        """
+        Sembolün tüm timeframe tamponlarını, tensör satırlarını, sürüm sayaçlarını
+        ve fiyat slotunu siler (örn. listeden çıkarıldığında); boşalan tensör
+        satırları ve fiyat slotları yeni sembollere verildiğinden sembol
+        rotasyonunda tablolar büyümez.
+        Returns: Silinen tampon sayısı.
+        """
+        timeframes = [tf for (sym, tf) in self._buffers if sym == symbol]
+        for tf in timeframes:
+            self.drop_candles_nowait(symbol, tf)
+        for tensor in self._tensors.values():
+            tensor.remove(symbol)
+        for key in [key for key in self._versions if key[0] == symbol]:
+            self._version_floor = max(self._version_floor, self._versions.pop(key))
+        self._prices.discard(symbol)
+        return len(timeframes)
+
+    def get_last_timestamp_nowait(self, symbol: str, timeframe: str) -> float | None:
+        """Son mumun açılış zamanını (ms) döndürür; mum yoksa None."""
+        buf = self._buffers.get((symbol, timeframe))
+        return buf.last_timestamp if buf is not None else None
+
+    def export_buffers_nowait(self) -> tuple[list[tuple[str, str]], np.ndarray, np.ndarray]:
+        """
+        Tüm dolu tamponları disk snapshot'ı için kopyalar.
+
+        Returns:
+            (keys, candles, counts) — candles shape=(n_keys, maxlen, 6) sağa hizalı,
+            counts shape=(n_keys,) geçerli mum sayıları.
+        """
+        keys = [key for key, buf in self._buffers.items() if len(buf) > 0]
+        candles = np.zeros((len(keys), self._maxlen, _COLUMNS), dtype=np.float64)
+        counts = np.zeros(len(keys), dtype=np.int64)
+        for i, key in enumerate(keys):
+            arr = self._buffers[key].to_numpy()
+            candles[i, self._maxlen - len(arr):] = arr
+            counts[i] = len(arr)
+        return keys, candles, counts
+
+    async def load_history(self, symbol: str, timeframe: str, candles: np.ndarray) -> None:
+        """load_history_nowait() için async uyumluluk sarmalayıcısı."""
+        self.load_history_nowait(symbol, timeframe, candles)
+
+    async def update_candle(
+        self, symbol: str, timeframe: str, candle: list[float], *, is_closed: bool
+    ) -> None:
+        """update_candle_nowait() için async uyumluluk sarmalayıcısı."""
+        self.update_candle_nowait(symbol, timeframe, candle, is_closed=is_closed)
 
     async def get_candles(self, symbol: str, timeframe: str) -> np.ndarray:
-        """Belirtilen sembol+timeframe için NumPy dizisi döndürür."""
-        async with self._lock:
-            return self._buffers[(symbol, timeframe)].to_numpy()
+        """
+        get_candles_nowait() için async uyumluluk sarmalayıcısı.
+        Async çağıranlar diziyi await'ler boyunca tutabildiğinden kopya döndürür.
+        """
+        return self.get_candles_nowait(symbol, timeframe).copy()
 
     async def get_candle_count(self, symbol: str, timeframe: str) -> int:
-        """Depodaki mum sayısını döndürür."""
-        async with self._lock:
-            return len(self._buffers[(symbol, timeframe)])
+        """get_candle_count_nowait() için async uyumluluk sarmalayıcısı."""
+        return self.get_candle_count_nowait(symbol, timeframe)
+
+    # ── Sütunsal (Cross-Symbol) Operasyonlar ─────────────────────────
+
+    def _tensor(self, timeframe: str) -> MarketTensor:
+        tensor = self._tensors.get(timeframe)
+        if tensor is None:
+            tensor = self._tensors[timeframe] = MarketTensor(timeframe, maxlen=self._maxlen)
+        return tensor
+
+    def get_market_nowait(self, timeframe: str) -> MarketSlice:
+        """
+        Belirtilen timeframe için tüm sembollerin (n_symbols, maxlen, 6)
+        kesitini tek çağrıda döndürür. Sadece columnar modda kullanılabilir.
+        """
+        if not self._columnar:
+            raise RuntimeError("get_market() için MemoryStore(columnar=True) gerekli.")
+        return self._tensor(timeframe).snapshot()
+
+    def get_slice_nowait(
+        self, timeframe: str, symbols: list[str], out: np.ndarray | None = None
+    ) -> MarketSlice:
+        """
+        Verilen sembollerin (n, maxlen, 6) sağa hizalı kesitini döndürür
+        (toplu strateji değerlendirmesi için). Her iki modda da çalışır;
+        columnar modda tensörden tek indekslemeyle, aksi halde tamponlardan kopyalanır.
+
+        out verilirse kesit ara kopya olmadan bu diziye yazılır
+        (örn. süreç havuzu için paylaşımlı bellek üzerindeki bir görünüm).
+        """
+        if self._columnar:
+            tensor = self._tensors.get(timeframe)
+            if tensor is not None:
+                return tensor.take(symbols, out=out)
+
+        candles = np.empty((len(symbols), self._maxlen, _COLUMNS)) if out is None else out
+        candles[:] = np.nan
+        counts = np.zeros(len(symbols), dtype=np.int64)
+        for i, symbol in enumerate(symbols):
+            buf = self._buffers.get((symbol, timeframe))
+            if buf is None or not len(buf):
+                continue
+            data = buf.to_numpy()
+            candles[i, -len(data):] = data
+            counts[i] = len(data)
+        candles.flags.writeable = False
+        return MarketSlice(timeframe, list(symbols), candles, counts)
+
+    async def get_market(self, timeframe: str) -> MarketSlice:
+        """get_market_nowait() için async uyumluluk sarmalayıcısı."""
+        return self.get_market_nowait(timeframe)
+
+    async def get_symbol_index(self, timeframe: str) -> Dict[str, int]:
+        """Belirtilen timeframe tensöründeki symbol → satır indeksini döndürür."""
+        tensor = self._tensors.get(timeframe)
+        return tensor.symbol_index if tensor is not None else {}
 
     # ── Fiyat Operasyonları (Position Watcher İçin) ───────────────────
 
+    def update_price_nowait(
+        self, symbol: str, price: float, ts: int | None = None, source: int = PRICE_SOURCE_KLINE
+    ) -> None:
+        """Tek bir sembolün fiyatını günceller (varsayılan kaynak: kline close)."""
+        self._prices.set(symbol, price, _now_ms() if ts is None else ts, source)
+
+    def price_ids_nowait(self, symbols: list[str]) -> np.ndarray:
+        """Sembolleri fiyat tablosu id'lerine çevirir (update_prices_nowait için)."""
+        return self._prices.symbol_ids(symbols)
+
+    def update_prices_nowait(
+        self, symbol_ids: np.ndarray, prices: np.ndarray, ts: int, source: int = PRICE_SOURCE_MARK
+    ) -> None:
+        """Mark price akışının tüm yükünü tek vektörel yazımla işler."""
+        self._prices.update(symbol_ids, prices, ts, source)
+
+    def get_price_nowait(self, symbol: str) -> float | None:
+        """Son bilinen fiyatı döndürür."""
+        return self._prices.get(symbol)
+
+    def get_prices_nowait(self, symbols: list[str]) -> np.ndarray:
+        """Birden çok sembolün son fiyatını dizi olarak döndürür (bilinmeyenler NaN)."""
+        return self._prices.get_many(symbols)
+
     async def update_price(self, symbol: str, price: float) -> None:
-        """Mark price / ticker fiyatını günceller."""
-        async with self._lock:
-            self._last_prices[symbol] = price
+        """update_price_nowait() için async uyumluluk sarmalayıcısı."""
+        self.update_price_nowait(symbol, price)
 
     async def get_price(self, symbol: str) -> float | None:
-        """Son bilinen fiyatı döndürür."""
-        async with self._lock:
-            return self._last_prices.get(symbol)
+        """get_price_nowait() için async uyumluluk sarmalayıcısı."""
+        return self.get_price_nowait(symbol)
+
+    def get_all_prices_nowait(self) -> Dict[str, float]:
+        """Tüm fiyatların kopyasını döndürür."""
+        return self._prices.to_dict()
 
     async def get_all_prices(self) -> Dict[str, float]:
-        """Tüm fiyatları döndürür."""
-        async with self._lock:
-            return dict(self._last_prices)
+        """get_all_prices_nowait() için async uyumluluk sarmalayıcısı."""
+        return self.get_all_prices_nowait()
 
     # ── Yardımcılar ──────────────────────────────────────────────────
 
     async def get_available_symbols(self) -> list[str]:
         """En az 1 mumu olan sembolleri döndürür."""
-        async with self._lock:
-            symbols = set()
-            for (sym, _tf), buf in self._buffers.items():
-                if len(buf) > 0:
-                    symbols.add(sym)
-            return sorted(symbols)
+        return sorted({sym for (sym, _tf), buf in self._buffers.items() if len(buf) > 0})
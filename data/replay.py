@@ -0,0 +1,177 @@
+"""
+trading_bot.data.replay
+~~~~~~~~~~~~~~~~~~~~~~~~
+Kaydedilmiş WebSocket akışını (FEED_RECORD_DIR) canlı istemcinin yerine oynatır.
+
+FeedReplayClient, BinanceWebSocketClient ile aynı arayüzü (start / stop /
+update_symbols) sunar ve çerçeveleri canlı istemcinin kendi ayrıştırıcılarıyla
+MemoryStore'a yazar; böylece tarama döngüsü, dispatcher ve watcher canlıdakiyle
+aynı kod yolundan beslenir.
+
+Hız:
+  * speed=1   → kayıttaki alım aralıklarıyla (gerçek zaman)
+  * speed=N   → N kat hızlı
+  * speed=0   → bekleme yok (azami hız)
+
+Her hızda her çerçeveden sonra event loop'a sıra verilir ki mum kapanışı
+olayları akışla aynı sırada ve aynı gruplarla işlensin; sonuçlar hızdan
+bağımsızdır.
+
+Oynatma konumu (son işlenen çerçevenin kayıttaki alım zamanı) replay_time
+ile okunur; bir VirtualClock verilirse her çerçeveden önce saat bu konuma
+ilerletilir — saate bağlı bileşenler (watcher, tarama döngüsü, stratejiler)
+kayıttaki zamanla çalışır. Kayıt sonunda start() döner ve replay_complete loglanır.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from core.logger import get_logger
+from data.feed_recorder import iter_feed
+from data.websocket_client import BinanceWebSocketClient
+
+if TYPE_CHECKING:
+    from core.clock import VirtualClock
+    from core.config import TradingConfig
+    from data.memory_store import MemoryStore
+
+logger = get_logger(__name__)
+
+class FeedReplayClient(BinanceWebSocketClient):
+    """
+    Kayıttan oynatan WebSocket istemcisi.
+
+    Args:
+        directory: FeedRecorder segmentlerinin bulunduğu dizin
+        speed: Oynatma hızı çarpanı (0 → azami hız)
+        start_ms, end_ms: Oynatılacak alım zamanı aralığı (None → kaydın tamamı)
+        clock: Kayıttaki alım zamanlarıyla ilerletilecek sanal saat
+
+    Kullanım:
+        client = FeedReplayClient(config, store, symbols, "feed_log", speed=60)
+        await client.start()   # kayıt bitince döner
+    """
+
+    def __init__(
+        self,
+        config: TradingConfig,
+        store: MemoryStore,
+        symbols: list[str],
+        directory: str | Path,
+        *,
+        speed: float = 1.0,
+        start_ms: int | None = None,
+        end_ms: int | None = None,
+        timeframes: list[str] | None = None,
+        clock: VirtualClock | None = None,
+    ) -> None:
+        super().__init__(config, store, symbols, timeframes=timeframes)
+        self._clock = clock
+        self._dir = Path(directory)
+        self._speed = max(0.0, speed)
+        self._start_ms = start_ms
+        self._end_ms = end_ms
+        self._cursor_ns = 0
+        self._frames = 0
+
+    # ── Public API ────────────────────────────────────────────────────
+
+    @property
+    def replay_time(self) -> datetime | None:
+        """Son işlenen çerçevenin kayıttaki alım zamanı."""
+        if not self._cursor_ns:
+            return None
+        return datetime.fromtimestamp(self._cursor_ns / 1e9, tz=timezone.utc)
+
+    @property
+    def frames(self) -> int:
+        return self._frames
+
+    async def start(self) -> None:
+        """Kaydı sonuna kadar (veya stop() çağrılana kadar) oynatır."""
+        self._running = True
+        logger.info(
+            "replay_started",
+            directory=str(self._dir),
+            speed=self._speed or "max",
+            symbol_count=len(self._symbols),
+        )
+        # Sadece abone olunan timeframe'lerin kline çerçeveleri işlenir (canlıyla aynı)
+        markers = tuple(f"@kline_{tf}\"" for tf in self._timeframes)
+        loop = asyncio.get_running_loop()
+        wall_start = loop.time()
+        cpu_start = time.process_time()
+        feed_start = 0
+
+        for recv_ns, stream, raw in iter_feed(self._dir, self._start_ms, self._end_ms):
+            if not self._running:
+                break
+            if not feed_start:
+                feed_start = recv_ns
+
+            # Her çerçeveden önce event loop'a sıra verilir: önceki çerçevenin
+            # olayları hızdan bağımsız olarak aynı sırada, aynı gruplarla işlenir
+            lag = 0.0
+            if self._speed:
+                lag = (recv_ns - feed_start) / 1e9 / self._speed - (loop.time() - wall_start)
+            await asyncio.sleep(max(lag, 0.0))
+
+            self._cursor_ns = recv_ns
+            self._frames += 1
+            if self._clock is not None:
+                await self._clock.advance_to(recv_ns / 1e9)
+            if stream == "kline":
+                if any(m in raw for m in markers):
+                    await self._handle_kline_msg(raw)
+            elif stream == "markprice":
+                await self._handle_mark_price_msg(raw)
+
+        elapsed = loop.time() - wall_start
+        span = (self._cursor_ns - feed_start) / 1e9 if feed_start else 0.0
+        logger.info(
+            "replay_complete",
+            frames=self._frames,
+            feed_span_sec=round(span, 1),
+            elapsed_sec=round(elapsed, 2),
+            effective_speed=round(span / elapsed, 1) if elapsed else 0.0,
+            msg_per_sec=int(self._frames / elapsed) if elapsed else 0,
+            cpu_sec=round(time.process_time() - cpu_start, 2),
+        )
+
+    async def stop(self) -> None:
+        self._running = False
+        logger.info("replay_stopped", frames=self._frames)
+
+
+def recorded_symbols(
+    directory: str | Path,
+    start_ms: int | None = None,
+    window_ms: int = 120_000,
+) -> list[str]:
+    """Kaydın ilk window_ms'inde kline çerçevesi görülen semboller (ilk görülme sırasıyla)."""
+    symbols: dict[str, None] = {}
+    first_ns = 0
+    for recv_ns, stream, raw in iter_feed(directory, start_ms):
+        if not first_ns:
+            first_ns = recv_ns
+        if recv_ns - first_ns > window_ms * 1_000_000:
+            break
+        if stream != "kline":
+            continue
+        try:
+            symbols.setdefault(json.loads(raw)["data"]["k"]["s"], None)
+        except (KeyError, ValueError, TypeError):
+            continue
+    return list(symbols)
+
+
+def first_frame_ms(directory: str | Path, start_ms: int | None = None) -> int | None:
+    """Aralıktaki ilk çerçevenin alım zamanı (ms); kayıt boşsa None."""
+    for recv_ns, _stream, _raw in iter_feed(directory, start_ms):
+        return recv_ns // 1_000_000
+    return None
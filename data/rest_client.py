@@ -7,47 +7,212 @@ Geçmiş mum verilerini stratejinin talep ettiği zaman dilimlerinde çeker.
 from __future__ import annotations
 
 import asyncio
+import time
+from collections import deque
 from datetime import datetime, timezone
+from typing import TYPE_CHECKING, AsyncIterator
 
 import aiohttp
 import numpy as np
 
 from core.logger import get_logger
+from data.memory_store import timeframe_ms
+
+if TYPE_CHECKING:
+    from data.kline_cache import KlineCache
+    from data.memory_store import MemoryStore
 
 logger = get_logger(__name__)
 
 
-async def fetch_historical_klines(
+_KLINES_URL = "https://fapi.binance.com/fapi/v1/klines"
+_PAGE_LIMIT = 1000
+
+
+# ── İstek Ağırlığı Bütçesi ────────────────────────────────────────────
+
+def klines_weight(limit: int) -> int:
+    """/fapi/v1/klines isteğinin REQUEST_WEIGHT değeri (limit'e göre)."""
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+class RateBudget:
+    """
+    Dakikalık REST ağırlık bütçesi (token bucket).
+    Eşzamanlı tüm istekler aynı bütçeyi paylaşır; bütçe tükenince istekler sırayla bekler.
+    """
+
+    def __init__(self, weight_per_minute: int) -> None:
+        self._capacity = float(weight_per_minute)
+        self._tokens = float(weight_per_minute)
+        self._rate = weight_per_minute / 60.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.waited_sec = 0.0
+
+    async def acquire(self, weight: int) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= weight:
+                    self._tokens -= weight
+                    return
+                delay = (weight - self._tokens) / self._rate
+                self.waited_sec += delay
+                await asyncio.sleep(delay)
+
+
+async def request_klines(
     session: aiohttp.ClientSession,
     symbol: str,
     interval: str = "1m",
     limit: int = 1000,
+    start_ms: int | None = None,
+    end_ms: int | None = None,
+    budget: RateBudget | None = None,
 ) -> np.ndarray:
     """
-    Binance Futures /fapi/v1/klines üzerinden belirtilen zaman diliminde
-    geçmiş verisi çeker.
+    /fapi/v1/klines isteği; hata durumunda exception fırlatır.
+    "Veri yok" (boş dizi) ile "istek başarısız" ayrımı gereken yerler (örn. disk önbelleği) içindir.
+    start_ms / end_ms verilirse açılış zamanı bu aralıktaki mumlar döner.
     """
-    url = "https://fapi.binance.com/fapi/v1/klines"
     params = {
         "symbol": symbol.upper(),
         "interval": interval,
         "limit": limit,
     }
+    if start_ms is not None:
+        params["startTime"] = int(start_ms)
+    if end_ms is not None:
+        params["endTime"] = int(end_ms)
 
-    try:
+    if budget is not None:
+        await budget.acquire(klines_weight(limit))
+    else:
         await asyncio.sleep(0.05)  # Rate limit koruması
-        async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-            if resp.status != 200:
-                logger.error("rest_fetch_error", symbol=symbol, interval=interval, status=resp.status)
-                return np.empty((0, 6))
-
-            data = await resp.json()
-            klines = [
-                [float(k[0]), float(k[1]), float(k[2]), float(k[3]), float(k[4]), float(k[5])]
-                for k in data
-            ]
-            return np.array(klines, dtype=np.float64) if klines else np.empty((0, 6))
+    async with session.get(_KLINES_URL, params=params, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+        if resp.status != 200:
+            raise RuntimeError(f"klines HTTP {resp.status}")
+        data = await resp.json()
+
+    klines = [
+        [float(k[0]), float(k[1]), float(k[2]), float(k[3]), float(k[4]), float(k[5])]
+        for k in data
+    ]
+    return np.array(klines, dtype=np.float64) if klines else np.empty((0, 6))
+
+
+# ── Sayfalı Aralık Çekimi ─────────────────────────────────────────────
 
+async def iter_klines_range(
+    session: aiohttp.ClientSession,
+    symbol: str,
+    interval: str,
+    start_ms: int,
+    end_ms: int,
+    *,
+    budget: RateBudget | None = None,
+    max_concurrent: int = 8,
+    retries: int = 3,
+) -> AsyncIterator[tuple[int, int, np.ndarray]]:
+    """
+    [start_ms, end_ms) aralığını 1000 mumluk sayfalara bölüp eşzamanlı indirir.
+
+    Sayfalar sırayla (page_start, page_end, rows) olarak verilir; satırlar
+    açılış zamanına göre artan ve tekildir. En fazla max_concurrent sayfa
+    aynı anda uçuştadır — bellekte tutulan veri sayfa penceresiyle sınırlıdır,
+    çok yıllık çekimler tüketici tarafından diske akıtılabilir.
+    Bir sayfa tüm denemelere rağmen inmezse exception fırlatılır; o ana kadar
+    verilen sayfalar eksiksizdir.
+    """
+    step = timeframe_ms(interval)
+    page_span = _PAGE_LIMIT * step
+    first = int(start_ms) - int(start_ms) % step
+    bounds = [
+        (max(lo, int(start_ms)), min(lo + page_span, int(end_ms)))
+        for lo in range(first, int(end_ms), page_span)
+    ]
+
+    async def _page(lo: int, hi: int) -> np.ndarray:
+        for attempt in range(retries + 1):
+            try:
+                return await request_klines(
+                    session, symbol, interval, _PAGE_LIMIT, start_ms=lo, end_ms=hi - 1, budget=budget
+                )
+            except Exception as e:
+                if attempt == retries:
+                    raise
+                logger.warning("rest_page_retry", symbol=symbol, interval=interval,
+                               start=lo, attempt=attempt + 1, error=str(e))
+                await asyncio.sleep(2 ** attempt)
+        raise AssertionError("unreachable")
+
+    pending: deque[tuple[int, int, asyncio.Task]] = deque()
+    queued = iter(bounds)
+    last_ts = -np.inf
+    try:
+        for lo, hi in queued:
+            pending.append((lo, hi, asyncio.create_task(_page(lo, hi))))
+            if len(pending) >= max_concurrent:
+                break
+        while pending:
+            lo, hi, task = pending.popleft()
+            rows = await task
+            nxt = next(queued, None)
+            if nxt is not None:
+                pending.append((*nxt, asyncio.create_task(_page(*nxt))))
+            if len(rows):
+                ts = rows[:, 0]
+                rows = rows[(ts > last_ts) & (ts >= lo) & (ts < hi)]
+                if len(rows):
+                    last_ts = rows[-1, 0]
+            yield lo, hi, rows
+    finally:
+        for _lo, _hi, task in pending:
+            task.cancel()
+
+
+async def fetch_klines_range(
+    session: aiohttp.ClientSession,
+    symbol: str,
+    interval: str,
+    start_ms: int,
+    end_ms: int,
+    *,
+    budget: RateBudget | None = None,
+    max_concurrent: int = 8,
+) -> np.ndarray:
+    """iter_klines_range sayfalarını tek bir bitişik (N, 6) diziye birleştirir."""
+    pages = [
+        rows
+        async for _lo, _hi, rows in iter_klines_range(
+            session, symbol, interval, start_ms, end_ms,
+            budget=budget, max_concurrent=max_concurrent,
+        )
+    ]
+    return np.concatenate(pages) if pages else np.empty((0, 6))
+
+
+async def fetch_historical_klines(
+    session: aiohttp.ClientSession,
+    symbol: str,
+    interval: str = "1m",
+    limit: int = 1000,
+) -> np.ndarray:
+    """
+    Binance Futures /fapi/v1/klines üzerinden belirtilen zaman diliminde
+    geçmiş verisi çeker. Hata durumunda loglayıp boş dizi döndürür.
+    """
+    try:
+        return await request_klines(session, symbol, interval, limit)
     except Exception as e:
         logger.error("rest_exception", symbol=symbol, interval=interval, error=str(e))
         return np.empty((0, 6))
@@ -59,27 +224,60 @@ async def preload_history(
     timeframes: list[str],
     limit: int = 250,
     max_concurrent: int = 20,
+    cache: 'KlineCache | None' = None,
 ) -> None:
     """
     Tüm semboller için istenen zaman dilimlerinde geçmişi çeker ve MemoryStore'u doldurur.
+
+    Store'da zaten veri varsa (örn. disk snapshot'ından yüklendiyse) sadece son
+    mumdan bu yana eksik kalan mumlar çekilir. Boşluk `limit`'ten büyükse
+    tampon boşaltılıp sıfırdan yüklenir. cache verilirse kapanmış mumlar önce
+    diskteki kline önbelleğinden okunur; REST'ten sadece kuyruk çekilir.
     """
     start_time = datetime.now(timezone.utc)
+    now_ms = start_time.timestamp() * 1000
     logger.info("preload_started", symbol_count=len(symbols), timeframes=timeframes, limit=limit)
 
     semaphore = asyncio.Semaphore(max_concurrent)
+    fetched = 0
 
     async with aiohttp.ClientSession() as session:
         async def _process_symbol(symbol: str):
+            nonlocal fetched
             async with semaphore:
                 for tf in timeframes:
-                    klines = await fetch_historical_klines(session, symbol, interval=tf, limit=limit)
+                    fetch_limit = limit
+                    last_ts = store.get_last_timestamp_nowait(symbol, tf)
+                    if last_ts is not None:
+                        # Son (muhtemelen açık) mum dahil eksik mum sayısı
+                        missing = int((now_ms - last_ts) // timeframe_ms(tf)) + 1
+                        if missing < limit:
+                            fetch_limit = missing
+                        else:
+                            store.drop_candles_nowait(symbol, tf)
+
+                    if cache is not None:
+                        try:
+                            klines = await cache.fetch_recent(session, symbol, tf, fetch_limit)
+                        except Exception as e:
+                            logger.error("rest_exception", symbol=symbol, interval=tf, error=str(e))
+                            continue
+                    else:
+                        klines = await fetch_historical_klines(session, symbol, interval=tf, limit=fetch_limit)
                     if klines.size == 0:
                         continue
-                    for candle in klines:
-                        await store.update_candle(symbol, tf, candle.tolist(), is_closed=True)
+                    store.load_history_nowait(symbol, tf, klines)
+                    fetched += len(klines)
 
         tasks = [_process_symbol(s) for s in symbols]
         await asyncio.gather(*tasks)
+    if cache is not None:
+        await cache.flush_async()
 
     elapsed = (datetime.now(timezone.utc) - start_time).total_seconds()
-    logger.info("preload_complete", elapsed_sec=round(elapsed, 2))
+    logger.info(
+        "preload_complete",
+        elapsed_sec=round(elapsed, 2),
+        candles_fetched=fetched,
+        **({"kline_cache": cache.stats()} if cache is not None else {}),
+    )
@@ -0,0 +1,150 @@
+"""
+trading_bot.data.snapshot
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+MemoryStore için memory-mapped disk anlık görüntüsü (Warm Restart).
+
+Dizin yapısı:
+    <snapshot_dir>/header.json          # semboller, timeframe'ler, son timestamp'ler, fiyatlar
+    <snapshot_dir>/candles-<ts>.npy     # shape=(n_keys, maxlen, 6) float64, sağa hizalı
+
+header.json her zaman en son yazılır ve hangi .npy dosyasının geçerli olduğunu
+gösterir; böylece yazım yarıda kesilse bile önceki snapshot bozulmaz.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from core.logger import get_logger
+
+if TYPE_CHECKING:
+    from data.memory_store import MemoryStore
+
+logger = get_logger(__name__)
+
+_HEADER = "header.json"
+_VERSION = 1
+
+
+def _write_snapshot(
+    directory: Path,
+    keys: list[tuple[str, str]],
+    candles: np.ndarray,
+    counts: np.ndarray,
+    prices: dict[str, float],
+) -> Path:
+    """Kopyalanmış store verisini diske yazar (thread içinde çalıştırılır)."""
+    directory.mkdir(parents=True, exist_ok=True)
+    saved_at = int(time.time() * 1000)
+    data_name = f"candles-{saved_at}.npy"
+
+    mm = np.lib.format.open_memmap(
+        directory / data_name, mode="w+", dtype=np.float64, shape=candles.shape
+    )
+    mm[:] = candles
+    mm.flush()
+    del mm
+
+    maxlen = candles.shape[1]
+    header = {
+        "version": _VERSION,
+        "saved_at": saved_at,
+        "data_file": data_name,
+        "maxlen": maxlen,
+        "keys": [
+            {
+                "symbol": sym,
+                "timeframe": tf,
+                "count": int(counts[i]),
+                "last_ts": float(candles[i, maxlen - 1, 0]),
+            }
+            for i, (sym, tf) in enumerate(keys)
+        ],
+        "prices": prices,
+    }
+    tmp = directory / f"{_HEADER}.tmp"
+    tmp.write_text(json.dumps(header), encoding="utf-8")
+    os.replace(tmp, directory / _HEADER)
+
+    # Artık referans verilmeyen eski veri dosyalarını temizle
+    for old in directory.glob("candles-*.npy"):
+        if old.name != data_name:
+            old.unlink(missing_ok=True)
+
+    return directory / data_name
+
+
+async def save_snapshot(store: MemoryStore, directory: str | Path) -> None:
+    """
+    Store'un anlık kopyasını event loop üzerinde alır, disk yazımını
+    ayrı bir thread'de yapar (tarama ve WebSocket akışı bloklanmaz).
+    """
+    start = time.perf_counter()
+    keys, candles, counts = store.export_buffers_nowait()
+    prices = store.get_all_prices_nowait()
+    if not keys:
+        return
+
+    path = await asyncio.to_thread(_write_snapshot, Path(directory), keys, candles, counts, prices)
+    logger.info(
+        "snapshot_saved",
+        path=str(path),
+        keys=len(keys),
+        size_mb=round(candles.nbytes / 1_048_576, 2),
+        elapsed_ms=int((time.perf_counter() - start) * 1000),
+    )
+
+
+def load_snapshot(
+    store: MemoryStore,
+    directory: str | Path,
+    symbols: list[str] | None = None,
+) -> int | None:
+    """
+    Disk snapshot'ını memory-map ile açıp MemoryStore'a yükler.
+
+    Args:
+        symbols: Verilirse sadece bu semboller yüklenir (delist olanlar atlanır).
+
+    Returns:
+        Snapshot'ın kaydedilme zamanı (ms) veya snapshot yoksa/okunamazsa None.
+    """
+    directory = Path(directory)
+    header_path = directory / _HEADER
+    if not header_path.exists():
+        return None
+
+    try:
+        header = json.loads(header_path.read_text(encoding="utf-8"))
+        if header.get("version") != _VERSION:
+            logger.warning("snapshot_version_mismatch", found=header.get("version"))
+            return None
+        candles = np.load(directory / header["data_file"], mmap_mode="r")
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning("snapshot_load_failed", error=str(e))
+        return None
+
+    wanted = set(symbols) if symbols is not None else None
+    loaded = 0
+    for i, key in enumerate(header["keys"]):
+        sym, tf, count = key["symbol"], key["timeframe"], key["count"]
+        if wanted is not None and sym not in wanted:
+            continue
+        if count <= 0 or len(candles[i]) < count:
+            continue
+        store.load_history_nowait(sym, tf, candles[i, -count:])
+        loaded += 1
+
+    for sym, price in header.get("prices", {}).items():
+        if wanted is None or sym in wanted:
+            store.update_price_nowait(sym, price, ts=header["saved_at"])
+
+    age_sec = (time.time() * 1000 - header["saved_at"]) / 1000
+    logger.info("snapshot_loaded", keys=loaded, age_sec=round(age_sec, 1))
+    return header["saved_at"]
@@ -8,13 +8,22 @@ Görevleri:
   1. Kline (mum) verilerini MemoryStore'a yazmak
   2. Mark Price verilerini MemoryStore'a yazmak (position_watcher için)
   3. Bağlantı koptuğunda otomatik yeniden bağlanmak
+  4. Kline stream'lerini bağlantı başına en fazla WS_STREAMS_PER_CONNECTION
+     olacak şekilde gerektiği kadar combined-stream bağlantısına bölmek;
+     her bağlantı bağımsız yeniden bağlanır ve mesaj hızı / gecikmesi raporlanır
+  5. Sembol listesi değiştiğinde farkı açık bağlantılara SUBSCRIBE / UNSUBSCRIBE
+     kontrol mesajlarıyla uygulamak; mevcut stream'ler kesintisiz akmaya devam eder
 """
 from __future__ import annotations
 
 import asyncio
+import itertools
 import json
-from typing import TYPE_CHECKING
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Iterable
 
+import numpy as np
 import websockets
 from websockets.exceptions import ConnectionClosed
 
@@ -22,22 +31,76 @@ from core.logger import get_logger
 
 if TYPE_CHECKING:
     from core.config import TradingConfig
+    from data.feed_recorder import FeedRecorder
     from data.memory_store import MemoryStore
 
 logger = get_logger(__name__)
 
 # Binance Futures public WS base URL
 _WS_BASE = "wss://fstream.binance.com"
+# Bağlantı istatistiklerinin loglanma aralığı
+_STATS_INTERVAL_SECONDS = 60
+
+
+@dataclass
+class _StreamConnection:
+    """Tek bir WebSocket bağlantısı: abone olduğu stream'ler ve sağlık sayaçları."""
+    name: str
+    streams: list[str]
+    connected: bool = False
+    reconnects: int = 0
+    messages: int = 0
+    # Son rapordan beri: olay zamanı (E) → yerel alım gecikmesi
+    lag_sum_ms: float = 0.0
+    lag_max_ms: float = 0.0
+    lag_count: int = 0
+    reported_messages: int = 0
+    reported_at: float = field(default_factory=time.monotonic)
+    # Açık soket ve bu soket üzerinde gerçekten abone olunan stream'ler
+    ws: Any = None
+    live: set[str] = field(default_factory=set)
+
+    def observe(self, event_ms: int | None) -> None:
+        self.messages += 1
+        if event_ms:
+            lag = time.time() * 1000 - event_ms
+            self.lag_sum_ms += lag
+            self.lag_count += 1
+            if lag > self.lag_max_ms:
+                self.lag_max_ms = lag
+
+    def report(self) -> dict:
+        """Son rapordan beri mesaj hızı ve gecikme; pencere sayaçlarını sıfırlar."""
+        now = time.monotonic()
+        elapsed = now - self.reported_at
+        stats = {
+            "connection": self.name,
+            "streams": len(self.streams),
+            "connected": self.connected,
+            "reconnects": self.reconnects,
+            "msg_per_sec": round((self.messages - self.reported_messages) / elapsed, 1) if elapsed else 0.0,
+            "lag_avg_ms": round(self.lag_sum_ms / self.lag_count, 1) if self.lag_count else None,
+            "lag_max_ms": round(self.lag_max_ms, 1) if self.lag_count else None,
+        }
+        self.reported_messages = self.messages
+        self.reported_at = now
+        self.lag_sum_ms = self.lag_max_ms = 0.0
+        self.lag_count = 0
+        return stats
 
 
 class BinanceWebSocketClient:
     """
     Binance Futures halka açık WebSocket istemcisi.
 
-    İki bağımsız stream yönetir:
-      • Kline stream  — strateji modülü için OHLCV mumları
+    Bağımsız bağlantılar yönetir:
+      • Kline stream'leri — strateji modülü için OHLCV mumları; sembol × timeframe
+        stream'leri WS_STREAMS_PER_CONNECTION'lık parçalara bölünür, her parça
+        ayrı bir combined-stream bağlantısıdır
       • Mark Price stream — position_watcher için anlık fiyatlar
 
+    recorder verilirse her ham çerçeve işlenmeden önce kayda eklenir (FEED_RECORD_DIR).
+
     Kullanım:
         client = BinanceWebSocketClient(config, store, symbols)
         await client.start()   # asyncio.gather içinde çağrılır
@@ -50,25 +113,51 @@ class BinanceWebSocketClient:
         store: MemoryStore,
         symbols: list[str],
         timeframes: list[str] | None = None,
+        recorder: FeedRecorder | None = None,
     ) -> None:
         self._config = config
         self._store = store
         self._symbols = [s.replace("/", "").lower() for s in symbols]
+        self._tracked = set(self._symbols)
+        # Mark price'ı izlenen semboller: takip listesi + kline'sız sadece-fiyat sembolleri
+        self._price_tracked = set(self._tracked)
         self._timeframes = timeframes or config.ws_kline_timeframes
+        self._recorder = recorder
         self._running = False
         self._tasks: list[asyncio.Task] = []
+        # Görev → yeniden başlatma fabrikası; yeni görev eklenince supervisor uyandırılır
+        self._factories: dict[asyncio.Task, Callable[[], Coroutine]] = {}
+        self._tasks_changed = asyncio.Event()
+        self._kline_conns: list[_StreamConnection] = []
+        self._mark_conn = _StreamConnection("markprice", ["!markPrice@arr@1s"])
+        # SUBSCRIBE / UNSUBSCRIBE istek kimlikleri
+        self._request_ids = itertools.count(1)
 
     # ── Public API ────────────────────────────────────────────────────
 
     async def start(self) -> None:
-        """Kline ve Mark Price stream'lerini başlatır."""
+        """
+        Kline bağlantılarını, Mark Price stream'ini ve istatistik raporlayıcısını
+        başlatır ve stop() çağrılana kadar denetler.
+        """
         self._running = True
-        self._tasks = [
-            asyncio.create_task(self._run_kline_stream(), name="ws_kline"),
-            asyncio.create_task(self._run_mark_price_stream(), name="ws_mark_price"),
-        ]
-        logger.info("websocket_started", symbol_count=len(self._symbols))
-        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._spawn("ws_mark_price", self._run_mark_price_stream)
+        self._spawn("ws_stats", self._stats_loop)
+        self._assign_streams()
+        logger.info(
+            "websocket_started",
+            symbol_count=len(self._symbols),
+            streams=sum(len(c.streams) for c in self._kline_conns),
+            connections=len(self._kline_conns),
+        )
+        try:
+            await self._supervise()
+        finally:
+            for t in self._tasks:
+                t.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks.clear()
+            self._factories.clear()
 
     async def stop(self) -> None:
         """Tüm WebSocket bağlantılarını kapatır."""
@@ -77,56 +166,242 @@ class BinanceWebSocketClient:
             t.cancel()
         logger.info("websocket_stopped")
 
-    def update_symbols(self, symbols: list[str]) -> None:
-        """Sembol listesini günceller (yeniden bağlanma gerektirir)."""
-        self._symbols = [s.replace("/", "").lower() for s in symbols]
-        logger.info("symbols_updated", count=len(self._symbols))
+    async def update_symbols(self, symbols: list[str], price_symbols: Iterable[str] = ()) -> None:
+        """
+        Sembol listesini günceller ve farkı açık bağlantılara uygular.
 
-    # ── Kline Stream ──────────────────────────────────────────────────
+        Kalkan stream'ler bulundukları bağlantıdan UNSUBSCRIBE ile çıkarılır,
+        yeni stream'ler boş kapasitesi olan bağlantılara SUBSCRIBE ile eklenir;
+        kapasite yetmezse yeni bağlantı açılır. Değişmeyen stream'ler
+        bağlantılarında kalır, hiçbir bağlantı yeniden kurulmaz.
 
-    async def _run_kline_stream(self) -> None:
-        """Kline combined stream — otomatik reconnect ile."""
+        Args:
+            price_symbols: Kline stream'i kapatılan ama mark price'ı izlenmeye devam
+                eden semboller (örn. listeden düşmüş, açık pozisyonu olan semboller).
+        """
+        self._symbols = [s.replace("/", "").lower() for s in symbols]
+        self._tracked = set(self._symbols)
+        self._price_tracked = self._tracked | {s.replace("/", "").lower() for s in price_symbols}
+        if not self._running:
+            logger.info("symbols_updated", count=len(self._symbols))
+            return
+
+        wanted = self._kline_streams()
+        wanted_set = set(wanted)
+        current = {s for conn in self._kline_conns for s in conn.streams}
+        removed = current - wanted_set
+        added = [s for s in wanted if s not in current]
+
+        per_conn = max(1, self._config.ws_streams_per_connection)
+        pending = added
+        for conn in self._kline_conns:
+            if removed:
+                conn.streams = [s for s in conn.streams if s not in removed]
+            free = per_conn - len(conn.streams)
+            if pending and free > 0:
+                conn.streams = conn.streams + pending[:free]
+                pending = pending[free:]
+        for i in range(0, len(pending), per_conn):
+            self._open_kline_connection(pending[i:i + per_conn])
+
+        await asyncio.gather(*(self._sync_subscriptions(c) for c in self._kline_conns))
+        logger.info(
+            "symbols_updated",
+            count=len(self._symbols),
+            streams_added=len(added),
+            streams_removed=len(removed),
+            connections=len(self._kline_conns),
+        )
+
+    # ── Görev Denetimi ────────────────────────────────────────────────
+
+    def _spawn(self, name: str, factory: Callable[[], Coroutine], delay: float = 0.0) -> asyncio.Task:
+        """Denetlenen bir görev başlatır; start() sonradan eklenenleri de izler."""
+        coro = self._delayed(factory, delay) if delay else factory()
+        task = asyncio.create_task(coro, name=name)
+        self._tasks.append(task)
+        self._factories[task] = factory
+        self._tasks_changed.set()
+        return task
+
+    async def _supervise(self) -> None:
+        """
+        Görevlerden biri biter veya yeni görev eklenirse uyanır. Çalışırken beklenmedik
+        şekilde biten (exception veya normal dönüş) görev loglanır ve gecikmeyle yeniden başlatılır.
+        """
         while self._running:
+            self._tasks_changed.clear()
+            changed = asyncio.ensure_future(self._tasks_changed.wait())
             try:
-                url = self._build_kline_url()
-                logger.info("kline_connecting", url=url[:120])
+                done, _ = await asyncio.wait(
+                    [*self._tasks, changed], return_when=asyncio.FIRST_COMPLETED
+                )
+            finally:
+                changed.cancel()
+            for task in done:
+                if task is changed:
+                    continue
+                self._tasks.remove(task)
+                factory = self._factories.pop(task)
+                if not self._running or task.cancelled():
+                    continue
+                error = task.exception()
+                logger.error(
+                    "ws_task_failed",
+                    task=task.get_name(),
+                    error=str(error) if error else "exited",
+                    error_type=type(error).__name__ if error else None,
+                )
+                # Gecikme, hemen tekrar çöken bir görevin döngüye girmesini önler
+                self._spawn(task.get_name(), factory, delay=self._config.ws_reconnect_delay)
+
+    @staticmethod
+    async def _delayed(factory: Callable[[], Coroutine], delay: float) -> None:
+        await asyncio.sleep(delay)
+        await factory()
+
+    def stats(self) -> list[dict]:
+        """Bağlantı başına mesaj hızı ve gecikme (son rapordan beri; sayaçları sıfırlar)."""
+        return [conn.report() for conn in [*self._kline_conns, self._mark_conn]]
+
+    # ── Kline Bağlantı Havuzu ─────────────────────────────────────────
+
+    def _kline_streams(self) -> list[str]:
+        return [f"{sym}@kline_{tf}" for sym in self._symbols for tf in self._timeframes]
+
+    def _assign_streams(self) -> None:
+        """Stream'leri bağlantı başına sınırla parçalara böler; eksik bağlantıları başlatır."""
+        per_conn = max(1, self._config.ws_streams_per_connection)
+        streams = self._kline_streams()
+        chunks = [streams[i:i + per_conn] for i in range(0, len(streams), per_conn)]
+        for i, chunk in enumerate(chunks):
+            if i < len(self._kline_conns):
+                self._kline_conns[i].streams = chunk
+            else:
+                self._open_kline_connection(chunk)
+        for conn in self._kline_conns[len(chunks):]:
+            conn.streams = []
+
+    def _open_kline_connection(self, streams: list[str]) -> _StreamConnection:
+        conn = _StreamConnection(f"kline-{len(self._kline_conns)}", streams)
+        self._kline_conns.append(conn)
+        self._spawn(f"ws_{conn.name}", lambda: self._run_kline_stream(conn))
+        return conn
+
+    async def _sync_subscriptions(self, conn: _StreamConnection) -> None:
+        """
+        Bağlantının istenen stream listesiyle soketteki abonelikleri arasındaki farkı
+        kontrol mesajlarıyla kapatır. Gönderim başarısız olursa bağlantı kopmuştur;
+        yeniden bağlanırken URL zaten güncel listeden kurulur.
+        """
+        ws = conn.ws
+        if ws is None:
+            return
+        wanted = set(conn.streams)
+        unsubscribe = sorted(conn.live - wanted)
+        subscribe = [s for s in conn.streams if s not in conn.live]
+        if not unsubscribe and not subscribe:
+            return
+        # Await'ten önce güncellenir: eşzamanlı bir çağrı aynı farkı tekrar göndermez
+        conn.live = wanted
+        try:
+            if unsubscribe:
+                await ws.send(json.dumps(
+                    {"method": "UNSUBSCRIBE", "params": unsubscribe, "id": next(self._request_ids)}
+                ))
+            if subscribe:
+                await ws.send(json.dumps(
+                    {"method": "SUBSCRIBE", "params": subscribe, "id": next(self._request_ids)}
+                ))
+            logger.info(
+                "kline_subscriptions_updated",
+                connection=conn.name,
+                subscribed=len(subscribe),
+                unsubscribed=len(unsubscribe),
+                streams=len(wanted),
+            )
+        except Exception as e:
+            logger.warning("kline_subscription_send_failed", connection=conn.name, error=str(e))
+
+    async def _run_kline_stream(self, conn: _StreamConnection) -> None:
+        """Tek bir kline combined-stream bağlantısı — diğerlerinden bağımsız reconnect ile."""
+        while self._running:
+            if not conn.streams:
+                await asyncio.sleep(self._config.ws_reconnect_delay)
+                continue
+            try:
+                streams = list(conn.streams)
+                url = self._build_kline_url(streams)
+                logger.info("kline_connecting", connection=conn.name, streams=len(streams))
 
                 async with websockets.connect(url, ping_interval=20) as ws:
-                    logger.info("kline_connected")
+                    conn.connected = True
+                    conn.ws = ws
+                    conn.live = set(streams)
+                    logger.info("kline_connected", connection=conn.name)
+                    # Bağlanırken gelen sembol güncellemeleri
+                    await self._sync_subscriptions(conn)
+                    recorder = self._recorder
                     async for raw in ws:
                         if not self._running:
                             break
-                        await self._handle_kline_msg(raw)
+                        if recorder is not None:
+                            recorder.record("kline", raw)
+                        conn.observe(await self._handle_kline_msg(raw))
 
             except ConnectionClosed as e:
-                logger.warning("kline_disconnected", code=e.code, reason=str(e.reason))
+                logger.warning(
+                    "kline_disconnected", connection=conn.name, code=e.code, reason=str(e.reason)
+                )
             except Exception as e:
-                logger.error("kline_error", error=str(e), error_type=type(e).__name__)
+                logger.error(
+                    "kline_error", connection=conn.name, error=str(e), error_type=type(e).__name__
+                )
+            finally:
+                conn.connected = False
+                conn.ws = None
+                conn.live = set()
 
             if self._running:
+                conn.reconnects += 1
                 delay = self._config.ws_reconnect_delay
-                logger.info("kline_reconnecting", delay_sec=delay)
+                logger.info("kline_reconnecting", connection=conn.name, delay_sec=delay)
                 await asyncio.sleep(delay)
 
-    def _build_kline_url(self) -> str:
-        """Çoklu sembol + çoklu timeframe combined stream URL'si oluşturur."""
-        streams: list[str] = []
-        for sym in self._symbols:
-            for tf in self._timeframes:
-                streams.append(f"{sym}@kline_{tf}")
-        # Binance 200 stream limiti var; gerekirse chunk'lanabilir
-        return f"{_WS_BASE}/stream?streams={'/'.join(streams[:200])}"
-
-    async def _handle_kline_msg(self, raw: str) -> None:
-        """Gelen Kline mesajını parse edip MemoryStore'a yazar."""
+    @staticmethod
+    def _build_kline_url(streams: list[str]) -> str:
+        """Verilen kline stream'leri için combined stream URL'si oluşturur."""
+        return f"{_WS_BASE}/stream?streams={'/'.join(streams)}"
+
+    async def _stats_loop(self) -> None:
+        """Bağlantı başına mesaj hızı ve gecikmeyi periyodik olarak loglar."""
+        while self._running:
+            await asyncio.sleep(_STATS_INTERVAL_SECONDS)
+            for stats in self.stats():
+                logger.info("ws_connection_stats", **stats)
+
+    # ── Kline Stream ──────────────────────────────────────────────────
+
+    async def _handle_kline_msg(self, raw: str) -> int | None:
+        """
+        Gelen Kline mesajını parse edip MemoryStore'a yazar.
+        Returns: Olay zamanı (E, ms) — bağlantı gecikmesi için; işlenmeyen mesajda None.
+        """
         try:
             msg = json.loads(raw)
-            data = msg.get("data", {})
+            data = msg.get("data")
+            if data is None:
+                # SUBSCRIBE / UNSUBSCRIBE yanıtı: {"result": null, "id": n} veya {"error": …}
+                if "error" in msg:
+                    logger.warning("kline_control_error", request_id=msg.get("id"), error=msg["error"])
+                return None
             kline = data.get("k")
             if kline is None:
-                return
+                return None
 
             symbol = kline["s"]        # "BTCUSDT"
+            if symbol.lower() not in self._tracked:
+                return None            # UNSUBSCRIBE'dan önce yola çıkmış çerçeve
             timeframe = kline["i"]     # "1m"
             is_closed = kline["x"]     # bool — mum kapandı mı?
 
@@ -139,13 +414,15 @@ class BinanceWebSocketClient:
                 float(kline["v"]),     # volume
             ]
 
-            await self._store.update_candle(symbol, timeframe, candle, is_closed=is_closed)
+            self._store.update_candle_nowait(symbol, timeframe, candle, is_closed=is_closed)
 
             # Mark price cache'i close fiyatıyla da güncelle (ek kaynak)
-            await self._store.update_price(symbol, candle[4])
+            self._store.update_price_nowait(symbol, candle[4])
+            return data.get("E")
 
         except (KeyError, ValueError, TypeError) as e:
             logger.debug("kline_parse_skip", error=str(e))
+            return None
 
     # ── Mark Price Stream ─────────────────────────────────────────────
 
@@ -154,44 +431,61 @@ class BinanceWebSocketClient:
         Tüm sembollerin mark price'ını 1s aralıkla yayınlayan genel stream.
         position_watcher sanal TP/SL kontrolü için bu fiyatları kullanır.
         """
-        url = f"{_WS_BASE}/ws/!markPrice@arr@1s"
+        url = f"{_WS_BASE}/ws/{self._mark_conn.streams[0]}"
+        conn = self._mark_conn
 
         while self._running:
             try:
                 logger.info("markprice_connecting")
                 async with websockets.connect(url, ping_interval=20) as ws:
+                    conn.connected = True
                     logger.info("markprice_connected")
+                    recorder = self._recorder
                     async for raw in ws:
                         if not self._running:
                             break
-                        await self._handle_mark_price_msg(raw)
+                        if recorder is not None:
+                            recorder.record("markprice", raw)
+                        conn.observe(await self._handle_mark_price_msg(raw))
 
             except ConnectionClosed as e:
                 logger.warning("markprice_disconnected", code=e.code, reason=str(e.reason))
             except Exception as e:
                 logger.error("markprice_error", error=str(e), error_type=type(e).__name__)
+            finally:
+                conn.connected = False
 
             if self._running:
+                conn.reconnects += 1
                 delay = self._config.ws_reconnect_delay
                 logger.info("markprice_reconnecting", delay_sec=delay)
                 await asyncio.sleep(delay)
 
-    async def _handle_mark_price_msg(self, raw: str) -> None:
+    async def _handle_mark_price_msg(self, raw: str) -> int | None:
         """
-        Mark Price dizisini parse edip MemoryStore'daki fiyat cache'ini günceller.
-        Sadece takip edilen sembolleri günceller (performans için).
+        Mark Price dizisini parse edip MemoryStore'daki fiyat tablosunu günceller.
+        Sadece takip edilen (ve sadece-fiyat) sembolleri günceller; tüm yük tek vektörel yazımla işlenir.
+        Returns: Olay zamanı (E, ms); işlenmeyen mesajda None.
         """
         try:
             items = json.loads(raw)
-            if not isinstance(items, list):
-                return
+            if not isinstance(items, list) or not items:
+                return None
+            event_ms = int(items[0].get("E", 0))
 
-            tracked = set(self._symbols)
+            tracked = self._price_tracked
+            symbols: list[str] = []
+            prices: list[float] = []
             for item in items:
-                sym = item.get("s", "").lower()
-                if sym in tracked:
-                    price = float(item["p"])  # mark price
-                    await self._store.update_price(item["s"], price)
+                sym = item.get("s", "")
+                if sym.lower() in tracked:
+                    symbols.append(sym)
+                    prices.append(float(item["p"]))  # mark price
+            if symbols:
+                ids = self._store.price_ids_nowait(symbols)
+                self._store.update_prices_nowait(ids, np.asarray(prices, dtype=np.float64), event_ms)
+            return event_ms
 
         except (KeyError, ValueError, TypeError) as e:
             logger.debug("markprice_parse_skip", error=str(e))
+            return None
@@ -10,16 +10,17 @@ Fiyat verisini MemoryStore'daki mark price cache'inden alır
 """
 from __future__ import annotations
 
-import asyncio
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Dict
+from typing import TYPE_CHECKING, Dict, Tuple
 
+from core.clock import SYSTEM_CLOCK
 from core.database import get_session
 from core.logger import get_logger
 from models.db_models import TradeRecord
 
 if TYPE_CHECKING:
+    from core.clock import Clock
     from core.config import TradingConfig
     from data.memory_store import MemoryStore
     from strategies.base_strategy import Signal
@@ -37,6 +38,11 @@ class VirtualPosition:
     tp_price: float
     sl_price: float
     opened_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    strategy: str = ""
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.strategy, self.symbol)
 
 
 class PositionWatcher:
@@ -58,11 +64,15 @@ class PositionWatcher:
         config: TradingConfig,
         store: MemoryStore,
         on_close_callback=None,
+        clock: Clock | None = None,
     ) -> None:
         self._config = config
         self._store = store
+        # Zaman stopu, açılış/kapanış zamanları ve kontrol aralığı bu saatle ölçülür
+        self._clock = clock or SYSTEM_CLOCK
         self._on_close = on_close_callback  # async func(text: str) — Telegram bildirimi
-        self._positions: Dict[str, VirtualPosition] = {}
+        # {(strateji, sembol): pozisyon} — her strateji aynı sembolde ayrı pozisyon tutabilir
+        self._positions: Dict[Tuple[str, str], VirtualPosition] = {}
         self._running = False
 
     # ── Public API ────────────────────────────────────────────────────
@@ -76,10 +86,13 @@ class PositionWatcher:
             entry_price=signal.entry_price,
             tp_price=signal.tp_price,
             sl_price=signal.sl_price,
+            opened_at=self._clock.now(),
+            strategy=signal.strategy,
         )
-        self._positions[signal.symbol] = pos
+        self._positions[pos.key] = pos
         logger.info(
             "virtual_position_opened",
+            strategy=signal.strategy,
             symbol=signal.symbol,
             side=signal.side,
             entry=signal.entry_price,
@@ -102,7 +115,7 @@ class PositionWatcher:
                     error=str(e),
                     error_type=type(e).__name__,
                 )
-            await asyncio.sleep(self._config.trade_control_seconds)
+            await self._clock.sleep(self._config.trade_control_seconds)
 
     async def stop(self) -> None:
         """Döngüyü durdurur."""
@@ -111,8 +124,26 @@ class PositionWatcher:
 
     @property
     def tracked_symbols(self) -> set[str]:
-        """Şu an takip edilen sembollerin kümesi."""
-        return set(self._positions.keys())
+        """Şu an (herhangi bir strateji için) takip edilen sembollerin kümesi."""
+        return {symbol for _strategy, symbol in self._positions}
+
+    def tracked_for(self, strategy: str) -> set[str]:
+        """Belirtilen stratejinin takip ettiği semboller."""
+        return {symbol for name, symbol in self._positions if name == strategy}
+
+    async def close_symbol(self, symbol: str, reason: str = "DELISTED") -> int:
+        """
+        Sembolün tüm sanal pozisyonlarını son bilinen fiyattan kapatır.
+        Sembol borsadan kalktığında (delist) fiyat akışı kesileceği için pozisyon
+        sonsuza dek açık kalmasın diye çağrılır; sadece sıralamadan düşen semboller
+        için çağrılmaz. Fiyat hiç gelmediyse giriş fiyatından (PnL 0) kapatılır.
+        Returns: Kapatılan pozisyon sayısı.
+        """
+        positions = [pos for pos in self._positions.values() if pos.symbol == symbol]
+        price = self._store.get_price_nowait(symbol)
+        for pos in positions:
+            await self._close_position(pos, pos.entry_price if price is None else price, reason)
+        return len(positions)
 
     # ── Kontrol Mantığı ───────────────────────────────────────────────
 
@@ -121,13 +152,13 @@ class PositionWatcher:
         if not self._positions:
             return
 
-        for symbol in list(self._positions.keys()):
-            pos = self._positions.get(symbol)
-            if pos is None:
-                continue
+        # Tüm pozisyonların fiyatlarını tek seferde oku
+        keys = list(self._positions.keys())
+        prices = self._store.get_prices_nowait([symbol for _strategy, symbol in keys])
 
-            price = await self._store.get_price(symbol)
-            if price is None:
+        for key, price in zip(keys, prices.tolist()):
+            pos = self._positions.get(key)
+            if pos is None or price != price:  # NaN → fiyat henüz yok
                 continue
 
             close_reason: str | None = None
@@ -147,7 +178,7 @@ class PositionWatcher:
             # ── Zaman Stopu ───────────────────────────────────────────
             else:
                 elapsed_hours = (
-                    datetime.now(timezone.utc) - pos.opened_at
+                    self._clock.now() - pos.opened_at
                 ).total_seconds() / 3600
                 if elapsed_hours >= self._config.time_stop_hours:
                     close_reason = "TIMEOUT"
@@ -166,27 +197,31 @@ class PositionWatcher:
             pnl_pct = ((pos.entry_price - close_price) / pos.entry_price) * 100
 
         # Pozisyonu sil
-        self._positions.pop(pos.symbol, None)
-
-        # DB'ye kaydet
-        try:
-            async with get_session() as session:
-                trade = TradeRecord(
-                    signal_id=pos.signal_id,
-                    close_reason=reason,
-                    close_price=close_price,
-                    pnl_percent=round(pnl_pct, 4),
-                )
-                session.add(trade)
-                await session.commit()
-        except Exception as e:
-            logger.error("trade_save_failed", error=str(e), symbol=pos.symbol)
+        self._positions.pop(pos.key, None)
+
+        # DB'ye kaydet (replay'de yazım bitene kadar sanal saat bekletilir)
+        closed_at = self._clock.now()
+        async with self._clock.hold():
+            try:
+                async with get_session() as session:
+                    trade = TradeRecord(
+                        signal_id=pos.signal_id,
+                        close_reason=reason,
+                        close_price=close_price,
+                        pnl_percent=round(pnl_pct, 4),
+                        closed_at=closed_at,
+                    )
+                    session.add(trade)
+                    await session.commit()
+            except Exception as e:
+                logger.error("trade_save_failed", error=str(e), symbol=pos.symbol)
 
         # Telegram bildirimi
-        icon = {"TP": "✅ TP", "SL": "❌ SL", "TIMEOUT": "⏱ TIMEOUT"}.get(reason, reason)
+        icon = {"TP": "✅ TP", "SL": "❌ SL", "TIMEOUT": "⏱ TIMEOUT", "DELISTED": "🚫 DELISTED"}.get(reason, reason)
         pnl_icon = "🟢" if pnl_pct >= 0 else "🔴"
+        tag = f" [{pos.strategy}]" if pos.strategy else ""
         msg = (
-            f"{icon} | <b>{pos.symbol}</b> Kapatıldı\n"
+            f"{icon} | <b>{pos.symbol}</b>{tag} Kapatıldı\n"
             f"📍 Giriş: {pos.entry_price} → Çıkış: {close_price}\n"
             f"{pnl_icon} PnL: {pnl_pct:+.2f}%"
         )
@@ -199,6 +234,7 @@ class PositionWatcher:
 
         logger.info(
             "virtual_position_closed",
+            strategy=pos.strategy,
             symbol=pos.symbol,
             reason=reason,
             pnl_percent=round(pnl_pct, 4),
@@ -16,11 +16,13 @@ from typing import TYPE_CHECKING
 from telegram import Bot
 from telegram.constants import ParseMode
 
+from core.clock import SYSTEM_CLOCK
 from core.database import get_session
 from core.logger import get_logger
 from models.db_models import MarketSnapshot, SignalRecord
 
 if TYPE_CHECKING:
+    from core.clock import Clock
     from core.config import TradingConfig
     from execution.position_watcher import PositionWatcher
     from strategies.base_strategy import Signal
@@ -40,10 +42,14 @@ class SignalDispatcher:
         self,
         config: TradingConfig,
         position_watcher: PositionWatcher,
+        clock: Clock | None = None,
     ) -> None:
         self._config = config
         self._watcher = position_watcher
-        self._telegram = Bot(token=config.telegram_bot_token)
+        # Replay'de dağıtım (DB G/Ç'si dahil) bitene kadar sanal saat bekletilir
+        self._clock = clock or SYSTEM_CLOCK
+        # Token yoksa (replay, yerel test) Telegram gönderimi atlanır
+        self._telegram = Bot(token=config.telegram_bot_token) if config.telegram_bot_token else None
 
     # ── Ana Dağıtım Metodu ────────────────────────────────────────────
 
@@ -55,17 +61,19 @@ class SignalDispatcher:
           3. PositionWatcher'a aktar (sanal takip)
         """
         try:
-            # 1. Veritabanına kaydet
-            signal_id = await self._save_to_db(signal)
+            async with self._clock.hold():
+                # 1. Veritabanına kaydet
+                signal_id = await self._save_to_db(signal)
 
-            # 2. Telegram bildirimi
-            await self._send_telegram(signal)
+                # 2. Telegram bildirimi
+                await self._send_telegram(signal)
 
-            # 3. Sanal pozisyon takibine ekle
-            await self._watcher.track(signal, signal_id)
+                # 3. Sanal pozisyon takibine ekle
+                await self._watcher.track(signal, signal_id)
 
             logger.info(
                 "signal_dispatched",
+                strategy=signal.strategy,
                 symbol=signal.symbol,
                 side=signal.side,
                 signal_id=signal_id,
@@ -91,9 +99,13 @@ class SignalDispatcher:
 
     async def _send_telegram(self, signal: Signal) -> None:
         """HTML formatında sinyal mesajı gönderir."""
+        if self._telegram is None:
+            return
         try:
+            strategy_line = f"🧠 Strateji: {signal.strategy}\n" if signal.strategy else ""
             msg = (
                 f"🔔 <b>#{signal.symbol} {signal.side}</b>\n"
+                f"{strategy_line}"
                 f"📈 Giriş: {signal.entry_price}\n"
                 f"🎯 TP: {signal.tp_price}\n"
                 f"🛡️ SL: {signal.sl_price}\n"
@@ -110,6 +122,8 @@ class SignalDispatcher:
 
     async def send_notification(self, text: str) -> None:
         """Genel amaçlı Telegram bildirimi (başlangıç, kapanış vb.)."""
+        if self._telegram is None:
+            return
         try:
             await self._telegram.send_message(
                 chat_id=self._config.telegram_chat_id,
@@ -126,6 +140,7 @@ class SignalDispatcher:
         async with get_session() as session:
             record = SignalRecord(
                 symbol=signal.symbol,
+                strategy=signal.strategy or None,
                 side=signal.side,
                 entry_price=signal.entry_price,
                 tp_price=signal.tp_price,
@@ -8,7 +8,8 @@ Akış:
   2. Veritabanını başlat
   3. Aktif sembol listesini çek (public REST, API Key gerektirmez)
   4. WebSocket istemcisini başlat (Kline + Mark Price)
-  5. Strateji tarama döngüsünü başlat
+  5. Strateji tarama döngüsünü başlat (periyodik veya mum kapanışı tetiklemeli)
+     — SIGHUP / dosya değişikliğinde stratejiler store'a dokunmadan yeniden yüklenir
   6. Position Watcher'ı başlat
   7. Graceful shutdown
 
@@ -21,30 +22,47 @@ import asyncio
 import platform
 import signal as os_signal
 import sys
+import time
+from dataclasses import replace
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Awaitable, Callable
 
 import aiohttp
 
-from core.config import TradingConfig
+from core.clock import SYSTEM_CLOCK, Clock
+from core.config import TradingConfig, reload_config
 from core.database import close_db, init_db
 from core.logger import get_logger, setup_logging
-from data.memory_store import MemoryStore
-from data.rest_client import preload_history
+from data.feed_recorder import FeedRecorder
+from data.kline_cache import KlineCache
+from data.memory_store import TS, MemoryStore, split_timeframes, timeframe_ms
+from data.rest_client import RateBudget, preload_history
+from data.snapshot import load_snapshot, save_snapshot
 from data.websocket_client import BinanceWebSocketClient
 from execution.position_watcher import PositionWatcher
 from execution.signal_dispatcher import SignalDispatcher
-from strategies.base_strategy import BaseStrategy
-from strategies.loader import load_strategy
+from strategies.base_strategy import BaseStrategy, Signal
+from strategies.indicator_cache import IndicatorCache
+from strategies.indicator_engine import IndicatorEngine
+from strategies.loader import (
+    load_strategies,
+    reload_strategies,
+    required_timeframes,
+    strategy_source_files,
+)
+from strategies.process_evaluator import ProcessEvaluator
 
 logger = get_logger(__name__)
 
 
 # ── Sembol Listesi Çekme (Public REST) ────────────────────────────────
 
-async def fetch_active_symbols(limit: int = 100) -> list[str]:
+async def fetch_trading_symbols() -> list[str] | None:
     """
-    Binance Futures'tan halka açık endpoint ile aktif USDT
-    perpetual sembollerini çeker. API Key gerektirmez.
+    Binance Futures'tan halka açık endpoint ile işlemde olan (TRADING) tüm
+    USDT perpetual sembollerini çeker. API Key gerektirmez.
+    Returns: Sembol listesi; istek başarısızsa None.
     """
     url = "https://fapi.binance.com/fapi/v1/exchangeInfo"
     try:
@@ -60,95 +78,539 @@ async def fetch_active_symbols(limit: int = 100) -> list[str]:
             and s.get("quoteAsset") == "USDT"
         ]
         logger.info("symbols_fetched", count=len(symbols))
-        return symbols[:limit]
+        return symbols
 
     except Exception as e:
         logger.error("symbol_fetch_failed", error=str(e))
+        return None
+
+
+async def fetch_active_symbols(limit: int = 100) -> list[str]:
+    """İşlemdeki sembollerin ilk ``limit`` tanesini döndürür (hata durumunda sabit liste)."""
+    symbols = await fetch_trading_symbols()
+    if symbols is None:
         return ["BTCUSDT", "ETHUSDT", "SOLUSDT"]  # fallback
+    return symbols[:limit]
+
+
+# ── Strateji Tarama Yardımcıları ─────────────────────────────────────
+
+# Cooldown ve görülen sürüm sözlükleri (strateji adı, sembol) ile ad alanlanır
+_Key = tuple[str, str]
+
+
+def _select_candidates(
+    strategy: BaseStrategy,
+    symbols: list[str],
+    watcher: PositionWatcher,
+    cooldowns: dict[_Key, datetime],
+    cooldown_delta: timedelta,
+    clock: Clock,
+) -> list[str]:
+    """Stratejinin takipte olan ve cooldown süresi dolmamış sembollerini çıkarır."""
+    name = strategy.name
+    tracked = watcher.tracked_for(name)
+    now = clock.now()
+    return [
+        s for s in symbols
+        if s not in tracked
+        and ((name, s) not in cooldowns or (now - cooldowns[(name, s)]) >= cooldown_delta)
+    ]
+
+
+async def _evaluate_symbols(
+    config: TradingConfig,
+    strategy: BaseStrategy,
+    symbols: list[str],
+    evaluator: ProcessEvaluator | None = None,
+) -> tuple[list[Signal], list[str]]:
+    """
+    Sembolleri stratejiyle değerlendirir ve sinyalleri strateji adıyla etiketler.
+
+    Returns:
+        (sinyaller, hatasız değerlendirilen semboller)
+    """
+    if not symbols:
+        return [], []
+    signals, evaluated = await _run_strategy(config, strategy, symbols, evaluator)
+    return [replace(sig, strategy=strategy.name) for sig in signals], evaluated
+
+
+async def _run_strategy(
+    config: TradingConfig,
+    strategy: BaseStrategy,
+    symbols: list[str],
+    evaluator: ProcessEvaluator | None,
+) -> tuple[list[Signal], list[str]]:
+    """Süreç havuzu varsa işçilerde, yoksa event loop'ta (toplu API varsa tek vektörel geçişte)."""
+    if evaluator is not None:
+        try:
+            return await evaluator.evaluate(strategy, symbols), list(symbols)
+        except Exception as e:
+            logger.error(
+                "pool_eval_exception",
+                strategy=strategy.name,
+                error=str(e),
+                error_type=type(e).__name__,
+            )
+            return [], []
+
+    if strategy.supports_batch:
+        try:
+            return strategy.evaluate_batch(strategy.build_market(symbols)), list(symbols)
+        except Exception as e:
+            logger.error("batch_eval_exception", strategy=strategy.name, error=str(e))
+            return [], []
+
+    # Paralel değerlendirme (semaphore ile sınırlandırılmış)
+    semaphore = asyncio.Semaphore(config.max_parallel_tasks)
+
+    async def _eval(sym: str):
+        async with semaphore:
+            return await strategy.evaluate(sym)
+
+    results = await asyncio.gather(*[_eval(s) for s in symbols], return_exceptions=True)
+
+    # Hatalı sonuçları filtrele, sinyalleri topla
+    signals, evaluated = [], []
+    for sym, res in zip(symbols, results):
+        if isinstance(res, Exception):
+            logger.debug("eval_exception", strategy=strategy.name, error=str(res))
+            continue
+        evaluated.append(sym)
+        if res is not None:
+            signals.append(res)
+    return signals, evaluated
+
+
+async def _dispatch_top(
+    config: TradingConfig,
+    dispatcher: SignalDispatcher,
+    cooldowns: dict[_Key, datetime],
+    signals: list[Signal],
+    clock: Clock,
+) -> list[Signal]:
+    """
+    Tek bir stratejinin sinyallerini en güçlü hacim spike'ına göre sıralayıp
+    en fazla N tanesini gönderir.
+
+    Returns:
+        Gönderilemeyen (limit dışında kalan) sinyaller.
+    """
+    signals.sort(key=lambda s: s.spike_ratio, reverse=True)
+    for sig in signals[: config.max_tracked_signals]:
+        await dispatcher.dispatch(sig)
+        # Cooldown başlat
+        cooldowns[(sig.strategy, sig.symbol)] = clock.now()
+    return signals[config.max_tracked_signals:]
 
 
 # ── Strateji Tarama Döngüsü ──────────────────────────────────────────
 
 async def strategy_scan_loop(
     config: TradingConfig,
-    strategy: BaseStrategy,
+    strategies: list[BaseStrategy],
     dispatcher: SignalDispatcher,
     watcher: PositionWatcher,
     store: MemoryStore,
     symbols: list[str],
+    indicator_cache: IndicatorCache | None = None,
+    evaluator: ProcessEvaluator | None = None,
+    clock: Clock | None = None,
 ) -> None:
     """
-    Periyodik olarak tüm sembolleri strateji ile değerlendirir.
+    Periyodik olarak tüm sembolleri aktif stratejilerin her biriyle değerlendirir.
     Sinyal bulunursa dispatcher aracılığıyla Telegram + DB + Watcher'a gönderir.
+    Tarama aralığı ve cooldown'lar clock ile ölçülür (varsayılan: gerçek zaman).
     """
-    logger.info("scan_loop_started", interval_sec=config.scan_interval_seconds)
+    clock = clock or SYSTEM_CLOCK
+    logger.info(
+        "scan_loop_started",
+        interval_sec=config.scan_interval_seconds,
+        strategies=[s.name for s in strategies],
+    )
 
-    # Cooldown sözlüğü: {symbol: son_sinyal_zamanı}
-    cooldowns: dict[str, datetime] = {}
+    # Cooldown sözlüğü: {(strateji, sembol): son_sinyal_zamanı}
+    cooldowns: dict[_Key, datetime] = {}
     cooldown_delta = timedelta(minutes=config.cooldown_minutes)
 
+    # Son değerlendirmedeki store sürümleri: {(strateji, sembol): (tf1_ver, tf2_ver, ...)}
+    # Sürümü değişmemiş (yeni mum kapanmamış) semboller yeniden değerlendirilmez.
+    seen_versions: dict[_Key, tuple[int, ...]] = {}
+    # Stratejinin son taranan örneği; yeniden yüklenen strateji tüm sembolleri baştan tarar
+    scanned_by: dict[str, BaseStrategy] = {}
+
     while True:
         try:
-            scan_start = datetime.now(timezone.utc)
-            tracked = watcher.tracked_symbols
-
-            # Cooldown filtresi: son N dakikada sinyal üretilen sembolleri çıkar
-            now = datetime.now(timezone.utc)
-            candidates = [
-                s for s in symbols
-                if s not in tracked
-                and (s not in cooldowns or (now - cooldowns[s]) >= cooldown_delta)
-            ]
-            logger.info(
-                "scan_cycle_start",
-                total=len(candidates),
-                tracked=len(tracked),
-                cooled=len(symbols) - len(candidates) - len(tracked),
-            )
+            for strategy in list(strategies):
+                if scanned_by.get(strategy.name) is not strategy:
+                    scanned_by[strategy.name] = strategy
+                    for key in [k for k in seen_versions if k[0] == strategy.name]:
+                        del seen_versions[key]
+                await _scan_strategy(
+                    config, strategy, dispatcher, watcher, store, symbols,
+                    cooldowns, cooldown_delta, seen_versions, indicator_cache, evaluator, clock,
+                )
+            # Listeden çıkarılan sembollerin kayıtları birikmesin
+            if len(seen_versions) > len(strategies) * len(symbols):
+                listed = set(symbols)
+                for key in [k for k in seen_versions if k[1] not in listed]:
+                    del seen_versions[key]
+
+            await clock.sleep(config.scan_interval_seconds)
+
+        except asyncio.CancelledError:
+            logger.info("scan_loop_cancelled")
+            break
+        except Exception as e:
+            logger.error("scan_loop_error", error=str(e), error_type=type(e).__name__)
+            await clock.sleep(60)
+
+
+async def _scan_strategy(
+    config: TradingConfig,
+    strategy: BaseStrategy,
+    dispatcher: SignalDispatcher,
+    watcher: PositionWatcher,
+    store: MemoryStore,
+    symbols: list[str],
+    cooldowns: dict[_Key, datetime],
+    cooldown_delta: timedelta,
+    seen_versions: dict[_Key, tuple[int, ...]],
+    indicator_cache: IndicatorCache | None,
+    evaluator: ProcessEvaluator | None,
+    clock: Clock,
+) -> None:
+    """Tek bir stratejinin periyodik tarama turu."""
+    name = strategy.name
+    scan_start = datetime.now(timezone.utc)
+    tracked = watcher.tracked_for(name)
+
+    # Cooldown filtresi: son N dakikada sinyal üretilen sembolleri çıkar
+    candidates = _select_candidates(strategy, symbols, watcher, cooldowns, cooldown_delta, clock)
+    invalidating_tfs = strategy.invalidating_timeframes
+    versions = {
+        s: tuple(store.get_version_nowait(s, tf) for tf in invalidating_tfs)
+        for s in candidates
+    }
+    dirty = [s for s in candidates if seen_versions.get((name, s)) != versions[s]]
+    logger.info(
+        "scan_cycle_start",
+        strategy=name,
+        total=len(candidates),
+        dirty=len(dirty),
+        tracked=len(tracked),
+        cooled=len(symbols) - len(candidates) - len(tracked),
+    )
 
-            # Paralel değerlendirme (semaphore ile sınırlandırılmış)
-            semaphore = asyncio.Semaphore(config.max_parallel_tasks)
+    signals, evaluated = await _evaluate_symbols(config, strategy, dirty, evaluator)
+    for sym in evaluated:
+        seen_versions[(name, sym)] = versions[sym]
+
+    logger.info(
+        "scan_cycle_complete",
+        strategy=name,
+        scanned=len(dirty),
+        skipped=len(candidates) - len(dirty),
+        batch=strategy.supports_batch,
+        signals_found=len(signals),
+        elapsed_ms=int((datetime.now(timezone.utc) - scan_start).total_seconds() * 1000),
+        **({"indicator_cache": indicator_cache.stats()} if indicator_cache else {}),
+    )
 
-            async def _eval(sym: str):
-                async with semaphore:
-                    return await strategy.evaluate(sym)
+    if signals:
+        dropped = await _dispatch_top(config, dispatcher, cooldowns, signals, clock)
+        # Gönderilemeyen sinyaller bir sonraki turda yeniden değerlendirilsin
+        for sig in dropped:
+            seen_versions.pop((name, sig.symbol), None)
 
-            tasks = [_eval(s) for s in candidates]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
 
-            # Hatalı sonuçları filtrele, sinyalleri topla
-            signals = []
-            for res in results:
-                if isinstance(res, Exception):
-                    logger.debug("eval_exception", error=str(res))
-                elif res is not None:
-                    signals.append(res)
+# ── Olay Tabanlı Tarama (Mum Kapanışı) ───────────────────────────────
 
-            logger.info(
-                "scan_cycle_complete",
-                scanned=len(candidates),
-                signals_found=len(signals),
-                elapsed_ms=int((datetime.now(timezone.utc) - scan_start).total_seconds() * 1000),
-            )
+async def strategy_event_loop(
+    config: TradingConfig,
+    strategies: list[BaseStrategy],
+    dispatcher: SignalDispatcher,
+    watcher: PositionWatcher,
+    store: MemoryStore,
+    symbols: list[str],
+    indicator_cache: IndicatorCache | None = None,
+    evaluator: ProcessEvaluator | None = None,
+    clock: Clock | None = None,
+) -> None:
+    """
+    Mum kapanışı olaylarıyla tetiklenen tarama (SCAN_MODE=event).
+
+    Store'a yazılan her kapanmış mum (WebSocket veya 1m'den türetilmiş)
+    kuyruğa alınır; döngü aynı anda biriken olayları tek turda toplar ve
+    her stratejiyi sadece bağlı olduğu timeframe'de mumu kapanan sembollerle
+    hemen değerlendirir. Her sinyal için mum kapanışından sinyale kadar
+    geçen süre (clock ile) loglanır.
+    """
+    clock = clock or SYSTEM_CLOCK
+    # Herhangi bir stratejinin bağlı olduğu timeframe'ler (her turda tazelenir)
+    watched_tfs: set[str] = set()
+
+    def _refresh_watched() -> None:
+        watched_tfs.clear()
+        watched_tfs.update(tf for s in strategies for tf in s.invalidating_timeframes)
+
+    _refresh_watched()
+    logger.info(
+        "event_loop_started",
+        timeframes=sorted(watched_tfs),
+        strategies=[s.name for s in strategies],
+    )
 
-            if signals:
-                # En güçlü hacim spike'ına göre sırala, en fazla N sinyal gönder
-                signals.sort(key=lambda s: s.spike_ratio, reverse=True)
-                top_signals = signals[: config.max_tracked_signals]
+    # (symbol, timeframe, mum_kapanış_ms)
+    events: asyncio.Queue[tuple[str, str, int]] = asyncio.Queue()
 
-                for sig in top_signals:
-                    await dispatcher.dispatch(sig)
-                    # Cooldown başlat
-                    cooldowns[sig.symbol] = datetime.now(timezone.utc)
+    def _on_candle(symbol: str, timeframe: str, candle, is_closed: bool) -> None:
+        if is_closed and timeframe in watched_tfs:
+            events.put_nowait((symbol, timeframe, int(candle[TS]) + timeframe_ms(timeframe)))
 
-            await asyncio.sleep(config.scan_interval_seconds)
+    store.add_candle_listener(_on_candle)
+
+    cooldowns: dict[_Key, datetime] = {}
+    cooldown_delta = timedelta(minutes=config.cooldown_minutes)
+
+    try:
+        while True:
+            try:
+                # İlk olayı bekle, aynı anda kapanan diğerlerini beklemeden topla
+                first = await events.get()
+                batch = [first]
+                while not events.empty():
+                    batch.append(events.get_nowait())
+
+                active = set(symbols)
+                for strategy in list(strategies):
+                    await _handle_close_events(
+                        config, strategy, dispatcher, watcher, batch, active,
+                        cooldowns, cooldown_delta, indicator_cache, evaluator, clock,
+                    )
+                _refresh_watched()
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("event_loop_error", error=str(e), error_type=type(e).__name__)
+    except asyncio.CancelledError:
+        logger.info("event_loop_cancelled")
+    finally:
+        store.remove_candle_listener(_on_candle)
+
+
+async def _handle_close_events(
+    config: TradingConfig,
+    strategy: BaseStrategy,
+    dispatcher: SignalDispatcher,
+    watcher: PositionWatcher,
+    batch: list[tuple[str, str, int]],
+    active: set[str],
+    cooldowns: dict[_Key, datetime],
+    cooldown_delta: timedelta,
+    indicator_cache: IndicatorCache | None,
+    evaluator: ProcessEvaluator | None,
+    clock: Clock,
+) -> None:
+    """Bir kapanış olayı grubunu tek bir strateji için değerlendirir."""
+    scan_start = time.time()
+    invalidating_tfs = set(strategy.invalidating_timeframes)
+
+    # Sembol → (ilk kapanış zamanı, tetikleyen timeframe)
+    closes: dict[str, tuple[int, str]] = {}
+    for sym, tf, close_ms in batch:
+        if tf not in invalidating_tfs or sym not in active:
+            continue
+        if sym not in closes or close_ms < closes[sym][0]:
+            closes[sym] = (close_ms, tf)
+    if not closes:
+        return
+
+    dirty = _select_candidates(strategy, list(closes), watcher, cooldowns, cooldown_delta, clock)
+    signals, _evaluated = await _evaluate_symbols(config, strategy, dirty, evaluator)
+
+    now_ms = clock.time_ms()
+    for sig in signals:
+        close_ms, tf = closes[sig.symbol]
+        logger.info(
+            "event_signal_latency",
+            strategy=strategy.name,
+            symbol=sig.symbol,
+            timeframe=tf,
+            close_to_signal_ms=now_ms - close_ms,
+        )
+
+    logger.debug(
+        "event_scan_complete",
+        strategy=strategy.name,
+        events=len(closes),
+        scanned=len(dirty),
+        signals_found=len(signals),
+        max_close_lag_ms=now_ms - min(c for c, _ in closes.values()),
+        elapsed_ms=int((time.time() - scan_start) * 1000),
+        **({"indicator_cache": indicator_cache.stats()} if indicator_cache else {}),
+    )
+
+    if signals:
+        await _dispatch_top(config, dispatcher, cooldowns, signals, clock)
+
+
+_SCAN_LOOPS: dict[str, Callable[..., Awaitable[None]]] = {
+    "interval": strategy_scan_loop,
+    "event": strategy_event_loop,
+}
+
+
+def select_scan_loop(config: TradingConfig) -> Callable[..., Awaitable[None]]:
+    """
+    SCAN_MODE'a göre tarama döngüsünü seçer (büyük/küçük harf ve boşluk önemsiz).
+    Bilinmeyen değer (örn. "events") sessizce interval moduna düşmesin diye ValueError fırlatır.
+    """
+    mode = config.scan_mode.strip().lower()
+    loop = _SCAN_LOOPS.get(mode)
+    if loop is None:
+        raise ValueError(f"Geçersiz SCAN_MODE={config.scan_mode!r}; geçerli değerler: {', '.join(_SCAN_LOOPS)}")
+    return loop
+
+
+# ── Strateji Sıcak Yeniden Yükleme ───────────────────────────────────
+
+_RELOAD_POLL_SECONDS = 2
+_DRY_RUN_SYMBOLS = 5
+
+
+async def strategy_reload_loop(
+    config: TradingConfig,
+    strategies: list[BaseStrategy],
+    store: MemoryStore,
+    symbols: list[str],
+    available_tfs: set[str],
+    reload_event: asyncio.Event,
+    indicator_engine: IndicatorEngine,
+    indicator_cache: IndicatorCache,
+    evaluator: ProcessEvaluator | None = None,
+) -> None:
+    """
+    reload_event (SIGHUP) set edildiğinde veya STRATEGY_HOT_RELOAD açıkken strateji
+    kaynak dosyaları / .env değiştiğinde stratejileri yeniden yükler.
+
+    WebSocket akışı ve MemoryStore içeriği olduğu gibi kalır; sadece
+    tarama döngülerinin paylaştığı strategies listesi yerinde değiştirilir.
+    """
+    env_file = Path(__file__).resolve().parent / ".env"
+
+    def _mtimes() -> dict[Path, float]:
+        stamps = {}
+        for path in [*strategy_source_files(strategies), env_file]:
+            try:
+                stamps[path] = path.stat().st_mtime
+            except OSError:
+                continue
+        return stamps
+
+    stamps = _mtimes()
+    logger.info(
+        "strategy_reload_ready",
+        watch_files=config.strategy_hot_reload,
+        files=[p.name for p in stamps] if config.strategy_hot_reload else [],
+    )
+
+    while True:
+        try:
+            try:
+                await asyncio.wait_for(reload_event.wait(), timeout=_RELOAD_POLL_SECONDS)
+                trigger = "signal"
+            except asyncio.TimeoutError:
+                if not config.strategy_hot_reload:
+                    continue
+                current = _mtimes()
+                if current == stamps:
+                    continue
+                trigger = "file"
+            reload_event.clear()
+
+            await _reload_strategies(
+                strategies, store, symbols, available_tfs,
+                indicator_engine, indicator_cache, evaluator, trigger,
+            )
+            stamps = _mtimes()
 
         except asyncio.CancelledError:
-            logger.info("scan_loop_cancelled")
             break
         except Exception as e:
-            logger.error("scan_loop_error", error=str(e), error_type=type(e).__name__)
-            await asyncio.sleep(60)
+            logger.error("strategy_reload_loop_error", error=str(e), error_type=type(e).__name__)
+
+
+async def _reload_strategies(
+    strategies: list[BaseStrategy],
+    store: MemoryStore,
+    symbols: list[str],
+    available_tfs: set[str],
+    indicator_engine: IndicatorEngine,
+    indicator_cache: IndicatorCache,
+    evaluator: ProcessEvaluator | None,
+    trigger: str,
+) -> bool:
+    """
+    Yeni stratejileri yükler, doğrular ve çalışan listeyle tek adımda değiştirir.
+    Herhangi bir adım başarısız olursa mevcut stratejiler çalışmaya devam eder.
+    Eski stratejilerin akışlı indikatörleri motordan kaldırılır.
+    """
+    new_strategies: list[BaseStrategy] = []
+    try:
+        new_config = reload_config()
+        new_strategies = reload_strategies(new_config, store)
+
+        # Akış ve abonelikler değişmediği için yeni timeframe'ler veri alamaz
+        missing = [tf for tf in required_timeframes(new_strategies) if tf not in available_tfs]
+        if missing:
+            raise ValueError(f"Abone olunmayan timeframe'ler: {missing}")
+
+        for strategy in new_strategies:
+            strategy.attach_indicator_engine(indicator_engine)
+            strategy.attach_indicator_cache(indicator_cache)
+            await _dry_run(strategy, symbols[:_DRY_RUN_SYMBOLS])
+
+    except Exception as e:
+        # Yarım kayıtları geri al; mevcut stratejilerin indikatörleri yeniden kaydedilir
+        if new_strategies:
+            for strategy in new_strategies:
+                indicator_engine.unregister(strategy)
+            for strategy in strategies:
+                strategy.attach_indicator_engine(indicator_engine)
+        logger.error(
+            "strategy_reload_failed",
+            trigger=trigger,
+            error=str(e),
+            error_type=type(e).__name__,
+            kept=[s.name for s in strategies],
+        )
+        return False
+
+    # Await yok → tarama döngüleri listeyi yarım güncellenmiş göremez
+    old_strategies = list(strategies)
+    strategies[:] = new_strategies
+    for strategy in old_strategies:
+        indicator_engine.unregister(strategy)
+    if evaluator is not None:
+        evaluator.invalidate(new_config)
+    logger.info(
+        "strategy_reloaded",
+        trigger=trigger,
+        strategies=[s.name for s in new_strategies],
+    )
+    return True
+
+
+async def _dry_run(strategy: BaseStrategy, symbols: list[str]) -> None:
+    """Yeni stratejiyi canlı veride birkaç sembolle çalıştırır; hata varsa fırlatır."""
+    if strategy.supports_batch:
+        strategy.evaluate_batch(strategy.build_market(symbols))
+        return
+    for symbol in symbols:
+        await strategy.evaluate(symbol)
 
 
 # ── Sembol Listesi Yenileme Döngüsü ──────────────────────────────────
@@ -157,24 +619,104 @@ async def symbol_refresh_loop(
     config: TradingConfig,
     ws_client: BinanceWebSocketClient,
     symbols_ref: list,
+    store: MemoryStore,
+    timeframes: list[str],
+    kline_cache: KlineCache | None = None,
+    indicator_engine: IndicatorEngine | None = None,
+    watcher: PositionWatcher | None = None,
 ) -> None:
-    """Market listesini periyodik olarak günceller."""
+    """
+    Market listesini periyodik olarak günceller; sadece fark işlenir.
+
+    Yeni semboller için geçmiş, abonelikten önce yüklenir (canlı mum önce gelirse
+    load_history daha eski mumları atlar). Listeden çıkan sembollerin kline
+    stream'leri UNSUBSCRIBE edilir ve tarama dışında kalırlar; ardından
+    MemoryStore tamponları, fiyat slotları ve indikatör durumları silinir.
+
+    Sadece sıralamadan düşen (hâlâ TRADING olan) bir sembolde açık sanal pozisyon
+    varsa sembolün mark price'ı akmaya devam eder ve silinmesi, pozisyonlar
+    TP/SL/TIMEOUT ile kapandıktan sonraki ilk tura ertelenir. Pozisyonlar yalnızca
+    sembol borsadan kalktığında (delist) son fiyattan "DELISTED" ile zorla kapatılır;
+    aksi halde fiyat akışı kesileceği için hiç kapanmazlar.
+    """
     refresh_interval = config.market_refresh_hours * 3600
+    # Listeden düşmüş ama açık pozisyonu olduğu için silinmesi bekletilen semboller
+    held: set[str] = set()
 
     while True:
         await asyncio.sleep(refresh_interval)
         try:
-            new_symbols = await fetch_active_symbols(config.top_volume_limit)
-            symbols_ref.clear()
-            symbols_ref.extend(new_symbols)
-            ws_client.update_symbols(new_symbols)
-            logger.info("symbols_refreshed", count=len(new_symbols))
+            trading = await fetch_trading_symbols()
+            if not trading:
+                # Bozuk yanıtta tüm akışı kapatıp tamponları silmek yerine bir sonraki turu bekle
+                logger.warning("symbol_refresh_empty")
+                continue
+            new_symbols = trading[:config.top_volume_limit]
+            listed = set(new_symbols)
+            tradable = set(trading)
+            current = set(symbols_ref)
+            added = [s for s in new_symbols if s not in current]
+            removed = (current | held) - listed
+
+            if added:
+                if indicator_engine is not None:
+                    # Bekletilirken kline almayan sembolün indikatör durumu eskidir
+                    for symbol in held.intersection(added):
+                        indicator_engine.discard(symbol)
+                # Bekletilen semboller için preload sadece aradaki boşluğu çeker
+                await preload_history(added, store, timeframes=timeframes, limit=250, cache=kline_cache)
+
+            closed = 0
+            evict: list[str] = []
+            held = set()
+            for symbol in removed:
+                if watcher is None:
+                    evict.append(symbol)
+                elif symbol not in tradable:
+                    closed += await watcher.close_symbol(symbol, reason="DELISTED")
+                    evict.append(symbol)
+                elif symbol in watcher.tracked_symbols:
+                    held.add(symbol)
+                else:
+                    evict.append(symbol)
+
+            symbols_ref[:] = new_symbols
+            await ws_client.update_symbols(new_symbols, price_symbols=held)
+
+            evicted = 0
+            for symbol in evict:
+                evicted += store.evict_symbol_nowait(symbol)
+                if indicator_engine is not None:
+                    indicator_engine.discard(symbol)
+            logger.info(
+                "symbols_refreshed",
+                count=len(new_symbols),
+                added=len(added),
+                removed=len(current - listed),
+                buffers_evicted=evicted,
+                positions_closed=closed,
+                held_for_positions=len(held),
+            )
         except asyncio.CancelledError:
             break
         except Exception as e:
             logger.error("symbol_refresh_error", error=str(e))
 
 
+# ── Disk Snapshot Döngüsü (Warm Restart) ─────────────────────────────
+
+async def snapshot_loop(config: TradingConfig, store: MemoryStore) -> None:
+    """MemoryStore'u periyodik olarak diske yazar."""
+    while True:
+        await asyncio.sleep(config.snapshot_interval_seconds)
+        try:
+            await save_snapshot(store, config.snapshot_dir)
+        except asyncio.CancelledError:
+            break
+        except Exception as e:
+            logger.error("snapshot_save_error", error=str(e))
+
+
 # ── Ana Orkestratör ──────────────────────────────────────────────────
 
 async def main() -> None:
@@ -184,6 +726,8 @@ async def main() -> None:
     config = TradingConfig()
     setup_logging(config.log_level)
     logger.info("bot_starting", version="5.0", mode="scanner_paper_trading")
+    # SCAN_MODE=event → mum kapanışında anında tarama, interval → periyodik tarama
+    scan_loop = select_scan_loop(config)
 
     # 2. Veritabanı
     await init_db(config.db_url)
@@ -192,7 +736,7 @@ async def main() -> None:
     symbols = await fetch_active_symbols(config.top_volume_limit)
 
     # 4. Bellek deposu
-    store = MemoryStore(maxlen=200)
+    store = MemoryStore(maxlen=200, columnar=config.columnar_store)
 
     # 5. Position Watcher (sanal TP/SL takibi)
     watcher = PositionWatcher(config, store)
@@ -203,21 +747,66 @@ async def main() -> None:
     # Telegram callback'i watcher'a bağla
     watcher._on_close = dispatcher.send_notification
 
-    # 7. Strateji (dinamik yükleme)
-    strategy = load_strategy(config, store)
-    required_tfs = strategy.REQUIRED_TIMEFRAMES
+    # 7. Stratejiler (dinamik yükleme — ACTIVE_STRATEGY virgülle ayrılmış liste olabilir)
+    strategies = load_strategies(config, store)
+    # Tüm stratejiler tek store'u paylaşır: preload ve abonelik timeframe'lerin birleşimiyle
+    required_tfs = required_timeframes(strategies)
+
+    # Akışlı indikatör motoru (mum kapanışında O(1) EMA/RSI/ATR)
+    indicator_engine = IndicatorEngine(store)
+    # Stratejiler arası paylaşılan, LRU ile sınırlı indikatör önbelleği
+    indicator_cache = IndicatorCache(max_bytes=config.indicator_cache_mb * 1024 * 1024)
+    for strategy in strategies:
+        strategy.attach_indicator_engine(indicator_engine)
+        strategy.attach_indicator_cache(indicator_cache)
+
+    # Yüksek timeframe'ler 1m akışından türetilecekse sadece 1m stream edilir
+    stream_tfs = required_tfs
+    if config.resample_from_1m:
+        stream_tfs, derived_tfs = split_timeframes(required_tfs)
+        store.enable_resampling(derived_tfs)
+    preload_tfs = list(dict.fromkeys([*stream_tfs, *required_tfs]))
+
+    # 8. Geçmiş veri: önce disk snapshot'ı (Warm Restart), sonra sadece eksik mumlar
+    if config.snapshot_dir:
+        load_snapshot(store, config.snapshot_dir, symbols)
+    # Kapanmış mumlar diskteki kline önbelleğinden okunur, REST'ten sadece kuyruk çekilir
+    kline_cache = (
+        KlineCache(config.kline_cache_dir, budget=RateBudget(config.rest_weight_per_minute))
+        if config.kline_cache_dir
+        else None
+    )
+    await preload_history(symbols, store, timeframes=preload_tfs, limit=250, cache=kline_cache)
 
-    # 8. Geçmiş veriyi çek (Cold Start çözümü)
-    await preload_history(symbols, store, timeframes=required_tfs, limit=250)
+    # Strateji değerlendirmesi için süreç havuzu (EVAL_PROCESSES > 0)
+    evaluator = (
+        ProcessEvaluator(config, store, config.eval_processes)
+        if config.eval_processes > 0
+        else None
+    )
 
-    # 9. WebSocket istemcisi (public Kline + Mark Price)
-    ws_client = BinanceWebSocketClient(config, store, symbols, timeframes=required_tfs)
+    # Yeniden yüklenen stratejiler sadece mevcut akıştan beslenebilen timeframe'leri kullanabilir
+    available_tfs = set(preload_tfs)
+    reload_event = asyncio.Event()
+
+    # 9. WebSocket istemcisi (public Kline + Mark Price); istenirse ham akış kaydedilir
+    recorder = (
+        FeedRecorder(config.feed_record_dir, config.feed_record_segment_minutes)
+        if config.feed_record_dir
+        else None
+    )
+    if recorder is not None:
+        recorder.start()
+    ws_client = BinanceWebSocketClient(
+        config, store, symbols, timeframes=stream_tfs, recorder=recorder
+    )
 
     # Başlangıç bildirimi
     await dispatcher.send_notification(
         f"🚀 <b>AstarBot v5.0 Aktif</b>\n"
         f"📡 Mod: Scanner & Paper Trading\n"
         f"📊 {len(symbols)} sembol takipte\n"
+        f"🧠 Strateji: {', '.join(s.name for s in strategies)}\n"
         f"⚡ WebSocket Kline + Mark Price"
     )
 
@@ -226,14 +815,28 @@ async def main() -> None:
         asyncio.create_task(ws_client.start(), name="websocket"),
         asyncio.create_task(watcher.run(), name="position_watcher"),
         asyncio.create_task(
-            strategy_scan_loop(config, strategy, dispatcher, watcher, store, symbols),
+            scan_loop(
+                config, strategies, dispatcher, watcher, store, symbols, indicator_cache, evaluator
+            ),
             name="scan_loop",
         ),
         asyncio.create_task(
-            symbol_refresh_loop(config, ws_client, symbols),
+            symbol_refresh_loop(
+                config, ws_client, symbols, store, preload_tfs, kline_cache, indicator_engine,
+                watcher,
+            ),
             name="symbol_refresh",
         ),
+        asyncio.create_task(
+            strategy_reload_loop(
+                config, strategies, store, symbols, available_tfs, reload_event,
+                indicator_engine, indicator_cache, evaluator,
+            ),
+            name="strategy_reload",
+        ),
     ]
+    if config.snapshot_dir:
+        tasks.append(asyncio.create_task(snapshot_loop(config, store), name="snapshot"))
 
     # ── Graceful Shutdown ─────────────────────────────────────────────
     shutdown_event = asyncio.Event()
@@ -247,6 +850,8 @@ async def main() -> None:
     if platform.system() != "Windows":
         for sig in (os_signal.SIGINT, os_signal.SIGTERM):
             loop.add_signal_handler(sig, _shutdown_handler)
+        # SIGHUP → stratejileri yeniden yükle (kill -HUP <pid>)
+        loop.add_signal_handler(os_signal.SIGHUP, reload_event.set)
 
     try:
         # shutdown_event set olana kadar veya bir task çökene kadar bekle
@@ -264,7 +869,16 @@ async def main() -> None:
         logger.info("keyboard_interrupt")
     finally:
         await ws_client.stop()
+        if recorder is not None:
+            await asyncio.to_thread(recorder.stop)
         await watcher.stop()
+        if evaluator is not None:
+            evaluator.close()
+        if config.snapshot_dir:
+            try:
+                await save_snapshot(store, config.snapshot_dir)
+            except Exception as e:
+                logger.error("snapshot_save_error", error=str(e))
         await dispatcher.send_notification("🔴 <b>AstarBot kapatıldı.</b>")
         await close_db()
         logger.info("bot_shutdown_complete")
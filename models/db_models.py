@@ -39,6 +39,7 @@ class SignalRecord(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     symbol: Mapped[str] = mapped_column(String(32), nullable=False, index=True)
+    strategy: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)  # Üreten strateji
     side: Mapped[str] = mapped_column(String(8), nullable=False)          # "LONG" | "SHORT"
     entry_price: Mapped[float] = mapped_column(Float, nullable=False)
     tp_price: Mapped[float] = mapped_column(Float, nullable=False)
@@ -73,7 +74,7 @@ class TradeRecord(Base):
     signal_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("signals.id"), nullable=False, unique=True
     )
-    close_reason: Mapped[str] = mapped_column(String(16), nullable=False)  # "TP" | "SL" | "TIMEOUT"
+    close_reason: Mapped[str] = mapped_column(String(16), nullable=False)  # "TP" | "SL" | "TIMEOUT" | "DELISTED"
     close_price: Mapped[float] = mapped_column(Float, nullable=False)
     pnl_percent: Mapped[float] = mapped_column(Float, nullable=False)      # yüzde bazında kâr/zarar
     closed_at: Mapped[datetime] = mapped_column(
@@ -9,11 +9,20 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Callable
+
+import numpy as np
+
+from core.clock import SYSTEM_CLOCK
+from data.memory_store import CLOSE, TS
 
 if TYPE_CHECKING:
+    from core.clock import Clock
     from core.config import TradingConfig
-    from data.memory_store import MemoryStore
+    from data.memory_store import MarketSlice, MemoryStore
+    from strategies.indicator_cache import IndicatorCache
+    from strategies.indicator_engine import IndicatorEngine
+    from strategies.indicators import StreamingIndicator
 
 
 @dataclass(frozen=True)
@@ -30,6 +39,7 @@ class Signal:
     current_volume: float
     avg_volume: float
     timestamp: datetime
+    strategy: str = ""        # Üreten stratejinin adı (çoklu strateji ad alanı)
 
 
 class BaseStrategy(ABC):
@@ -47,9 +57,122 @@ class BaseStrategy(ABC):
 
     REQUIRED_TIMEFRAMES: list[str] = []
 
+    # Hangi timeframe'lerde mum kapanışı stratejinin sonucunu geçersiz kılar.
+    # None → REQUIRED_TIMEFRAMES. Tarama döngüsü bu timeframe'lerde yeni mum
+    # kapanmamış sembolleri yeniden değerlendirmez.
+    INVALIDATING_TIMEFRAMES: list[str] | None = None
+
+    # evaluate_batch() implemente eden stratejiler True yapar; tarama döngüsü,
+    # backtest ve süreç havuzu buna göre toplu ya da sembol bazlı değerlendirir.
+    SUPPORTS_BATCH: bool = False
+
     def __init__(self, config: TradingConfig, store: MemoryStore) -> None:
         self._config = config
         self._store = store
+        self._indicator_engine: IndicatorEngine | None = None
+        self._indicator_cache: IndicatorCache | None = None
+        # Signal.timestamp kaynağı; replay/test için sanal saat bağlanabilir
+        self._clock: Clock = SYSTEM_CLOCK
+
+    def attach_clock(self, clock: Clock) -> None:
+        """Sinyal zaman damgalarının okunduğu saati bağlar."""
+        self._clock = clock
+
+    @property
+    def name(self) -> str:
+        """Sinyal, cooldown ve pozisyonların ad alanı olarak kullanılan strateji adı."""
+        return type(self).__name__
+
+    @property
+    def store(self) -> MemoryStore:
+        """Stratejinin okuduğu MemoryStore (süreç havuzu işçileri satırları buraya yükler)."""
+        return self._store
+
+    @property
+    def invalidating_timeframes(self) -> list[str]:
+        """Sonucu geçersiz kılan timeframe'ler (varsayılan: REQUIRED_TIMEFRAMES)."""
+        if self.INVALIDATING_TIMEFRAMES is None:
+            return self.REQUIRED_TIMEFRAMES
+        return self.INVALIDATING_TIMEFRAMES
+
+    # ── Akışlı İndikatörler ───────────────────────────────────────────
+
+    def streaming_indicators(self) -> dict[str, tuple[str, Callable[[], StreamingIndicator]]]:
+        """
+        Stratejinin kullandığı akışlı indikatörler: {isim: (timeframe, fabrika)}.
+        Varsayılan: yok. Alt sınıflar override ederek IndicatorEngine'den
+        O(1) güncellenen değerleri okuyabilir.
+        """
+        return {}
+
+    def attach_indicator_engine(self, engine: IndicatorEngine) -> None:
+        """Stratejinin akışlı indikatörlerini motora kaydeder (sahibi: bu örnek)."""
+        for name, (timeframe, factory) in self.streaming_indicators().items():
+            engine.register(timeframe, self._indicator_key(name), factory, owner=self)
+        self._indicator_engine = engine
+
+    def indicator(self, symbol: str, name: str, *, preview: bool = True) -> float | None:
+        """
+        Akışlı indikatörün güncel değerini döndürür (ham dizilere dokunmadan).
+        Motor bağlı değilse veya ısınma yetersizse None.
+        """
+        if self._indicator_engine is None:
+            return None
+        timeframe, _factory = self.streaming_indicators()[name]
+        return self._indicator_engine.value(
+            symbol, timeframe, self._indicator_key(name), preview=preview
+        )
+
+    def _indicator_key(self, name: str) -> str:
+        # Farklı stratejilerin aynı isimli indikatörleri çakışmasın
+        return f"{type(self).__name__}.{name}"
+
+    # ── Paylaşılan İndikatör Önbelleği ────────────────────────────────
+
+    def attach_indicator_cache(self, cache: IndicatorCache) -> None:
+        """Stratejiler arasında paylaşılan indikatör önbelleğini bağlar."""
+        self._indicator_cache = cache
+
+    def cached_indicator(
+        self,
+        symbol: str,
+        timeframe: str,
+        candles: np.ndarray,
+        func: Callable[..., Any],
+        *params: Any,
+        columns: tuple[int, ...] = (CLOSE,),
+    ) -> Any:
+        """
+        func(*candles[:, columns], *params) sonucunu paylaşılan önbellekten döndürür.
+
+        candles, aynı senkron adımda store'dan okunmuş olmalıdır; anahtar
+        store'un o anki tampon revizyonunu içerir. Önbellek bağlı değilse
+        doğrudan hesaplar. Dönen diziler salt-okunurdur.
+
+        Anahtar fonksiyon nesnesinin kendisini içerir (aynı isimli farklı
+        fonksiyonlar çakışmaz); bu yüzden her çağrıda yeniden oluşturulan
+        lambda'lar yerine modül düzeyi fonksiyonlar verilmelidir.
+
+        Örnek:
+            ema_f = self.cached_indicator(symbol, "1m", candles_1m, ema, 9)
+            atr_v = self.cached_indicator(symbol, "1m", candles_1m, atr, 14,
+                                          columns=(HIGH, LOW, CLOSE))
+        """
+        def compute() -> Any:
+            return func(*(candles[:, c] for c in columns), *params)
+
+        if self._indicator_cache is None:
+            return compute()
+        key = (
+            symbol,
+            timeframe,
+            float(candles[-1, TS]) if len(candles) else 0.0,
+            self._store.get_revision_nowait(symbol, timeframe),
+            func,
+            columns,
+            params,
+        )
+        return self._indicator_cache.get_or_compute(key, compute)
 
     @abstractmethod
     async def evaluate(self, symbol: str) -> Signal | None:
@@ -60,3 +183,30 @@ class BaseStrategy(ABC):
             Signal nesnesi (sinyal varsa) veya None (sinyal yoksa).
         """
         ...
+
+    # ── Toplu Değerlendirme (Opsiyonel) ───────────────────────────────
+
+    @property
+    def supports_batch(self) -> bool:
+        """Strateji evaluate_batch() implemente ediyorsa True (SUPPORTS_BATCH)."""
+        return self.SUPPORTS_BATCH
+
+    def build_market(self, symbols: list[str]) -> dict[str, MarketSlice]:
+        """REQUIRED_TIMEFRAMES için semboller aynı sırada yığılmış kesitleri hazırlar."""
+        return {tf: self._store.get_slice_nowait(tf, symbols) for tf in self.REQUIRED_TIMEFRAMES}
+
+    def evaluate_batch(self, market: dict[str, MarketSlice]) -> list[Signal]:
+        """
+        Tüm sembolleri tek seferde, yığılmış NumPy dizileri üzerinden değerlendirir.
+
+        Args:
+            market: {timeframe: MarketSlice}; tüm kesitlerde semboller aynı sıradadır.
+
+        Returns:
+            Üretilen sinyaller (sembol bazlı evaluate() ile aynı sonuçlar).
+
+        Opsiyoneldir: implemente eden stratejiler SUPPORTS_BATCH = True yapar;
+        diğerleri için tarama döngüsü sembol başına evaluate() çağrısına döner
+        ve bu varsayılan hiç sinyal üretmez.
+        """
+        return []
@@ -9,17 +9,17 @@ Pandas kullaNILMAZ — tüm hesaplamalar NumPy ile yapılır.
 """
 from __future__ import annotations
 
-from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
 import numpy as np
 
 from core.logger import get_logger
 from strategies.base_strategy import BaseStrategy, Signal
+from strategies.indicators import StreamingEma, ema
 
 if TYPE_CHECKING:
     from core.config import TradingConfig
-    from data.memory_store import MemoryStore
+    from data.memory_store import MarketSlice, MemoryStore
 
 logger = get_logger(__name__)
 
@@ -27,26 +27,6 @@ logger = get_logger(__name__)
 TS, OPEN, HIGH, LOW, CLOSE, VOLUME = 0, 1, 2, 3, 4, 5
 
 
-def _ema_numpy(data: np.ndarray, span: int) -> np.ndarray:
-    """
-    NumPy ile Exponential Moving Average hesaplama.
-    Pandas ewm(span=N, adjust=False) ile aynı sonucu verir.
-
-    Args:
-        data: 1-D float64 dizisi (close fiyatları).
-        span: EMA periyodu.
-
-    Returns:
-        Aynı uzunlukta EMA dizisi.
-    """
-    alpha = 2.0 / (span + 1)
-    ema = np.empty_like(data)
-    ema[0] = data[0]
-    for i in range(1, len(data)):
-        ema[i] = alpha * data[i] + (1 - alpha) * ema[i - 1]
-    return ema
-
-
 class EmaVolumeStrategy(BaseStrategy):
     """
     EMA + Hacim Kırılım Stratejisi.
@@ -59,10 +39,18 @@ class EmaVolumeStrategy(BaseStrategy):
     """
 
     REQUIRED_TIMEFRAMES: list[str] = ["1m", "5m"]
+    SUPPORTS_BATCH = True
 
     def __init__(self, config: TradingConfig, store: MemoryStore) -> None:
         super().__init__(config, store)
 
+    def streaming_indicators(self):
+        cfg = self._config
+        return {
+            "ema_fast": ("1m", lambda: StreamingEma(cfg.ema_fast)),
+            "ema_slow": ("1m", lambda: StreamingEma(cfg.ema_slow)),
+        }
+
     async def evaluate(self, symbol: str) -> Signal | None:
         """
         1m ve 5m mumlarını MemoryStore'dan çeker,
@@ -86,12 +74,14 @@ class EmaVolumeStrategy(BaseStrategy):
         close_1m = candles_1m[:, CLOSE]
         volume_1m = candles_1m[:, VOLUME]
 
-        ema_fast = _ema_numpy(close_1m, cfg.ema_fast)
-        ema_slow = _ema_numpy(close_1m, cfg.ema_slow)
-
         last_close = close_1m[-1]
-        last_ema_f = ema_fast[-1]
-        last_ema_s = ema_slow[-1]
+
+        # Akışlı motor bağlıysa O(1) değerler, değilse tüm geçmişten hesapla
+        last_ema_f = self.indicator(symbol, "ema_fast")
+        last_ema_s = self.indicator(symbol, "ema_slow")
+        if last_ema_f is None or last_ema_s is None:
+            last_ema_f = self.cached_indicator(symbol, "1m", candles_1m, ema, cfg.ema_fast)[-1]
+            last_ema_s = self.cached_indicator(symbol, "1m", candles_1m, ema, cfg.ema_slow)[-1]
 
         # ── 5m verisinden kırılım aralığı (range) ────────────────────
         # Son N mumun (kapanmış olanlar, son mum hariç) yüksek/düşüğü
@@ -126,6 +116,103 @@ class EmaVolumeStrategy(BaseStrategy):
         live_price = await self._store.get_price(symbol)
         entry_price = float(live_price) if live_price is not None else float(last_close)
 
+        return self._build_signal(
+            symbol, side, entry_price, r_high, r_low, spike_ratio,
+            float(last_ema_f), float(last_ema_s), current_vol, avg_vol_10,
+        )
+
+    def evaluate_batch(self, market: dict[str, MarketSlice]) -> list[Signal]:
+        """
+        evaluate() mantığının tüm semboller için vektörel karşılığı.
+
+        Hacim ve kırılım filtreleri yığılmış dizilerde tek geçişte uygulanır;
+        EMA sadece filtreyi geçen (az sayıdaki) semboller için hesaplanır.
+        """
+        cfg = self._config
+        m1, m5 = market["1m"], market["5m"]
+        symbols = m1.symbols
+
+        min_1m = max(cfg.ema_slow + 10, 50)
+        min_5m = cfg.breakout_range_period + 1
+        ok = (m1.counts >= min_1m) & (m5.counts >= min_5m)
+
+        # Sağa hizalı: [:, -1] her sembolün son mumu
+        last_close = m1.candles[:, -1, CLOSE]
+        current_vol = m1.candles[:, -1, VOLUME]
+        avg_vol = m1.candles[:, -11:-1, VOLUME].mean(axis=1)
+
+        period = cfg.breakout_range_period
+        range_slice = m5.candles[:, -(period + 1):-1]
+        r_high = range_slice[:, :, HIGH].max(axis=1)
+        r_low = range_slice[:, :, LOW].min(axis=1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ok &= avg_vol > 0
+            spike = np.where(ok, current_vol / avg_vol, 0.0)
+        ok &= (spike >= cfg.volume_spike_min) & (spike <= cfg.volume_spike_max)
+        ok &= (last_close > r_high) | (last_close < r_low)
+
+        rows = np.flatnonzero(ok)
+        if not len(rows):
+            return []
+
+        ema_f, ema_s = self._last_emas(m1, rows)
+        prices = self._store.get_prices_nowait([symbols[i] for i in rows])
+
+        signals = []
+        for j, i in enumerate(rows):
+            if last_close[i] > r_high[i] and ema_f[j] > ema_s[j]:
+                side = "LONG"
+            elif last_close[i] < r_low[i] and ema_f[j] < ema_s[j]:
+                side = "SHORT"
+            else:
+                continue
+            entry_price = float(prices[j]) if not np.isnan(prices[j]) else float(last_close[i])
+            signals.append(self._build_signal(
+                symbols[i], side, entry_price, float(r_high[i]), float(r_low[i]),
+                float(spike[i]), float(ema_f[j]), float(ema_s[j]),
+                float(current_vol[i]), float(avg_vol[i]),
+            ))
+        return signals
+
+    def _last_emas(self, m1: MarketSlice, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Seçili satırların son hızlı/yavaş EMA değerleri (motor bağlıysa O(1))."""
+        cfg = self._config
+        ema_f = np.full(len(rows), np.nan)
+        ema_s = np.full(len(rows), np.nan)
+        if self._indicator_engine is not None:
+            for j, i in enumerate(rows):
+                f = self.indicator(m1.symbols[i], "ema_fast")
+                s = self.indicator(m1.symbols[i], "ema_slow")
+                if f is not None and s is not None:
+                    ema_f[j], ema_s[j] = f, s
+
+        missing = np.flatnonzero(np.isnan(ema_f))
+        if len(missing):
+            position = {int(i): j for j, i in enumerate(rows)}
+            for idx, block in m1.groups(rows[missing]):
+                close = block[:, :, CLOSE]
+                pos = [position[int(i)] for i in idx]
+                ema_f[pos] = ema(close, cfg.ema_fast)[:, -1]
+                ema_s[pos] = ema(close, cfg.ema_slow)[:, -1]
+        return ema_f, ema_s
+
+    def _build_signal(
+        self,
+        symbol: str,
+        side: str,
+        entry_price: float,
+        r_high: float,
+        r_low: float,
+        spike_ratio: float,
+        ema_fast_value: float,
+        ema_slow_value: float,
+        current_vol: float,
+        avg_vol: float,
+    ) -> Signal:
+        """Yön ve giriş fiyatı belli olan sinyalin TP/SL'ini hesaplayıp Signal üretir."""
+        cfg = self._config
+
         # ── TP / SL hesaplama (entry_price bazlı) ────────────────────
         if side == "LONG":
             sl = max(
@@ -150,11 +237,11 @@ class EmaVolumeStrategy(BaseStrategy):
             sl_price=round(sl, 6),
             tp_price=round(tp, 6),
             spike_ratio=round(spike_ratio, 4),
-            ema_fast_value=round(float(last_ema_f), 6),
-            ema_slow_value=round(float(last_ema_s), 6),
+            ema_fast_value=round(ema_fast_value, 6),
+            ema_slow_value=round(ema_slow_value, 6),
             current_volume=round(current_vol, 2),
-            avg_volume=round(avg_vol_10, 2),
-            timestamp=datetime.now(timezone.utc),
+            avg_volume=round(avg_vol, 2),
+            timestamp=self._clock.now(),
         )
 
         logger.info(
@@ -0,0 +1,94 @@
+"""
+trading_bot.strategies.indicator_cache
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Stratejiler arasında paylaşılan, bellek sınırlı LRU indikatör önbelleği.
+
+Aynı (symbol, timeframe) verisine bakan birden çok strateji (veya aynı
+stratejinin farklı parametre setleri) özdeş indikatörleri bir kez hesaplar.
+Anahtar: (symbol, timeframe, last_ts, revision, indikatör, parametreler).
+revision, MemoryStore tamponunun her yazımda değişen sırasıdır; böylece açık
+mum güncellendiğinde eski sonuçlar asla geri döndürülmez.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+import numpy as np
+
+
+def _nbytes(value: Any) -> int:
+    """Önbellekteki değerin yaklaşık bellek kullanımı."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(v) for v in value)
+    return 64
+
+
+class IndicatorCache:
+    """
+    Toplam bayt sınırıyla çalışan LRU önbellek.
+
+    Kullanım:
+        cache = IndicatorCache(max_bytes=64 * 1024 * 1024)
+        value = cache.get_or_compute(key, lambda: ema(close, 9))
+        cache.stats()  # {"hits": ..., "misses": ..., "hit_rate": ...}
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Anahtar önbellekteyse döndürür, değilse hesaplayıp saklar."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        value = compute()
+        self._freeze(value)
+        size = _nbytes(value)
+        if size <= self._max_bytes:
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self._max_bytes:
+                _key, (_value, old_size) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+                self.evictions += 1
+        return value
+
+    @staticmethod
+    def _freeze(value: Any) -> None:
+        # Paylaşılan sonuçların bir strateji tarafından değiştirilmesini engelle
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+        elif isinstance(value, (tuple, list)):
+            for v in value:
+                IndicatorCache._freeze(v)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict[str, float]:
+        """Hit/miss istatistikleri ve bellek kullanımı."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
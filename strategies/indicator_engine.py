@@ -0,0 +1,193 @@
+"""
+trading_bot.strategies.indicator_engine
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+MemoryStore'un yanında çalışan akışlı indikatör motoru.
+
+Store'a mum dinleyicisi olarak bağlanır; her mum kapanışında kayıtlı
+indikatör durumlarını O(1) ilerletir, açık mum için ise "önizleme" değeri
+üretir. Stratejiler böylece her taramada 200 mumluk geçmişi yeniden
+hesaplamadan güncel EMA / RSI / ATR değerlerini okuyabilir.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Dict, Tuple
+
+import numpy as np
+
+from core.clock import SYSTEM_CLOCK
+from core.logger import get_logger
+from data.memory_store import TS, timeframe_ms
+
+if TYPE_CHECKING:
+    from core.clock import Clock
+    from data.memory_store import MemoryStore
+    from strategies.indicators import StreamingIndicator
+
+logger = get_logger(__name__)
+
+IndicatorFactory = Callable[[], "StreamingIndicator"]
+
+
+class IndicatorEngine:
+    """
+    Sembol+timeframe bazında akışlı indikatör durumlarını yönetir.
+
+    Kullanım:
+        engine = IndicatorEngine(store)
+        engine.register("1m", "ema_fast", lambda: StreamingEma(9), owner=strategy)
+        value = engine.value("BTCUSDT", "1m", "ema_fast")  # açık mum önizlemesiyle
+        engine.unregister(strategy)  # strateji kaldırıldığında
+    """
+
+    def __init__(self, store: MemoryStore, clock: Clock | None = None) -> None:
+        self._store = store
+        # Son mumun hâlâ açık olup olmadığı bu saate göre belirlenir
+        self._clock = clock or SYSTEM_CLOCK
+        # {"1m": {"ema_fast": factory, ...}}
+        self._specs: Dict[str, Dict[str, IndicatorFactory]] = {}
+        # {("1m", "ema_fast"): owner} — unregister() ile toplu silme için
+        self._owners: Dict[Tuple[str, str], object] = {}
+        # {("BTCUSDT","1m"): {"ema_fast": StreamingEma, ...}}
+        self._states: Dict[Tuple[str, str], Dict[str, StreamingIndicator]] = {}
+        # Son açık (kapanmamış) mum — önizleme için
+        self._open: Dict[Tuple[str, str], np.ndarray] = {}
+        store.add_candle_listener(self._on_candle)
+
+    # ── Kayıt ─────────────────────────────────────────────────────────
+
+    def register(
+        self, timeframe: str, name: str, factory: IndicatorFactory, owner: object = None
+    ) -> None:
+        """
+        Timeframe için akışlı bir indikatör tanımlar (aynı isim varsa fabrikası değişir).
+
+        Sadece bu indikatör mevcut sembol durumlarına tohumlanır; aynı
+        timeframe'deki diğer indikatörler olduğu gibi kalır. owner verilirse
+        indikatör unregister(owner) ile kaldırılabilir.
+        """
+        self._specs.setdefault(timeframe, {})[name] = factory
+        self._owners[(timeframe, name)] = owner
+        for (symbol, tf), states in list(self._states.items()):
+            if tf != timeframe:
+                continue
+            reference = next((state for n, state in states.items() if n != name), None)
+            if reference is None:
+                # Kıyaslanacak durum yok → ilk erişimde tümüyle tohumlanır
+                del self._states[(symbol, tf)]
+                continue
+            states[name] = self._seed_one(symbol, timeframe, factory, reference.last_ts)
+        logger.info("streaming_indicator_registered", timeframe=timeframe, name=name)
+
+    def unregister(self, owner: object) -> int:
+        """
+        owner'ın kaydettiği (ve başkasınca yeniden kaydedilmemiş) indikatörleri
+        ve sembol durumlarını siler.
+        Returns: Silinen indikatör sayısı.
+        """
+        keys = [key for key, o in self._owners.items() if o is owner]
+        for timeframe, name in keys:
+            del self._owners[(timeframe, name)]
+            specs = self._specs[timeframe]
+            del specs[name]
+            if not specs:
+                del self._specs[timeframe]
+            for key in [k for k in self._states if k[1] == timeframe]:
+                self._states[key].pop(name, None)
+                if not specs:
+                    del self._states[key]
+                    self._open.pop(key, None)
+        if keys:
+            logger.info("streaming_indicators_unregistered", names=[name for _tf, name in keys])
+        return len(keys)
+
+    # ── Okuma ─────────────────────────────────────────────────────────
+
+    def value(
+        self, symbol: str, timeframe: str, name: str, *, preview: bool = True
+    ) -> float | None:
+        """
+        İndikatörün güncel değerini döndürür.
+
+        preview=True → açık mum varsa "şimdi kapansaydı" değeri,
+        preview=False → son kapanmış mumdaki değer. Isınma yetersizse None.
+        """
+        states = self._states.get((symbol, timeframe))
+        if states is None:
+            states = self._seed_from_store(symbol, timeframe)
+        state = states.get(name)
+        if state is None:
+            raise KeyError(f"'{timeframe}' için '{name}' indikatörü kayıtlı değil.")
+
+        if preview:
+            open_candle = self._open.get((symbol, timeframe))
+            if open_candle is not None and (state.last_ts is None or open_candle[TS] > state.last_ts):
+                return state.preview(open_candle)
+        return state.value
+
+    # ── Store Olayları ────────────────────────────────────────────────
+
+    def _on_candle(self, symbol: str, timeframe: str, candle, is_closed: bool) -> None:
+        specs = self._specs.get(timeframe)
+        if not specs:
+            return
+
+        key = (symbol, timeframe)
+        row = np.asarray(candle, dtype=np.float64)
+        if not is_closed:
+            self._open[key] = row.copy()
+            return
+
+        self._open.pop(key, None)
+        states = self._states.get(key)
+        if states is None:
+            self._seed_from_store(symbol, timeframe, before_ts=row[TS])
+            states = self._states[key]
+
+        last_ts = next(iter(states.values())).last_ts
+        if last_ts is not None:
+            if row[TS] <= last_ts:
+                return  # Tekrar gelen kapanış mesajı
+            if row[TS] - last_ts != timeframe_ms(timeframe):
+                # Boşluk (reconnect, toplu yükleme) → geçmişten yeniden kur
+                states = self._seed_from_store(symbol, timeframe, before_ts=row[TS])
+
+        for state in states.values():
+            state.update(row)
+
+    def _seed_from_store(
+        self, symbol: str, timeframe: str, before_ts: float | None = None
+    ) -> Dict[str, StreamingIndicator]:
+        """Durumları store'daki kapanmış mum geçmişinden vektörel olarak kurar."""
+        history = self._store.get_candles_nowait(symbol, timeframe)
+        if before_ts is not None:
+            closed = history[history[:, TS] < before_ts]
+        else:
+            # Süresi dolmamış son mum açık kabul edilir
+            now_ms = self._clock.time_ms()
+            tf_ms = timeframe_ms(timeframe)
+            closed = history
+            if len(history) and history[-1, TS] + tf_ms > now_ms:
+                closed = history[:-1]
+                self._open[(symbol, timeframe)] = history[-1].copy()
+
+        states = {name: factory() for name, factory in self._specs.get(timeframe, {}).items()}
+        for state in states.values():
+            state.seed(closed)
+        self._states[(symbol, timeframe)] = states
+        return states
+
+    def _seed_one(
+        self, symbol: str, timeframe: str, factory: IndicatorFactory, last_ts: float | None
+    ) -> StreamingIndicator:
+        """Tek indikatörü mevcut durumlarla aynı mumda (last_ts) bitecek şekilde tohumlar."""
+        state = factory()
+        history = self._store.get_candles_nowait(symbol, timeframe)
+        state.seed(history[:0] if last_ts is None else history[history[:, TS] <= last_ts])
+        return state
+
+    def discard(self, symbol: str) -> None:
+        """Sembolün tüm indikatör durumlarını siler."""
+        for key in [k for k in self._states if k[0] == symbol]:
+            del self._states[key]
+        for key in [k for k in self._open if k[0] == symbol]:
+            del self._open[key]
@@ -0,0 +1,355 @@
+"""
+trading_bot.strategies.indicators
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Stratejilerin ortak kullandığı vektörel indikatör kütüphanesi.
+
+Tüm fonksiyonlar 1-D (n_candles,) veya 2-D (n_symbols, n_candles) girdi kabul
+eder; zaman ekseni her zaman son eksendir ve çıktı girdiyle aynı şekildedir.
+Özyinelemeler (EMA, Wilder) 1-D ve 2-D girdide aynı numba ile derlenmiş
+döngülerle yürütülür; geri kalan adımlar tüm semboller için tek NumPy
+işlemidir.
+
+Pandas kullanılMAZ.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+
+import numba
+import numpy as np
+
+
+# ── Özyineleme Çekirdekleri ──────────────────────────────────────────
+# x: shape=(n_candles, n_symbols) C-contiguous, prev: shape=(n_symbols,)
+# Çekirdekler numba ile derlenir ve orijinal döngülerle aynı kayan nokta
+# işlem sırasını korur; tek sembollük girdi de aynı derlenmiş döngüden geçer.
+
+@numba.njit(cache=True)
+def _ema_rec(x, alpha, prev):
+    out = np.empty_like(x)
+    beta = 1 - alpha
+    for j in range(x.shape[1]):
+        p = prev[j]
+        for i in range(x.shape[0]):
+            p = alpha * x[i, j] + beta * p
+            out[i, j] = p
+    return out
+
+
+@numba.njit(cache=True)
+def _wilder_rec(x, period, prev):
+    out = np.empty_like(x)
+    for j in range(x.shape[1]):
+        p = prev[j]
+        for i in range(x.shape[0]):
+            p = (p * (period - 1) + x[i, j]) / period
+            out[i, j] = p
+    return out
+
+
+def _as_2d(data: np.ndarray) -> tuple[np.ndarray, bool]:
+    """Girdiyi (n_symbols, n_candles) float64 dizisine çevirir."""
+    arr = np.asarray(data, dtype=np.float64)
+    if arr.ndim == 1:
+        return arr[np.newaxis, :], True
+    return arr, False
+
+
+def _restore(arr: np.ndarray, was_1d: bool) -> np.ndarray:
+    return arr[0] if was_1d else arr
+
+
+# ── Hareketli Ortalamalar ────────────────────────────────────────────
+
+def ema(data: np.ndarray, span: int) -> np.ndarray:
+    """
+    Exponential Moving Average.
+    Pandas ewm(span=N, adjust=False) ile aynı sonucu verir; ilk değer tohumdur.
+    """
+    x, was_1d = _as_2d(data)
+    out = np.empty_like(x)
+    if x.shape[1] == 0:
+        return _restore(out, was_1d)
+
+    alpha = 2.0 / (span + 1)
+    out[:, 0] = x[:, 0]
+    if x.shape[1] > 1:
+        tail = _ema_rec(np.ascontiguousarray(x[:, 1:].T), alpha, x[:, 0].copy())
+        out[:, 1:] = tail.T
+    return _restore(out, was_1d)
+
+
+def macd(
+    data: np.ndarray, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9
+) -> tuple[np.ndarray, np.ndarray]:
+    """MACD Line ve Signal Line."""
+    macd_line = ema(data, fast_period) - ema(data, slow_period)
+    signal_line = ema(macd_line, signal_period)
+    return macd_line, signal_line
+
+
+def _rolling_window(data: np.ndarray, window: int, reducer) -> np.ndarray:
+    x, was_1d = _as_2d(data)
+    out = np.full_like(x, np.nan)
+    if 0 < window <= x.shape[1]:
+        windows = np.lib.stride_tricks.sliding_window_view(x, window, axis=-1)
+        out[:, window - 1:] = reducer(windows, axis=-1)
+    return _restore(out, was_1d)
+
+
+def rolling_mean(data: np.ndarray, window: int) -> np.ndarray:
+    """Son `window` değerin ortalaması (mevcut değer dahil); ilk window-1 değer NaN."""
+    return _rolling_window(data, window, np.mean)
+
+
+def rolling_max(data: np.ndarray, window: int) -> np.ndarray:
+    """Son `window` değerin maksimumu (mevcut değer dahil); ilk window-1 değer NaN."""
+    return _rolling_window(data, window, np.max)
+
+
+def rolling_min(data: np.ndarray, window: int) -> np.ndarray:
+    """Son `window` değerin minimumu (mevcut değer dahil); ilk window-1 değer NaN."""
+    return _rolling_window(data, window, np.min)
+
+
+def volume_ratio(volume: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Hacim spike oranı: volume[i] / mean(volume[i-window:i]).
+    Ortalama mevcut mumu içermez (stratejilerdeki volume[-11:-1] mantığı).
+
+    Returns:
+        (ratio, avg) — geçmişi yetersiz veya ortalaması <= 0 olan noktalarda ratio NaN.
+    """
+    v, was_1d = _as_2d(volume)
+    avg = np.full_like(v, np.nan)
+    avg[:, 1:] = _as_2d(rolling_mean(v[:, :-1], window))[0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(avg > 0, v / avg, np.nan)
+    return _restore(ratio, was_1d), _restore(avg, was_1d)
+
+
+# ── Osilatörler / Volatilite ─────────────────────────────────────────
+
+def rsi(data: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    RSI (Wilder's Smoothing).
+    İlk `period` değer tohum ortalamasından hesaplanır; kayıp ortalaması 0 ise
+    rs=0 kabul edilir (önceki strateji implementasyonlarıyla birebir uyumlu).
+    """
+    x, was_1d = _as_2d(data)
+    n = x.shape[1]
+    out = np.zeros_like(x)
+    if n < 2:
+        return _restore(out, was_1d)
+
+    deltas = np.diff(x, axis=-1)
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas > 0, 0.0, -deltas)
+
+    seed = deltas[:, :period]
+    up0 = np.where(seed >= 0, seed, 0.0).sum(axis=-1) / period
+    down0 = -np.where(seed < 0, seed, 0.0).sum(axis=-1) / period
+
+    def _rsi(up: np.ndarray, down: np.ndarray) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = np.where(down != 0, up / down, 0.0)
+        return 100.0 - 100.0 / (1.0 + rs)
+
+    out[:, :period] = _rsi(up0, down0)[:, np.newaxis]
+    if n > period:
+        # i = period … n-1 → deltas[i-1]
+        g = np.ascontiguousarray(gains[:, period - 1:].T)
+        l = np.ascontiguousarray(losses[:, period - 1:].T)
+        up = _wilder_rec(g, period, up0.copy())
+        down = _wilder_rec(l, period, down0.copy())
+        out[:, period:] = _rsi(up, down).T
+    return _restore(out, was_1d)
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True Range; ilk değer high - low."""
+    h, was_1d = _as_2d(high)
+    lo, _ = _as_2d(low)
+    c, _ = _as_2d(close)
+    tr = np.empty_like(c)
+    tr[:, :1] = h[:, :1] - lo[:, :1]
+    tr[:, 1:] = np.maximum(
+        h[:, 1:] - lo[:, 1:],
+        np.maximum(np.abs(h[:, 1:] - c[:, :-1]), np.abs(lo[:, 1:] - c[:, :-1])),
+    )
+    return _restore(tr, was_1d)
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    Average True Range (Wilder's Smoothing).
+    atr[period-1] ilk `period` TR'nin ortalamasıdır; öncesi 0.
+    """
+    tr, was_1d = _as_2d(true_range(high, low, close))
+    n = tr.shape[1]
+    out = np.zeros_like(tr)
+    if n >= period:
+        seed = np.mean(tr[:, :period], axis=-1)
+        out[:, period - 1] = seed
+        if n > period:
+            out[:, period:] = _wilder_rec(np.ascontiguousarray(tr[:, period:].T), period, seed.copy()).T
+    return _restore(out, was_1d)
+
+
+# ── Akışlı (Streaming) İndikatörler ──────────────────────────────────
+# Her mum kapanışında O(1) ilerleyen durum nesneleri. Girdi satırları
+# MemoryStore düzenindedir: [timestamp, open, high, low, close, volume].
+
+_HIGH, _LOW, _CLOSE = 2, 3, 4
+
+
+class StreamingIndicator(ABC):
+    """
+    Akışlı indikatör tabanı.
+
+    seed()    → kapanmış mum geçmişinden durumu kurar (vektörel, bir kez)
+    update()  → yeni kapanan mumla durumu O(1) ilerletir
+    preview() → henüz açık mum şimdi kapansaydı oluşacak değeri döndürür (durum değişmez)
+
+    Isınma için yeterli mum yoksa gelen mumlar biriktirilir ve eşik
+    aşıldığında seed() ile kurulum yapılır; o zamana kadar değer None'dır.
+    """
+
+    warmup: int = 1
+
+    def __init__(self) -> None:
+        self.value: float | None = None
+        self.last_ts: float | None = None
+        self._pending: list[np.ndarray] = []
+
+    @property
+    def ready(self) -> bool:
+        return self.value is not None
+
+    def seed(self, candles: np.ndarray) -> None:
+        candles = np.asarray(candles, dtype=np.float64)
+        self.value = None
+        self.last_ts = float(candles[-1, 0]) if len(candles) else None
+        if len(candles) >= self.warmup:
+            self._pending = []
+            self._seed(candles)
+        else:
+            self._pending = [row.copy() for row in candles]
+
+    def update(self, candle) -> None:
+        row = np.asarray(candle, dtype=np.float64)
+        self.last_ts = float(row[0])
+        if self.ready:
+            self._update(row)
+        else:
+            self._pending.append(row.copy())
+            if len(self._pending) >= self.warmup:
+                self.seed(np.array(self._pending))
+
+    def preview(self, candle) -> float | None:
+        if not self.ready:
+            return None
+        return self._preview(np.asarray(candle, dtype=np.float64))
+
+    @abstractmethod
+    def _seed(self, candles: np.ndarray) -> None:
+        """Isınmaya yeten geçmişten durumu ve value'yu kurar."""
+
+    @abstractmethod
+    def _update(self, row: np.ndarray) -> None:
+        """Hazır durumu yeni kapanan mumla ilerletir."""
+
+    @abstractmethod
+    def _preview(self, row: np.ndarray) -> float:
+        """Durumu değiştirmeden açık mumun değerini hesaplar."""
+
+
+class StreamingEma(StreamingIndicator):
+    """Close üzerinde akışlı EMA (ema() ile aynı özyineleme)."""
+
+    def __init__(self, span: int, column: int = _CLOSE) -> None:
+        super().__init__()
+        self.span = span
+        self.alpha = 2.0 / (span + 1)
+        self.column = column
+
+    def _seed(self, candles: np.ndarray) -> None:
+        self.value = float(ema(candles[:, self.column], self.span)[-1])
+
+    def _update(self, row: np.ndarray) -> None:
+        self.value = self._preview(row)
+
+    def _preview(self, row: np.ndarray) -> float:
+        return float(self.alpha * row[self.column] + (1 - self.alpha) * self.value)
+
+
+class StreamingRsi(StreamingIndicator):
+    """Close üzerinde akışlı RSI (Wilder); rsi() ile aynı tohumlama."""
+
+    def __init__(self, period: int = 14) -> None:
+        super().__init__()
+        self.period = period
+        self.warmup = period + 1
+        self._up = 0.0
+        self._down = 0.0
+        self._prev_close = 0.0
+
+    @staticmethod
+    def _rsi(up: float, down: float) -> float:
+        rs = up / down if down != 0 else 0.0
+        return 100.0 - 100.0 / (1.0 + rs)
+
+    def _step(self, close: float) -> tuple[float, float]:
+        delta = close - self._prev_close
+        gain, loss = (delta, 0.0) if delta > 0 else (0.0, -delta)
+        p = self.period
+        return (self._up * (p - 1) + gain) / p, (self._down * (p - 1) + loss) / p
+
+    def _seed(self, candles: np.ndarray) -> None:
+        closes = candles[:, _CLOSE]
+        p = self.period
+        deltas = np.diff(closes)
+        seed = deltas[:p]
+        up = np.array([seed[seed >= 0].sum() / p])
+        down = np.array([-seed[seed < 0].sum() / p])
+        if len(deltas) >= p:
+            # rsi() ile aynı: i = period … n-1 adımları deltas[i-1] ile ilerler
+            tail = deltas[p - 1:, np.newaxis]
+            up = _wilder_rec(np.where(tail > 0, tail, 0.0), p, up)[-1]
+            down = _wilder_rec(np.where(tail > 0, 0.0, -tail), p, down)[-1]
+        self._up, self._down = float(up[0]), float(down[0])
+        self._prev_close = float(closes[-1])
+        self.value = self._rsi(self._up, self._down)
+
+    def _update(self, row: np.ndarray) -> None:
+        self._up, self._down = self._step(float(row[_CLOSE]))
+        self._prev_close = float(row[_CLOSE])
+        self.value = self._rsi(self._up, self._down)
+
+    def _preview(self, row: np.ndarray) -> float:
+        return self._rsi(*self._step(float(row[_CLOSE])))
+
+
+class StreamingAtr(StreamingIndicator):
+    """Akışlı ATR (Wilder); atr() ile aynı tohumlama."""
+
+    def __init__(self, period: int = 14) -> None:
+        super().__init__()
+        self.period = period
+        self.warmup = period
+        self._prev_close = 0.0
+
+    def _tr(self, row: np.ndarray) -> float:
+        high, low = float(row[_HIGH]), float(row[_LOW])
+        return max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+
+    def _seed(self, candles: np.ndarray) -> None:
+        self.value = float(atr(candles[:, _HIGH], candles[:, _LOW], candles[:, _CLOSE], self.period)[-1])
+        self._prev_close = float(candles[-1, _CLOSE])
+
+    def _update(self, row: np.ndarray) -> None:
+        self.value = self._preview(row)
+        self._prev_close = float(row[_CLOSE])
+
+    def _preview(self, row: np.ndarray) -> float:
+        return (self.value * (self.period - 1) + self._tr(row)) / self.period
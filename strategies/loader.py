@@ -2,12 +2,15 @@
 trading_bot.strategies.loader
 ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 Dinamik strateji yükleyici.
-Config'de belirtilen strateji sınıfını importlib ile yükler.
+Config'de belirtilen strateji sınıflarını (virgülle ayrılmış liste) importlib ile yükler.
 Yeni strateji eklendiğinde main.py'de değişiklik yapmaya gerek kalmaz.
+Çalışan bot içinde strateji kodu/parametreleri reload_strategies ile yeniden yüklenir.
 """
 from __future__ import annotations
 
 import importlib
+import sys
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 from core.logger import get_logger
@@ -20,14 +23,19 @@ if TYPE_CHECKING:
 logger = get_logger(__name__)
 
 
-def load_strategy(config: 'TradingConfig', store: 'MemoryStore') -> BaseStrategy:
+def load_strategy(
+    config: 'TradingConfig', store: 'MemoryStore', spec: str | None = None
+) -> BaseStrategy:
     """
-    config.active_strategy değerini ayrıştırarak strateji sınıfını dinamik yükler.
+    Strateji yolunu ayrıştırarak strateji sınıfını dinamik yükler.
 
     Format: "module_name.ClassName"
     Örnek: "ema_volume_strategy.EmaVolumeStrategy"
            → strategies.ema_volume_strategy modülünden EmaVolumeStrategy sınıfı
 
+    Args:
+        spec: Yüklenecek strateji yolu; verilmezse config.active_strategies'in ilki.
+
     Returns:
         Başlatılmış strateji nesnesi (BaseStrategy alt sınıfı).
 
@@ -36,7 +44,7 @@ def load_strategy(config: 'TradingConfig', store: 'MemoryStore') -> BaseStrategy
         ImportError: Modül bulunamazsa.
         AttributeError: Sınıf bulunamazsa.
     """
-    raw = config.active_strategy.strip()
+    raw = (spec if spec is not None else config.active_strategies[0]).strip()
 
     if "." not in raw:
         raise ValueError(
@@ -65,3 +73,56 @@ def load_strategy(config: 'TradingConfig', store: 'MemoryStore') -> BaseStrategy
         timeframes=instance.REQUIRED_TIMEFRAMES,
     )
     return instance
+
+
+def load_strategies(config: 'TradingConfig', store: 'MemoryStore') -> list[BaseStrategy]:
+    """
+    ACTIVE_STRATEGY listesindeki tüm stratejileri yükler.
+    Aynı sınıf iki kez verilirse sadece ilki kullanılır (sinyaller sınıf adıyla ayrışır).
+    """
+    strategies: list[BaseStrategy] = []
+    for spec in config.active_strategies:
+        instance = load_strategy(config, store, spec)
+        if any(s.name == instance.name for s in strategies):
+            logger.warning("strategy_duplicate_skipped", name=instance.name)
+            continue
+        strategies.append(instance)
+
+    if not strategies:
+        raise ValueError("ACTIVE_STRATEGY boş: en az bir strateji belirtilmeli.")
+    return strategies
+
+
+def required_timeframes(strategies: list[BaseStrategy]) -> list[str]:
+    """Stratejilerin REQUIRED_TIMEFRAMES birleşimi (ilk görülme sırasıyla)."""
+    return list(dict.fromkeys(tf for s in strategies for tf in s.REQUIRED_TIMEFRAMES))
+
+
+def reload_strategies(config: 'TradingConfig', store: 'MemoryStore') -> list[BaseStrategy]:
+    """
+    ACTIVE_STRATEGY modüllerini importlib.reload ile yeniden import edip
+    yeni strateji örnekleri döndürür (daha önce yüklenmemiş modüller ilk kez import edilir).
+
+    Store'a dokunmaz; hata durumunda exception fırlatır — çağıran taraf
+    çalışan stratejileri olduğu gibi bırakmalıdır.
+    """
+    importlib.invalidate_caches()
+    for module_name in dict.fromkeys(
+        f"strategies.{spec.rsplit('.', 1)[0]}" for spec in config.active_strategies if "." in spec
+    ):
+        module = sys.modules.get(module_name)
+        if module is not None:
+            importlib.reload(module)
+            logger.info("strategy_module_reloaded", module=module_name)
+    return load_strategies(config, store)
+
+
+def strategy_source_files(strategies: list[BaseStrategy]) -> list[Path]:
+    """Yüklü stratejilerin tanımlandığı kaynak dosyalar (değişiklik izleme için)."""
+    files = []
+    for strategy in strategies:
+        module = sys.modules.get(type(strategy).__module__)
+        path = getattr(module, "__file__", None)
+        if path:
+            files.append(Path(path))
+    return list(dict.fromkeys(files))
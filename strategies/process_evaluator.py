@@ -0,0 +1,301 @@
+"""
+trading_bot.strategies.process_evaluator
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Strateji değerlendirmesini ayrı süreçlerden oluşan bir havuzda çalıştırır.
+
+Tarama, WebSocket okuyucuları ve Position Watcher aynı event loop'u paylaşır;
+yüzlerce sembollük ağır bir tarama süresince mesaj okuma ve mark price
+güncellemeleri bekler. Bu modülde:
+
+  * Ana süreç, taranacak sembollerin (n, maxlen, 6) kesitini doğrudan
+    SharedMemory bloklarına yazar (timeframe başına bir blok, yeniden kullanılır).
+  * Semboller işçi sayısı kadar parçaya bölünür; her işçiye sadece blok adı,
+    satır aralığı, counts ve fiyatlar gönderilir — mum dizileri pickle edilmez.
+  * İşçi bloğa bağlanıp kendi satır aralığının görünümü üzerinde stratejiyi
+    çalıştırır (evaluate_batch varsa vektörel, yoksa sembol bazlı evaluate).
+
+Event loop sadece sonuçları await eder; ingestion tarafı tarama boyunca akmaya devam eder.
+Stratejiler sıcak yeniden yüklendiğinde invalidate() ile işçiler de modülleri yeniden import eder.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING, Dict
+
+import numpy as np
+
+from core.clock import SYSTEM_CLOCK, VirtualClock
+from core.logger import get_logger, setup_logging
+from data.memory_store import MarketSlice, MemoryStore
+
+if TYPE_CHECKING:
+    from core.clock import Clock
+    from core.config import TradingConfig
+    from strategies.base_strategy import BaseStrategy, Signal
+
+logger = get_logger(__name__)
+
+_COLUMNS = 6
+_ITEMSIZE = np.dtype(np.float64).itemsize
+
+
+# ── Ana Süreç Tarafı ──────────────────────────────────────────────────
+
+class _SharedBlock:
+    """Bir timeframe için yeniden kullanılan, gerektiğinde büyüyen SharedMemory bloğu."""
+
+    def __init__(self) -> None:
+        self.shm: SharedMemory | None = None
+
+    def array(self, n_symbols: int, maxlen: int) -> np.ndarray:
+        """(n_symbols, maxlen, 6) float64 görünüm; blok yetmezse 2 katı boyutla yeniden açılır."""
+        need = max(n_symbols * maxlen * _COLUMNS * _ITEMSIZE, _ITEMSIZE)
+        if self.shm is None or self.shm.size < need:
+            self.close()
+            self.shm = SharedMemory(create=True, size=need * 2)
+        return np.ndarray((n_symbols, maxlen, _COLUMNS), dtype=np.float64, buffer=self.shm.buf)
+
+    def close(self) -> None:
+        if self.shm is None:
+            return
+        try:
+            self.shm.close()
+        except BufferError:
+            pass  # Görünüm hâlâ canlıysa bellek süreç kapanışında serbest kalır
+        self.shm.unlink()
+        self.shm = None
+
+
+@dataclass(frozen=True)
+class _ChunkTask:
+    """Bir işçiye gönderilen iş: mum verisi yerine paylaşımlı blok referansları."""
+    strategy_path: str                           # "strategies.ema_volume_strategy.EmaVolumeStrategy"
+    maxlen: int
+    n_total: int
+    start: int
+    stop: int
+    symbols: list[str]
+    blocks: dict[str, str]                       # {timeframe: shm adı}
+    counts: dict[str, np.ndarray]                # {timeframe: (stop-start,) int64}
+    prices: np.ndarray                           # (stop-start,) float64, bilinmeyen → NaN
+    price_ts: int                                # ana sürecin saatiyle değerlendirme anı (ms)
+    generation: int                              # strateji yeniden yükleme sayacı
+    config: TradingConfig
+
+
+class ProcessEvaluator:
+    """
+    Strateji değerlendirmesini ProcessPoolExecutor üzerinde çalıştırır.
+
+    Kullanım:
+        evaluator = ProcessEvaluator(config, store, processes=4)
+        signals = await evaluator.evaluate(strategy, symbols)
+        evaluator.close()
+    """
+
+    def __init__(
+        self,
+        config: TradingConfig,
+        store: MemoryStore,
+        processes: int,
+        clock: Clock | None = None,
+    ) -> None:
+        self._config = config
+        self._store = store
+        self._processes = processes
+        # İşçilerdeki sinyal zaman damgaları ana sürecin saatinden gelir
+        self._clock = clock or SYSTEM_CLOCK
+        # Her invalidate() ile artar; işçiler farkı görünce strateji modüllerini yeniden yükler
+        self._generation = 0
+        # spawn: event loop / thread durumu fork edilmez, Windows ile aynı davranış
+        self._pool = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(config,),
+        )
+        self._blocks: Dict[str, _SharedBlock] = {}
+        # Paylaşımlı bloklar tek taramaya aittir; eşzamanlı taramalar sıraya girer
+        self._lock = asyncio.Lock()
+        logger.info("process_evaluator_started", processes=processes)
+
+    async def evaluate(self, strategy: BaseStrategy, symbols: list[str]) -> list[Signal]:
+        """Sembolleri havuzdaki işçilere bölüp stratejiyi paralel değerlendirir."""
+        if not symbols:
+            return []
+
+        async with self._lock:
+            n = len(symbols)
+            maxlen = self._store.maxlen
+            blocks: dict[str, str] = {}
+            counts: dict[str, np.ndarray] = {}
+            for tf in strategy.REQUIRED_TIMEFRAMES:
+                block = self._blocks.setdefault(tf, _SharedBlock())
+                # Kesit ara kopya olmadan doğrudan paylaşımlı belleğe yazılır
+                market = self._store.get_slice_nowait(tf, symbols, out=block.array(n, maxlen))
+                blocks[tf] = block.shm.name
+                counts[tf] = market.counts
+                del market
+            prices = self._store.get_prices_nowait(symbols)
+            price_ts = self._clock.time_ms()
+
+            cls = type(strategy)
+            path = f"{cls.__module__}.{cls.__qualname__}"
+            bounds = np.linspace(0, n, min(self._processes, n) + 1, dtype=np.int64)
+            loop = asyncio.get_running_loop()
+            futures = [
+                loop.run_in_executor(
+                    self._pool,
+                    _evaluate_chunk,
+                    _ChunkTask(
+                        strategy_path=path,
+                        maxlen=maxlen,
+                        n_total=n,
+                        start=int(a),
+                        stop=int(b),
+                        symbols=symbols[a:b],
+                        blocks=blocks,
+                        counts={tf: c[a:b] for tf, c in counts.items()},
+                        prices=prices[a:b],
+                        price_ts=price_ts,
+                        generation=self._generation,
+                        config=self._config,
+                    ),
+                )
+                for a, b in zip(bounds[:-1], bounds[1:])
+                if b > a
+            ]
+            results = await asyncio.gather(*futures)
+
+        return [sig for chunk in results for sig in chunk]
+
+    def invalidate(self, config: TradingConfig) -> None:
+        """
+        Stratejiler yeniden yüklendiğinde çağrılır: işçiler bir sonraki işte
+        strateji modüllerini yeniden import edip yeni config ile örnek oluşturur.
+        """
+        self._config = config
+        self._generation += 1
+        logger.info("process_evaluator_invalidated", generation=self._generation)
+
+    def close(self) -> None:
+        """Havuzu kapatır ve paylaşımlı blokları serbest bırakır."""
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        for block in self._blocks.values():
+            block.close()
+        self._blocks.clear()
+        logger.info("process_evaluator_stopped")
+
+
+# ── İşçi Süreç Tarafı ─────────────────────────────────────────────────
+
+_worker: dict = {}
+
+
+def _init_worker(config: TradingConfig) -> None:
+    setup_logging(config.log_level)
+    _worker["config"] = config
+    _worker["generation"] = 0
+    _worker["strategies"] = {}
+    _worker["shm"] = {}
+
+
+def _attach(name: str) -> SharedMemory:
+    """
+    Bloğa bağlanır. Bloğun sahibi (unlink eden) ana süreçtir; spawn ile açılan
+    işçiler ana sürecin resource_tracker'ını paylaştığından eski sürümlerdeki
+    kayıt aynı isme düşer ve ayrıca kaldırılmamalıdır.
+    """
+    shm = _worker["shm"].get(name)
+    if shm is None:
+        try:
+            shm = SharedMemory(name=name, track=False)   # Python 3.13+
+        except TypeError:
+            shm = SharedMemory(name=name)
+        _worker["shm"][name] = shm
+    return shm
+
+
+def _refresh(task: _ChunkTask) -> None:
+    """Ana süreçte stratejiler yeniden yüklendiyse işçideki modülleri ve örnekleri yeniler."""
+    if task.generation == _worker["generation"]:
+        return
+    importlib.invalidate_caches()
+    modules = {path.rsplit(".", 1)[0] for path in _worker["strategies"]}
+    _worker["strategies"].clear()
+    for module_name in modules:
+        importlib.reload(importlib.import_module(module_name))
+    _worker["config"] = task.config
+    _worker["generation"] = task.generation
+
+
+def _strategy(path: str, maxlen: int) -> BaseStrategy:
+    """İşçiye özel strateji örneği (kendi MemoryStore'u ile) — yeniden yüklemeye kadar kullanılır."""
+    strategy = _worker["strategies"].get(path)
+    if strategy is None:
+        module_name, class_name = path.rsplit(".", 1)
+        cls = getattr(importlib.import_module(module_name), class_name)
+        strategy = cls(_worker["config"], MemoryStore(maxlen=maxlen))
+        _worker["strategies"][path] = strategy
+    return strategy
+
+
+def _evaluate_chunk(task: _ChunkTask) -> list[Signal]:
+    """Paylaşımlı bloklardaki [start, stop) satırlarını değerlendirir."""
+    _refresh(task)
+    strategy = _strategy(task.strategy_path, task.maxlen)
+    # Signal.timestamp ana sürecin saatiyle (sanal olabilir) aynı olsun
+    strategy.attach_clock(VirtualClock(task.price_ts / 1000))
+    store = strategy.store
+
+    # Giriş fiyatları: NaN dahil yazılır ki önceki işlerden kalan fiyat kullanılmasın
+    ids = store.price_ids_nowait(task.symbols)
+    store.update_prices_nowait(ids, task.prices, task.price_ts)
+
+    # Ana süreç büyüttüğü blokları yenisiyle değiştirir; eski bağlantıları bırak
+    for name in [n for n in _worker["shm"] if n not in task.blocks.values()]:
+        _worker["shm"].pop(name).close()
+
+    market: dict[str, MarketSlice] = {}
+    for tf, name in task.blocks.items():
+        full = np.ndarray(
+            (task.n_total, task.maxlen, _COLUMNS), dtype=np.float64, buffer=_attach(name).buf
+        )
+        view = full[task.start:task.stop]
+        view.flags.writeable = False
+        market[tf] = MarketSlice(tf, task.symbols, view, task.counts[tf])
+
+    if strategy.supports_batch:
+        return strategy.evaluate_batch(market)
+    return _evaluate_per_symbol(strategy, market)
+
+
+def _evaluate_per_symbol(strategy: BaseStrategy, market: dict[str, MarketSlice]) -> list[Signal]:
+    """Toplu API'si olmayan stratejiler: satırları işçi store'una yükleyip evaluate() çağırır."""
+    store = strategy.store
+    symbols = next(iter(market.values())).symbols
+    for tf, part in market.items():
+        for i, symbol in enumerate(symbols):
+            store.drop_candles_nowait(symbol, tf)
+            count = int(part.counts[i])
+            if count:
+                store.load_history_nowait(symbol, tf, part.candles[i, -count:])
+
+    async def _run() -> list[Signal]:
+        signals = []
+        for symbol in symbols:
+            try:
+                sig = await strategy.evaluate(symbol)
+            except Exception as e:
+                logger.debug("eval_exception", symbol=symbol, error=str(e))
+                continue
+            if sig is not None:
+                signals.append(sig)
+        return signals
+
+    return asyncio.run(_run())
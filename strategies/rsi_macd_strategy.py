@@ -6,17 +6,17 @@ Pandas kullanılmadan, %100 NumPy vektörel operasyonları ile yazılmıştır.
 """
 from __future__ import annotations
 
-from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
 import numpy as np
 
 from core.logger import get_logger
 from strategies.base_strategy import BaseStrategy, Signal
+from strategies.indicators import macd, rsi
 
 if TYPE_CHECKING:
     from core.config import TradingConfig
-    from data.memory_store import MemoryStore
+    from data.memory_store import MarketSlice, MemoryStore
 
 logger = get_logger(__name__)
 
@@ -24,53 +24,6 @@ logger = get_logger(__name__)
 TS, OPEN, HIGH, LOW, CLOSE, VOLUME = 0, 1, 2, 3, 4, 5
 
 
-def _ema_numpy(data: np.ndarray, span: int) -> np.ndarray:
-    """NumPy ile Exponential Moving Average hesaplar."""
-    alpha = 2.0 / (span + 1)
-    ema = np.empty_like(data)
-    ema[0] = data[0]
-    for i in range(1, len(data)):
-        ema[i] = alpha * data[i] + (1 - alpha) * ema[i - 1]
-    return ema
-
-
-def _macd_numpy(data: np.ndarray, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9) -> tuple[np.ndarray, np.ndarray]:
-    """NumPy ile MACD Line ve Signal Line hesaplar."""
-    ema_fast = _ema_numpy(data, fast_period)
-    ema_slow = _ema_numpy(data, slow_period)
-    macd_line = ema_fast - ema_slow
-    signal_line = _ema_numpy(macd_line, signal_period)
-    return macd_line, signal_line
-
-
-def _rsi_numpy(data: np.ndarray, period: int = 14) -> np.ndarray:
-    """NumPy ile RSI hesaplar (Wilder's Smoothing)."""
-    deltas = np.diff(data)
-    seed = deltas[:period]
-    up = seed[seed >= 0].sum() / period
-    down = -seed[seed < 0].sum() / period
-    rs = up / down if down != 0 else 0
-    
-    rsi = np.zeros_like(data)
-    rsi[:period] = 100.0 - 100.0 / (1.0 + rs)
-
-    for i in range(period, len(data)):
-        delta = deltas[i - 1]
-        if delta > 0:
-            upval = delta
-            downval = 0.0
-        else:
-            upval = 0.0
-            downval = -delta
-
-        up = (up * (period - 1) + upval) / period
-        down = (down * (period - 1) + downval) / period
-        rs = up / down if down != 0 else 0
-        rsi[i] = 100.0 - 100.0 / (1.0 + rs)
-        
-    return rsi
-
-
 class RsiMacdStrategy(BaseStrategy):
     """
     RSI ve MACD kesişimini kullanan Dinamik Zaman Dilimli Ticaret Stratejisi.
@@ -81,6 +34,7 @@ class RsiMacdStrategy(BaseStrategy):
 
     # Sadece 15 dakikalık zaman dilimi gerektirir
     REQUIRED_TIMEFRAMES: list[str] = ["15m"]
+    SUPPORTS_BATCH = True
 
     def __init__(
         self, 
@@ -117,17 +71,14 @@ class RsiMacdStrategy(BaseStrategy):
             return None
 
         close_15m = candles_15m[:, CLOSE]
-        high_15m = candles_15m[:, HIGH]
-        low_15m = candles_15m[:, LOW]
-        volume_15m = candles_15m[:, VOLUME]
 
         # ── İndikatör Hesaplamaları ───────────────────────────────────
-        rsi = _rsi_numpy(close_15m, self.rsi_period)
-        macd_line, signal_line = _macd_numpy(
-            close_15m, self.macd_fast, self.macd_slow, self.macd_signal
+        rsi_values = self.cached_indicator(symbol, "15m", candles_15m, rsi, self.rsi_period)
+        macd_line, signal_line = self.cached_indicator(
+            symbol, "15m", candles_15m, macd, self.macd_fast, self.macd_slow, self.macd_signal
         )
 
-        last_rsi = float(rsi[-1])
+        last_rsi = float(rsi_values[-1])
         
         # Kesişim kontrolü için son iki mumun MACD ve Sinyal değerleri
         prev_macd = float(macd_line[-2])
@@ -153,6 +104,77 @@ class RsiMacdStrategy(BaseStrategy):
         live_price = await self._store.get_price(symbol)
         entry_price = float(live_price) if live_price is not None else float(close_15m[-1])
 
+        return self._build_signal(
+            symbol, side, candles_15m, entry_price, curr_macd, curr_signal, last_rsi
+        )
+
+    def evaluate_batch(self, market: dict[str, MarketSlice]) -> list[Signal]:
+        """
+        evaluate() mantığının tüm semboller için vektörel karşılığı.
+        RSI ve MACD, aynı uzunluktaki semboller için tek 2-D geçişte hesaplanır.
+        """
+        m15 = market["15m"]
+        symbols = m15.symbols
+        n = len(symbols)
+
+        min_length = max(self.macd_slow, self.rsi_period) + 10
+        rows = np.flatnonzero(m15.counts >= min_length)
+
+        last_rsi = np.full(n, np.nan)
+        macd_tail = np.full((n, 2), np.nan)
+        signal_tail = np.full((n, 2), np.nan)
+        for idx, block in m15.groups(rows):
+            close = block[:, :, CLOSE]
+            last_rsi[idx] = rsi(close, self.rsi_period)[:, -1]
+            macd_line, signal_line = macd(close, self.macd_fast, self.macd_slow, self.macd_signal)
+            macd_tail[idx] = macd_line[:, -2:]
+            signal_tail[idx] = signal_line[:, -2:]
+
+        prev_macd, curr_macd = macd_tail[:, 0], macd_tail[:, 1]
+        prev_signal, curr_signal = signal_tail[:, 0], signal_tail[:, 1]
+        long_mask = (last_rsi < self.rsi_oversold) & (prev_macd < prev_signal) & (curr_macd > curr_signal)
+        short_mask = (
+            ~long_mask
+            & (last_rsi > self.rsi_overbought)
+            & (prev_macd > prev_signal)
+            & (curr_macd < curr_signal)
+        )
+
+        hits = np.flatnonzero(long_mask | short_mask)
+        if not len(hits):
+            return []
+
+        prices = self._store.get_prices_nowait([symbols[i] for i in hits])
+        signals = []
+        for j, i in enumerate(hits):
+            candles_15m = m15.candles[i, -int(m15.counts[i]):]
+            entry_price = float(prices[j]) if not np.isnan(prices[j]) else float(candles_15m[-1, CLOSE])
+            signals.append(self._build_signal(
+                symbols[i],
+                "LONG" if long_mask[i] else "SHORT",
+                candles_15m,
+                entry_price,
+                float(curr_macd[i]),
+                float(curr_signal[i]),
+                float(last_rsi[i]),
+            ))
+        return signals
+
+    def _build_signal(
+        self,
+        symbol: str,
+        side: str,
+        candles_15m: np.ndarray,
+        entry_price: float,
+        curr_macd: float,
+        curr_signal: float,
+        last_rsi: float,
+    ) -> Signal:
+        """Yön ve giriş fiyatı belli olan sinyalin SL/TP'sini hesaplayıp Signal üretir."""
+        high_15m = candles_15m[:, HIGH]
+        low_15m = candles_15m[:, LOW]
+        volume_15m = candles_15m[:, VOLUME]
+
         # Son mumun High / Low değerlerine göre Stop Loss belirleme
         if side == "LONG":
             sl = float(low_15m[-1])
@@ -184,7 +206,7 @@ class RsiMacdStrategy(BaseStrategy):
             ema_slow_value=round(curr_signal, 6),  # Referans modeli korumak için Signal map edildi
             current_volume=round(current_vol, 2),
             avg_volume=round(avg_vol_10, 2),
-            timestamp=datetime.now(timezone.utc),
+            timestamp=self._clock.now(),
         )
 
         logger.info(
@@ -194,4 +216,4 @@ class RsiMacdStrategy(BaseStrategy):
             entry=signal.entry_price,
             rsi=round(last_rsi, 2)
         )
-        return signal
\ No newline at end of file
+        return signal
@@ -7,55 +7,21 @@ yeni dinamik mimari (Plug & Play) ile yeniden yazılmış versiyonu.
 
 from __future__ import annotations
 import numpy as np
-from datetime import datetime, timezone
 from typing import TYPE_CHECKING, List, Optional
 
 from strategies.base_strategy import BaseStrategy, Signal
+from strategies.indicators import atr, ema
 from core.logger import get_logger
 
 if TYPE_CHECKING:
     from core.config import TradingConfig
-    from data.memory_store import MemoryStore
+    from data.memory_store import MarketSlice, MemoryStore
 
 logger = get_logger(__name__)
 
 # MemoryStore NumPy sütun indeksleri
 TS, OPEN, HIGH, LOW, CLOSE, VOLUME = 0, 1, 2, 3, 4, 5
 
-def _ema_numpy(data: np.ndarray, span: int) -> np.ndarray:
-    """
-    NumPy tabanlı Üssel Hareketli Ortalama (EMA) hesaplama.
-    Pandas ewm(span=N, adjust=False) ile tam uyumludur.
-    """
-    alpha = 2.0 / (span + 1)
-    ema = np.zeros_like(data)
-    ema[0] = data[0]
-    for i in range(1, len(data)):
-        ema[i] = alpha * data[i] + (1 - alpha) * ema[i - 1]
-    return ema
-
-def _atr_numpy(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
-    """
-    NumPy tabanlı Average True Range (ATR) hesaplama.
-    Wilder's Smoothing Method kullanılır.
-    """
-    tr = np.zeros_like(close)
-    tr[0] = high[0] - low[0]
-    tr[1:] = np.maximum(
-        high[1:] - low[1:],
-        np.maximum(
-            np.abs(high[1:] - close[:-1]),
-            np.abs(low[1:] - close[:-1])
-        )
-    )
-    
-    atr = np.zeros_like(close)
-    if len(tr) >= period:
-        atr[period-1] = np.mean(tr[:period])
-        for i in range(period, len(close)):
-            atr[i] = (atr[i-1] * (period - 1) + tr[i]) / period
-    return atr
-
 class VolatilityEmaStrategy(BaseStrategy):
     """
     EMA Kesişimi ve Hacim Patlaması Stratejisi.
@@ -63,6 +29,7 @@ class VolatilityEmaStrategy(BaseStrategy):
     """
     
     REQUIRED_TIMEFRAMES = ["15m"]
+    SUPPORTS_BATCH = True
 
     def __init__(self, config: TradingConfig, store: MemoryStore) -> None:
         super().__init__(config, store)
@@ -89,14 +56,14 @@ class VolatilityEmaStrategy(BaseStrategy):
 
             # Sütunları ayır
             close = candles[:, CLOSE]
-            high = candles[:, HIGH]
-            low = candles[:, LOW]
             volume = candles[:, VOLUME]
 
             # 2. İndikatör Hesaplamaları
-            ema_f = _ema_numpy(close, self.ema_fast_len)
-            ema_s = _ema_numpy(close, self.ema_slow_len)
-            atr = _atr_numpy(high, low, close, 14)
+            ema_f = self.cached_indicator(symbol, "15m", candles, ema, self.ema_fast_len)
+            ema_s = self.cached_indicator(symbol, "15m", candles, ema, self.ema_slow_len)
+            atr_values = self.cached_indicator(
+                symbol, "15m", candles, atr, 14, columns=(HIGH, LOW, CLOSE)
+            )
             
             # Hacim Ortalaması ve Spike Oranı
             avg_vol = np.mean(volume[-self.volume_ma_len-1:-1])
@@ -122,37 +89,101 @@ class VolatilityEmaStrategy(BaseStrategy):
             # 4. Giriş Fiyatı ve ATR Tabanlı Risk Yönetimi
             live_price = await self._store.get_price(symbol)
             entry_price = float(live_price) if live_price is not None else float(close[-1])
-            
-            atr_value = atr[-1]
-            if atr_value <= 0:
-                return None
 
-            if side == "LONG":
-                # Stop loss: Entry - 1.5 * ATR
-                sl = entry_price - (1.5 * atr_value)
-                risk = entry_price - sl
-                tp = entry_price + (risk * self.rr_ratio)
-            else:
-                # Stop loss: Entry + 1.5 * ATR
-                sl = entry_price + (1.5 * atr_value)
-                risk = sl - entry_price
-                tp = entry_price - (risk * self.rr_ratio)
-
-            # 5. Sinyal Objesini Döndür
-            return Signal(
-                symbol=symbol,
-                side=side,
-                entry_price=round(entry_price, 6),
-                sl_price=round(sl, 6),
-                tp_price=round(tp, 6),
-                spike_ratio=round(float(spike_ratio), 4),
-                ema_fast_value=round(float(ema_f[-1]), 6),
-                ema_slow_value=round(float(ema_s[-1]), 6),
-                current_volume=round(float(current_vol), 2),
-                avg_volume=round(float(avg_vol), 2),
-                timestamp=datetime.now(timezone.utc)
+            return self._build_signal(
+                symbol, side, entry_price, float(atr_values[-1]), float(spike_ratio),
+                float(ema_f[-1]), float(ema_s[-1]), float(current_vol), float(avg_vol),
             )
 
         except Exception as e:
             logger.error(f"⚠️ {symbol} Strateji hatası: {str(e)}")
             return None
+
+    def evaluate_batch(self, market: dict[str, MarketSlice]) -> List[Signal]:
+        """
+        evaluate() mantığının tüm semboller için vektörel karşılığı.
+        Hacim filtresi tüm piyasada tek geçişte uygulanır; EMA ve ATR sadece
+        filtreyi geçen semboller için, aynı uzunluktakiler birlikte hesaplanır.
+        """
+        m15 = market["15m"]
+        symbols = m15.symbols
+
+        ok = m15.counts >= max(self.ema_slow_len, self.volume_ma_len, 15) + 2
+        volume = m15.candles[:, :, VOLUME]
+        avg_vol = volume[:, -self.volume_ma_len - 1:-1].mean(axis=1)
+        current_vol = volume[:, -1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            spike = np.where(avg_vol > 0, current_vol / avg_vol, 0.0)
+        ok &= (spike >= self.min_spike) & (spike <= self.max_spike)
+
+        rows = np.flatnonzero(ok)
+        if not len(rows):
+            return []
+
+        signals = []
+        for idx, block in m15.groups(rows):
+            close = block[:, :, CLOSE]
+            ema_f = ema(close, self.ema_fast_len)[:, -2:]
+            ema_s = ema(close, self.ema_slow_len)[:, -2:]
+            atr_last = atr(block[:, :, HIGH], block[:, :, LOW], close, 14)[:, -1]
+
+            long_mask = (ema_f[:, 1] > ema_s[:, 1]) & (ema_f[:, 0] <= ema_s[:, 0])
+            short_mask = ~long_mask & (ema_f[:, 1] < ema_s[:, 1]) & (ema_f[:, 0] >= ema_s[:, 0])
+            hits = np.flatnonzero(long_mask | short_mask)
+            if not len(hits):
+                continue
+
+            prices = self._store.get_prices_nowait([symbols[idx[k]] for k in hits])
+            for j, k in enumerate(hits):
+                i = idx[k]
+                entry_price = float(prices[j]) if not np.isnan(prices[j]) else float(close[k, -1])
+                signal = self._build_signal(
+                    symbols[i], "LONG" if long_mask[k] else "SHORT", entry_price,
+                    float(atr_last[k]), float(spike[i]), float(ema_f[k, 1]), float(ema_s[k, 1]),
+                    float(current_vol[i]), float(avg_vol[i]),
+                )
+                if signal is not None:
+                    signals.append(signal)
+        return signals
+
+    def _build_signal(
+        self,
+        symbol: str,
+        side: str,
+        entry_price: float,
+        atr_value: float,
+        spike_ratio: float,
+        ema_fast_value: float,
+        ema_slow_value: float,
+        current_vol: float,
+        avg_vol: float,
+    ) -> Optional[Signal]:
+        """ATR tabanlı SL/TP hesaplayıp Signal üretir; ATR geçersizse None."""
+        if atr_value <= 0:
+            return None
+
+        if side == "LONG":
+            # Stop loss: Entry - 1.5 * ATR
+            sl = entry_price - (1.5 * atr_value)
+            risk = entry_price - sl
+            tp = entry_price + (risk * self.rr_ratio)
+        else:
+            # Stop loss: Entry + 1.5 * ATR
+            sl = entry_price + (1.5 * atr_value)
+            risk = sl - entry_price
+            tp = entry_price - (risk * self.rr_ratio)
+
+        # 5. Sinyal Objesini Döndür
+        return Signal(
+            symbol=symbol,
+            side=side,
+            entry_price=round(entry_price, 6),
+            sl_price=round(sl, 6),
+            tp_price=round(tp, 6),
+            spike_ratio=round(spike_ratio, 4),
+            ema_fast_value=round(ema_fast_value, 6),
+            ema_slow_value=round(ema_slow_value, 6),
+            current_volume=round(current_vol, 2),
+            avg_volume=round(avg_vol, 2),
+            timestamp=self._clock.now()
+        )
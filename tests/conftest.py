@@ -0,0 +1,26 @@
+"""Test oturumu: depo kökü import yoluna eklenir (paket kurulumu gerektirmez)."""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def make_candles(
+    n: int, start: float = 0, step: int = 60_000, seed: int = 0, *, scale: float = 1.0
+) -> np.ndarray:
+    """
+    Rastgele yürüyüşlü sentetik OHLCV mumları: shape=(n, 6) [ts, o, h, l, c, v].
+
+    Aynı seed aynı diziyi verir. open önceki close'tur, high/low gövdeyi
+    kapsar (high ≥ max(o, c), low ≤ min(o, c)); scale adım oynaklığıdır.
+    """
+    rng = np.random.default_rng(seed)
+    ts = start + np.arange(n, dtype=np.float64) * step
+    close = 100 + np.cumsum(rng.normal(0, scale, n))
+    open_ = np.r_[100.0, close[:-1]]
+    high = np.maximum(open_, close) + rng.random(n) * scale
+    low = np.minimum(open_, close) - rng.random(n) * scale
+    volume = rng.random(n) * 100
+    return np.column_stack([ts, open_, high, low, close, volume])
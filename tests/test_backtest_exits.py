@@ -0,0 +1,85 @@
+"""backtest.engine._resolve_exits — TP/SL/TIMEOUT sırası, boşluklu açılışlar ve belirsiz mumlar."""
+import numpy as np
+import pytest
+
+from backtest.engine import _OPEN, _SL, _TIMEOUT, _TP, _resolve_exits
+from conftest import make_candles
+
+MIN = 60_000
+
+
+def _bars(rows):
+    """(open, high, low, close) listesinden 1m mum dizisi."""
+    out = np.zeros((len(rows), 6))
+    for i, (o, h, l, c) in enumerate(rows):
+        out[i] = [i * MIN, o, h, l, c, 1.0]
+    return out
+
+
+def _resolve(base, long=True, tp=110.0, sl=90.0, intrabar=True, ambiguous="sl", time_stop_ms=60 * MIN):
+    exit_row, reason, price, unclear = _resolve_exits(
+        base, np.array([0]), np.array([long]), np.array([tp]), np.array([sl]),
+        time_stop_ms=time_stop_ms, base_ms=MIN, intrabar=intrabar, ambiguous=ambiguous,
+    )
+    return int(exit_row[0]), int(reason[0]), float(price[0]), bool(unclear[0])
+
+
+def test_tp_hit_fills_at_level():
+    base = _bars([(100, 100, 100, 100), (100, 105, 99, 104), (104, 112, 103, 108)])
+    assert _resolve(base) == (2, _TP, 110.0, False)
+
+
+def test_sl_hit_fills_at_level_for_short():
+    base = _bars([(100, 100, 100, 100), (100, 111, 99, 108)])
+    assert _resolve(base, long=False, tp=90.0, sl=110.0) == (1, _SL, 110.0, False)
+
+
+def test_ambiguous_bar_defaults_to_sl():
+    base = _bars([(100, 100, 100, 100), (100, 115, 85, 100)])
+    assert _resolve(base) == (1, _SL, 90.0, True)
+
+
+def test_ambiguous_bar_tp_policy():
+    base = _bars([(100, 100, 100, 100), (100, 115, 85, 100)])
+    assert _resolve(base, ambiguous="tp") == (1, _TP, 110.0, True)
+
+
+@pytest.mark.parametrize("ambiguous", ["sl", "tp"])
+def test_gap_beyond_level_is_not_ambiguous(ambiguous):
+    # Açılış TP'nin ötesinde: TP kesin önce, dolum açılıştan
+    base = _bars([(100, 100, 100, 100), (113, 115, 85, 100)])
+    assert _resolve(base, ambiguous=ambiguous) == (1, _TP, 113.0, False)
+    # Açılış SL'nin ötesinde: SL kesin önce, dolum açılıştan
+    base = _bars([(100, 100, 100, 100), (87, 115, 85, 100)])
+    assert _resolve(base, ambiguous=ambiguous) == (1, _SL, 87.0, False)
+
+
+def test_close_only_ignores_wicks():
+    base = _bars([(100, 100, 100, 100), (100, 115, 85, 100), (100, 100, 100, 111)])
+    assert _resolve(base, intrabar=False) == (2, _TP, 111.0, False)
+
+
+def test_timeout_exits_at_close():
+    base = _bars([(100, 100, 100, 100)] + [(100, 101, 99, 100.5)] * 5)
+    assert _resolve(base, time_stop_ms=3 * MIN) == (3, _TIMEOUT, 100.5, False)
+
+
+def test_position_open_until_data_ends():
+    base = _bars([(100, 100, 100, 100), (100, 101, 99, 100)])
+    exit_row, reason, price, unclear = _resolve(base)
+    assert (exit_row, reason, unclear) == (-1, _OPEN, False)
+    assert np.isnan(price)
+
+
+def test_batches_match_single_pass():
+    base = make_candles(600, step=MIN, seed=3, scale=0.5)
+    close = base[:, 4]
+    rows = np.arange(0, 500, 7)
+    is_long = rows % 2 == 0
+    tp = np.where(is_long, close[rows] * 1.01, close[rows] * 0.99)
+    sl = np.where(is_long, close[rows] * 0.99, close[rows] * 1.01)
+    kwargs = dict(time_stop_ms=90 * MIN, base_ms=MIN, intrabar=True)
+    full = _resolve_exits(base, rows, is_long, tp, sl, **kwargs)
+    small = _resolve_exits(base, rows, is_long, tp, sl, batch=5, **kwargs)
+    for a, b in zip(full, small):
+        np.testing.assert_array_equal(a, b)
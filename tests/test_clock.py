@@ -0,0 +1,59 @@
+"""VirtualClock: uyanma sırası (aynı anda kayıt sırasıyla) ve hold() ile G/Ç bekletme."""
+from __future__ import annotations
+
+import asyncio
+
+from core.clock import SYSTEM_CLOCK, VirtualClock
+
+
+def test_advance_wakes_periodic_loops_in_order():
+    async def _run() -> list[tuple[str, float]]:
+        clock = VirtualClock(start=100)
+        seen: list[tuple[str, float]] = []
+
+        async def _loop(name: str, every: float) -> None:
+            while True:
+                await clock.sleep(every)
+                seen.append((name, clock.time()))
+
+        tasks = [asyncio.create_task(_loop("a", 10)), asyncio.create_task(_loop("b", 25))]
+        await asyncio.sleep(0)
+        await clock.advance(50)
+        for task in tasks:
+            task.cancel()
+        return seen
+
+    assert asyncio.run(_run()) == [
+        ("a", 110), ("a", 120), ("b", 125), ("a", 130), ("a", 140), ("b", 150), ("a", 150),
+    ]
+
+
+def test_advance_waits_for_open_holds():
+    async def _run() -> list[tuple[str, float]]:
+        clock = VirtualClock(start=0)
+        seen: list[tuple[str, float]] = []
+
+        async def _writer() -> None:
+            await clock.sleep(5)
+            async with clock.hold():
+                # Gerçek G/Ç (thread) beklenirken saat ilerlememeli
+                await asyncio.to_thread(lambda: None)
+                await asyncio.sleep(0.01)
+                seen.append(("written", clock.time()))
+
+        task = asyncio.create_task(_writer())
+        await asyncio.sleep(0)
+        await clock.advance_to(60)
+        seen.append(("advanced", clock.time()))
+        await task
+        return seen
+
+    assert asyncio.run(_run()) == [("written", 5), ("advanced", 60)]
+
+
+def test_system_clock_hold_is_a_no_op():
+    async def _run() -> bool:
+        async with SYSTEM_CLOCK.hold():
+            return True
+
+    assert asyncio.run(_run())
@@ -0,0 +1,58 @@
+"""BaseStrategy.cached_indicator: paylaşılan önbellek anahtarı."""
+from __future__ import annotations
+
+import numpy as np
+
+from core.config import TradingConfig
+from data.memory_store import MemoryStore
+from strategies.base_strategy import BaseStrategy
+from strategies.indicator_cache import IndicatorCache
+
+
+class _Strategy(BaseStrategy):
+    REQUIRED_TIMEFRAMES = ["1m"]
+
+    async def evaluate(self, symbol: str):
+        return None
+
+
+def _setup() -> tuple[_Strategy, _Strategy, IndicatorCache, np.ndarray]:
+    store = MemoryStore(maxlen=50)
+    close = np.arange(30, dtype=np.float64)
+    store.load_history_nowait(
+        "AAAUSDT", "1m", np.column_stack([close * 60_000, close, close, close, close, close])
+    )
+    cache = IndicatorCache()
+    first, second = _Strategy(TradingConfig(), store), _Strategy(TradingConfig(), store)
+    first.attach_indicator_cache(cache)
+    second.attach_indicator_cache(cache)
+    return first, second, cache, store.get_candles_nowait("AAAUSDT", "1m")
+
+
+def _make(scale: float):
+    def indicator(close: np.ndarray, offset: float) -> np.ndarray:
+        return close * scale + offset
+    return indicator
+
+
+def test_same_function_is_shared_between_strategies():
+    first, second, cache, candles = _setup()
+    double = _make(2.0)
+
+    a = first.cached_indicator("AAAUSDT", "1m", candles, double, 1.0)
+    b = second.cached_indicator("AAAUSDT", "1m", candles, double, 1.0)
+
+    assert a is b
+    assert cache.stats()["hits"] == 1
+
+
+def test_functions_with_same_name_do_not_collide():
+    first, _second, _cache, candles = _setup()
+    double, triple = _make(2.0), _make(3.0)
+    assert double.__qualname__ == triple.__qualname__
+
+    a = first.cached_indicator("AAAUSDT", "1m", candles, double, 0.0)
+    b = first.cached_indicator("AAAUSDT", "1m", candles, triple, 0.0)
+
+    np.testing.assert_array_equal(a, candles[:, 4] * 2)
+    np.testing.assert_array_equal(b, candles[:, 4] * 3)
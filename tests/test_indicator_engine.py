@@ -0,0 +1,83 @@
+"""IndicatorEngine: kayıt, kayıt silme ve seçici tohumlama."""
+from __future__ import annotations
+
+import numpy as np
+
+from conftest import make_candles
+from core.clock import VirtualClock
+from data.memory_store import MemoryStore
+from strategies.indicator_engine import IndicatorEngine
+from strategies.indicators import StreamingEma, ema
+
+_STEP = 60_000
+
+
+def _engine(n: int = 60) -> tuple[MemoryStore, IndicatorEngine, np.ndarray]:
+    candles = make_candles(n, step=_STEP, seed=3)
+    store = MemoryStore(maxlen=200)
+    store.load_history_nowait("AAAUSDT", "1m", candles)
+    # Son mum kapanmış sayılsın
+    engine = IndicatorEngine(store, clock=VirtualClock(start=(n + 1) * _STEP / 1000))
+    return store, engine, candles
+
+
+class _Counting(StreamingEma):
+    seeds = 0
+
+    def _seed(self, candles: np.ndarray) -> None:
+        type(self).seeds += 1
+        super()._seed(candles)
+
+
+def test_register_seeds_only_new_indicator():
+    store, engine, candles = _engine()
+    owner = object()
+    _Counting.seeds = 0
+    engine.register("1m", "fast", lambda: _Counting(9), owner=owner)
+    first = engine.value("AAAUSDT", "1m", "fast", preview=False)
+    assert _Counting.seeds == 1
+
+    engine.register("1m", "slow", lambda: StreamingEma(21), owner=owner)
+
+    assert _Counting.seeds == 1  # mevcut "fast" yeniden tohumlanmadı
+    assert engine.value("AAAUSDT", "1m", "fast", preview=False) == first
+    assert np.isclose(
+        engine.value("AAAUSDT", "1m", "slow", preview=False), ema(candles[:, 4], 21)[-1]
+    )
+
+
+def test_registered_later_stays_in_step_with_stream():
+    store, engine, candles = _engine()
+    engine.register("1m", "fast", lambda: StreamingEma(9))
+    engine.value("AAAUSDT", "1m", "fast")
+    engine.register("1m", "slow", lambda: StreamingEma(21))
+
+    more = make_candles(70, step=_STEP, seed=3)[60:]
+    for row in more:
+        store.update_candle_nowait("AAAUSDT", "1m", list(row), is_closed=True)
+
+    closes = np.concatenate([candles[:, 4], more[:, 4]])
+    assert np.isclose(engine.value("AAAUSDT", "1m", "slow", preview=False), ema(closes, 21)[-1])
+    assert np.isclose(engine.value("AAAUSDT", "1m", "fast", preview=False), ema(closes, 9)[-1])
+
+
+def test_unregister_removes_only_owned_specs():
+    _store, engine, _candles_ = _engine()
+    old, new = object(), object()
+    engine.register("1m", "S.fast", lambda: StreamingEma(9), owner=old)
+    engine.register("1m", "S.slow", lambda: StreamingEma(21), owner=old)
+    engine.register("5m", "T.fast", lambda: StreamingEma(9), owner=old)
+    engine.value("AAAUSDT", "1m", "S.fast")
+    # Yeniden yüklenen strateji aynı isimlerden birini yeniden kaydeder
+    engine.register("1m", "S.fast", lambda: StreamingEma(12), owner=new)
+
+    assert engine.unregister(old) == 2
+
+    assert engine._specs == {"1m": {"S.fast": engine._specs["1m"]["S.fast"]}}
+    assert set(engine._states[("AAAUSDT", "1m")]) == {"S.fast"}
+    assert engine.value("AAAUSDT", "1m", "S.fast") is not None
+    assert engine.unregister(old) == 0
+
+    assert engine.unregister(new) == 1
+    assert engine._specs == {}
+    assert engine._states == {}
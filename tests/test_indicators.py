@@ -0,0 +1,142 @@
+"""strategies.indicators — eski strateji döngüleriyle birebir uyum (numba ile derlenmiş çekirdekler)."""
+import numpy as np
+import pytest
+
+import strategies.indicators as ind
+
+
+# ── Referans: stratejilerdeki eski döngüler ───────────────────────────
+
+def _ema_ref(data, span):
+    alpha = 2.0 / (span + 1)
+    ema = np.empty_like(data)
+    ema[0] = data[0]
+    for i in range(1, len(data)):
+        ema[i] = alpha * data[i] + (1 - alpha) * ema[i - 1]
+    return ema
+
+
+def _macd_ref(data, fast=12, slow=26, signal=9):
+    line = _ema_ref(data, fast) - _ema_ref(data, slow)
+    return line, _ema_ref(line, signal)
+
+
+def _rsi_ref(data, period=14):
+    deltas = np.diff(data)
+    seed = deltas[:period]
+    up = seed[seed >= 0].sum() / period
+    down = -seed[seed < 0].sum() / period
+    rs = up / down if down != 0 else 0
+    rsi = np.zeros_like(data)
+    rsi[:period] = 100.0 - 100.0 / (1.0 + rs)
+    for i in range(period, len(data)):
+        delta = deltas[i - 1]
+        upval, downval = (delta, 0.0) if delta > 0 else (0.0, -delta)
+        up = (up * (period - 1) + upval) / period
+        down = (down * (period - 1) + downval) / period
+        rs = up / down if down != 0 else 0
+        rsi[i] = 100.0 - 100.0 / (1.0 + rs)
+    return rsi
+
+
+def _atr_ref(high, low, close, period=14):
+    tr = np.zeros_like(close)
+    tr[0] = high[0] - low[0]
+    tr[1:] = np.maximum(
+        high[1:] - low[1:],
+        np.maximum(np.abs(high[1:] - close[:-1]), np.abs(low[1:] - close[:-1])),
+    )
+    atr = np.zeros_like(close)
+    if len(tr) >= period:
+        atr[period - 1] = np.mean(tr[:period])
+        for i in range(period, len(close)):
+            atr[i] = (atr[i - 1] * (period - 1) + tr[i]) / period
+    return atr
+
+
+# ── Yardımcılar ───────────────────────────────────────────────────────
+
+def _ohlc(n_symbols=5, n=200, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, (n_symbols, n)), axis=1)
+    high = close + rng.uniform(0, 2, close.shape)
+    low = close - rng.uniform(0, 2, close.shape)
+    return high, low, close
+
+
+def _assert_same(actual, expected):
+    # Derlenmiş çekirdekler işlem sırasını birebir korur: sonuçlar bit düzeyinde aynı
+    np.testing.assert_array_equal(actual, expected)
+
+
+# ── Testler ───────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("span", [3, 9, 21])
+def test_ema_matches_reference(span):
+    _h, _l, close = _ohlc()
+    _assert_same(ind.ema(close[0], span), _ema_ref(close[0], span))
+    expected = np.stack([_ema_ref(row, span) for row in close])
+    _assert_same(ind.ema(close, span), expected)
+
+
+def test_macd_matches_reference():
+    _h, _l, close = _ohlc()
+    line, signal = ind.macd(close[0])
+    ref_line, ref_signal = _macd_ref(close[0])
+    _assert_same(line, ref_line)
+    _assert_same(signal, ref_signal)
+
+    line, signal = ind.macd(close)
+    refs = [_macd_ref(row) for row in close]
+    _assert_same(line, np.stack([r[0] for r in refs]))
+    _assert_same(signal, np.stack([r[1] for r in refs]))
+
+
+@pytest.mark.parametrize("period", [5, 14])
+def test_rsi_matches_reference(period):
+    _h, _l, close = _ohlc()
+    _assert_same(ind.rsi(close[0], period), _rsi_ref(close[0], period))
+    expected = np.stack([_rsi_ref(row, period) for row in close])
+    _assert_same(ind.rsi(close, period), expected)
+
+
+def test_rsi_flat_series_has_zero_loss_branch():
+    close = np.linspace(100, 120, 50)   # hiç kayıp yok → rs=0 kuralı
+    _assert_same(ind.rsi(close), _rsi_ref(close))
+
+
+@pytest.mark.parametrize("period", [7, 14])
+def test_atr_matches_reference(period):
+    high, low, close = _ohlc()
+    _assert_same(ind.atr(high[0], low[0], close[0], period), _atr_ref(high[0], low[0], close[0], period))
+    expected = np.stack([_atr_ref(h, l, c, period) for h, l, c in zip(high, low, close)])
+    _assert_same(ind.atr(high, low, close, period), expected)
+
+
+def test_short_inputs():
+    close = np.array([1.0, 2.0, 3.0])
+    _assert_same(ind.ema(close, 9), _ema_ref(close, 9))
+    assert ind.ema(np.array([]), 9).shape == (0,)
+    assert not ind.atr(close, close, close, 14).any()
+
+
+def test_streaming_indicators_track_vectorized():
+    high, low, close = _ohlc(n_symbols=1)
+    candles = np.column_stack([np.arange(200) * 60_000.0, close[0], high[0], low[0], close[0], np.ones(200)])
+    for state, full in [
+        (ind.StreamingEma(9), ind.ema(close[0], 9)),
+        (ind.StreamingRsi(14), ind.rsi(close[0], 14)),
+        (ind.StreamingAtr(14), ind.atr(high[0], low[0], close[0], 14)),
+    ]:
+        state.seed(candles[:100])
+        for row in candles[100:150]:
+            preview = state.preview(row)
+            state.update(row)
+            assert state.value == preview
+        assert state.value == pytest.approx(full[149], rel=1e-10)
+
+
+def test_recursions_run_compiled():
+    ind.ema(np.arange(10.0), 3)
+    ind.rsi(np.arange(30.0), 14)
+    assert ind._ema_rec.signatures and ind._wilder_rec.signatures
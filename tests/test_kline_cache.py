@@ -0,0 +1,125 @@
+"""data.kline_cache — boşluk doldurma, kuyruk tamamlama ve toplu index yazımı (sahte REST)."""
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+import data.kline_cache as kc
+import data.rest_client as rc
+from conftest import make_candles
+
+STEP = 60_000
+
+
+class FakeRest:
+    """Borsa yerine geçer: sabit sentetik geçmişten istenen aralığı döndürür, istekleri kaydeder."""
+
+    def __init__(self, now_ms, history=5000):
+        self.now_ms = now_ms
+        self.calls = []
+        open_ts = now_ms - now_ms % STEP
+        self.history = make_candles(history + 1, start=open_ts - history * STEP, step=STEP, seed=9)
+
+    def klines(self, start_ms, end_ms):
+        """[start_ms, end_ms) aralığındaki mumlar (örtüşen istekler aynı değerleri görür)."""
+        ts = self.history[:, 0]
+        return self.history[(ts >= start_ms) & (ts < end_ms)]
+
+    async def __call__(self, session, symbol, interval="1m", limit=1000, start_ms=None, end_ms=None, budget=None):
+        self.calls.append((start_ms, end_ms, limit))
+        open_ts = self.now_ms - self.now_ms % STEP
+        lo = start_ms
+        hi = min(open_ts + STEP, (end_ms + 1) if end_ms is not None else open_ts + STEP)
+        rows = self.klines(lo - lo % STEP + (STEP if lo % STEP else 0), hi)
+        return rows[:limit]
+
+
+@pytest.fixture
+def rest(monkeypatch):
+    now_ms = 1_700_000_000_000 + 30_000
+    fake = FakeRest(now_ms)
+    monkeypatch.setattr(rc, "request_klines", fake)
+    monkeypatch.setattr(kc, "request_klines", fake)
+    monkeypatch.setattr(kc.KlineCache, "_closed_until", staticmethod(lambda step: now_ms - now_ms % step))
+    return fake
+
+
+def _open_ts(rest):
+    return rest.now_ms - rest.now_ms % STEP
+
+
+def test_fetch_range_fills_only_gaps(tmp_path, rest):
+    cache = kc.KlineCache(tmp_path)
+    end = _open_ts(rest)
+    start = end - 3000 * STEP
+
+    async def run():
+        a = await cache.fetch_range(None, "BTCUSDT", "1m", start + 1000 * STEP, start + 2000 * STEP)
+        first_calls = len(rest.calls)
+        b = await cache.fetch_range(None, "BTCUSDT", "1m", start, end)
+        return a, first_calls, b
+
+    a, first_calls, b = asyncio.run(run())
+    np.testing.assert_array_equal(a, rest.klines(start + 1000 * STEP, start + 2000 * STEP))
+    np.testing.assert_array_equal(b, rest.klines(start, end))
+    # İkinci çağrı sadece iki yan boşluğu (1000'er mum) ister
+    requested = rest.calls[first_calls:]
+    assert sorted(c[0] for c in requested) == [start, start + 2000 * STEP]
+    assert cache.coverage("BTCUSDT", "1m") == [(start, end)]
+    assert cache.missing("BTCUSDT", "1m", start, end) == []
+
+
+def test_fetch_recent_tops_up_tail(tmp_path, rest):
+    cache = kc.KlineCache(tmp_path)
+    open_ts = _open_ts(rest)
+
+    async def run():
+        first = await cache.fetch_recent(None, "ETHUSDT", "1m", limit=50)
+        calls = len(rest.calls)
+        second = await cache.fetch_recent(None, "ETHUSDT", "1m", limit=50)
+        return first, calls, second
+
+    first, calls, second = asyncio.run(run())
+    expected = rest.klines(open_ts - 49 * STEP, open_ts + STEP)
+    np.testing.assert_array_equal(first, expected)
+    np.testing.assert_array_equal(second, expected)
+    # İkinci preload'da baş kısım diskten gelir; REST'e sadece açık mum için gidilir
+    assert rest.calls[calls][2] == 1
+    assert cache.hits == 49
+
+
+def test_index_written_once_per_batch(tmp_path, rest, monkeypatch):
+    cache = kc.KlineCache(tmp_path)
+    writes = []
+    original = cache._write_index
+    monkeypatch.setattr(cache, "_write_index", lambda payload: (writes.append(1), original(payload)))
+
+    async def run():
+        for symbol in ("A", "B", "C"):
+            await cache.fetch_recent(None, symbol, "1m", limit=10)
+        assert not (tmp_path / "index.json").exists()
+        await cache.flush_async()
+
+    asyncio.run(run())
+    assert len(writes) == 1
+    index = json.loads((tmp_path / "index.json").read_text())
+    assert set(index["keys"]) == {"A|1m", "B|1m", "C|1m"}
+
+
+def test_replaced_files_removed_after_flush_and_reopen(tmp_path, rest):
+    cache = kc.KlineCache(tmp_path)
+    open_ts = _open_ts(rest)
+
+    async def run():
+        await cache.fetch_range(None, "BTCUSDT", "1m", open_ts - 20 * STEP, open_ts - 10 * STEP)
+        await cache.fetch_range(None, "BTCUSDT", "1m", open_ts - 10 * STEP, open_ts)
+        # Index yazılmadan önce eski dosya silinmez
+        assert len(list((tmp_path / "1m").glob("*.npy"))) == 2
+        await cache.flush_async()
+
+    asyncio.run(run())
+    assert len(list((tmp_path / "1m").glob("*.npy"))) == 1
+    reopened = kc.KlineCache(tmp_path)
+    np.testing.assert_array_equal(reopened.read("BTCUSDT", "1m"), rest.klines(open_ts - 20 * STEP, open_ts))
+    assert reopened.coverage("BTCUSDT", "1m") == [(open_ts - 20 * STEP, open_ts)]
@@ -0,0 +1,257 @@
+"""MemoryStore: ring buffer, sembol tahliyesi ve fiyat tablosu slotları."""
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from conftest import make_candles
+from data.memory_store import CandleBuffer, MarketTensor, MemoryStore, PriceTable
+from execution.position_watcher import PositionWatcher, VirtualPosition
+
+
+# ── CandleBuffer ──────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("n", [1, 4, 5, 9, 23])
+def test_ring_buffer_append_wraps_in_order(n):
+    buf = CandleBuffer(maxlen=5)
+    candles = make_candles(n)
+    for row in candles:
+        buf.append(list(row))
+
+    np.testing.assert_array_equal(buf.to_numpy(), candles[-5:])
+    assert len(buf) == min(n, 5)
+    assert buf.last_timestamp == candles[-1, 0]
+
+
+@pytest.mark.parametrize("chunks", [[3, 4], [2, 2, 2, 2], [7], [1, 5, 1], [4, 12, 2]])
+def test_ring_buffer_extend_matches_append(chunks):
+    candles = make_candles(sum(chunks))
+    extended, appended = CandleBuffer(maxlen=5), CandleBuffer(maxlen=5)
+    pos = 0
+    for size in chunks:
+        extended.extend(candles[pos:pos + size])
+        pos += size
+    for row in candles:
+        appended.append(list(row))
+
+    np.testing.assert_array_equal(extended.to_numpy(), appended.to_numpy())
+    assert extended.last_timestamp == appended.last_timestamp
+
+
+def test_ring_buffer_update_last_after_wrap():
+    buf = CandleBuffer(maxlen=3)
+    candles = make_candles(5)
+    buf.extend(candles)
+    revised = candles[-1].copy()
+    revised[4] = -1.0
+
+    buf.update_last(list(revised))
+    assert len(buf) == 3
+    assert buf.to_numpy()[-1, 4] == -1.0
+
+    nxt = make_candles(1, start=5 * 60_000)[0]
+    buf.update_last(list(nxt))  # yeni timestamp → eklenir
+    np.testing.assert_array_equal(buf.to_numpy()[:, 0], [3 * 60_000, 4 * 60_000, 5 * 60_000])
+
+
+def test_ring_buffer_view_is_read_only():
+    buf = CandleBuffer(maxlen=4)
+    buf.extend(make_candles(6))
+    with pytest.raises(ValueError):
+        buf.to_numpy()[0, 0] = 1.0
+
+
+def test_async_get_candles_returns_a_stable_copy():
+    store = MemoryStore(maxlen=4)
+    store.load_history_nowait("AAAUSDT", "1m", make_candles(4))
+
+    held = asyncio.run(store.get_candles("AAAUSDT", "1m"))
+    view = store.get_candles_nowait("AAAUSDT", "1m")
+    expected = held.copy()
+    store.update_candle_nowait("AAAUSDT", "1m", list(make_candles(1, start=4 * 60_000)[0]), is_closed=True)
+
+    np.testing.assert_array_equal(held, expected)
+    assert not np.array_equal(view[:, 0], expected[:, 0])  # görünüm yazımla değişir
+
+
+# ── MarketTensor ──────────────────────────────────────────────────────
+
+def _right_aligned(candles: np.ndarray, maxlen: int) -> np.ndarray:
+    out = np.full((maxlen, 6), np.nan)
+    tail = candles[-maxlen:]
+    if len(tail):
+        out[-len(tail):] = tail
+    return out
+
+
+def test_tensor_rows_match_reference_after_mixed_writes():
+    rng = np.random.default_rng(11)
+    maxlen = 6
+    tensor = MarketTensor("1m", maxlen=maxlen, capacity=2)  # büyüme de sınansın
+    history: dict[str, list] = {f"S{i}": [] for i in range(5)}
+    ts = 0
+    for _ in range(200):
+        symbol = f"S{rng.integers(5)}"
+        rows = history[symbol]
+        op = rng.integers(4)
+        ts += 60_000
+        if op == 0:
+            chunk = make_candles(int(rng.integers(1, 15)), start=ts)
+            ts += len(chunk) * 60_000
+            tensor.extend(symbol, chunk)
+            rows.extend(chunk)
+        elif op == 1 and rows:
+            candle = rows[-1].copy()
+            candle[4] = rng.normal()
+            tensor.update_last(symbol, candle)
+            rows[-1] = candle
+        elif op == 2 and rng.random() < 0.1:
+            tensor.clear(symbol)
+            rows.clear()
+        else:
+            candle = make_candles(1, start=ts)[0]
+            tensor.append(symbol, candle)
+            rows.append(candle)
+
+    symbols = sorted(history)
+    market = tensor.take(symbols)
+    snap = tensor.snapshot()
+    for i, symbol in enumerate(symbols):
+        expected = _right_aligned(np.array(history[symbol]).reshape(-1, 6), maxlen)
+        np.testing.assert_array_equal(market.candles[i], expected)
+        assert market.counts[i] == min(len(history[symbol]), maxlen)
+        np.testing.assert_array_equal(snap.candles[snap.symbols.index(symbol)], expected)
+
+
+def test_tensor_snapshot_is_view_when_heads_align():
+    tensor = MarketTensor("1m", maxlen=4)
+    for symbol in ("A", "B"):
+        tensor.extend(symbol, make_candles(4))
+    for k in range(3):
+        for symbol in ("A", "B"):
+            tensor.append(symbol, make_candles(1, start=(4 + k) * 60_000)[0])
+
+    snap = tensor.snapshot()
+    assert np.shares_memory(snap.candles, tensor._data)
+    np.testing.assert_array_equal(snap.candles[1, :, 0], np.arange(3, 7) * 60_000)
+
+    tensor.append("A", make_candles(1, start=7 * 60_000)[0])
+    snap = tensor.snapshot()
+    assert not np.shares_memory(snap.candles, tensor._data)
+    np.testing.assert_array_equal(snap.candles[0, :, 0], np.arange(4, 8) * 60_000)
+    np.testing.assert_array_equal(snap.candles[1, :, 0], np.arange(3, 7) * 60_000)
+    with pytest.raises(ValueError):
+        snap.candles[0, 0, 0] = 1.0
+
+
+# ── Tahliye ───────────────────────────────────────────────────────────
+
+def test_evict_clears_buffers_versions_and_price():
+    store = MemoryStore(maxlen=50, columnar=True)
+    store.load_history_nowait("AAAUSDT", "1m", make_candles(10))
+    store.load_history_nowait("AAAUSDT", "5m", make_candles(5, step=300_000))
+    store.load_history_nowait("BBBUSDT", "1m", make_candles(10))
+    store.update_price_nowait("AAAUSDT", 1.5)
+    store.update_price_nowait("BBBUSDT", 2.5)
+
+    assert store.evict_symbol_nowait("AAAUSDT") == 2
+
+    assert store.get_candle_count_nowait("AAAUSDT", "1m") == 0
+    assert store.get_price_nowait("AAAUSDT") is None
+    assert store.get_all_prices_nowait() == {"BBBUSDT": 2.5}
+    assert not [key for key in store._versions if key[0] == "AAAUSDT"]
+    assert store.get_price_nowait("BBBUSDT") == 2.5
+    assert store.get_candle_count_nowait("BBBUSDT", "1m") == 10
+
+
+def test_evicted_tensor_rows_are_reused():
+    store = MemoryStore(maxlen=8, columnar=True)
+    for i in range(4):
+        store.load_history_nowait(f"S{i}", "1m", make_candles(8))
+    tensor = store._tensors["1m"]
+    rows = len(tensor._data)
+
+    for k in range(100):  # sembol rotasyonu: her turda biri çıkar, yenisi gelir
+        store.evict_symbol_nowait(f"S{k}")
+        store.load_history_nowait(f"S{k + 4}", "1m", make_candles(8, start=k))
+
+    assert len(tensor._data) == rows
+    assert len(tensor) == 4
+    market = store.get_market_nowait("1m")
+    assert sorted(market.symbols) == [f"S{i}" for i in range(100, 104)]
+    assert not np.isnan(market.candles).any()
+
+    store.evict_symbol_nowait("S100")
+    market = store.get_market_nowait("1m")
+    assert "S100" not in market.symbols and len(market.symbols) == 3
+    assert not np.isnan(market.candles).any()
+    np.testing.assert_array_equal(
+        market.candles[market.symbols.index("S101")], store.get_candles_nowait("S101", "1m")
+    )
+
+
+def test_version_after_readd_does_not_repeat_evicted_version():
+    store = MemoryStore(maxlen=50)
+    store.load_history_nowait("AAAUSDT", "1m", make_candles(10))
+    for i in range(3):
+        store.update_candle_nowait("AAAUSDT", "1m", list(make_candles(1, start=(10 + i) * 60_000)[0]), is_closed=True)
+    before = store.get_version_nowait("AAAUSDT", "1m")
+
+    store.evict_symbol_nowait("AAAUSDT")
+    store.load_history_nowait("AAAUSDT", "1m", make_candles(10))
+
+    assert store.get_version_nowait("AAAUSDT", "1m") > before
+
+
+def test_price_table_reuses_discarded_slots():
+    table = PriceTable(capacity=2)
+    for i, sym in enumerate(["A", "B", "C"]):
+        table.set(sym, float(i), ts=1, source=0)
+    size = len(table._price)
+
+    for _ in range(50):
+        assert table.discard("B")
+        table.set("B", 9.0, ts=2, source=0)
+
+    assert len(table._price) == size
+    assert table.to_dict() == {"A": 0.0, "B": 9.0, "C": 2.0}
+    assert not table.discard("Z")
+
+    table.discard("A")
+    ids = table.symbol_ids(["D", "C"])
+    assert ids[0] == 0  # boşalan slot yeni sembole verildi
+    assert np.isnan(table.get_many(["D"])[0])
+    assert table.get("A") is None
+
+
+# ── Listeden çıkan semboldeki pozisyonlar ─────────────────────────────
+
+class _Config:
+    time_stop_hours = 24
+
+
+def test_close_symbol_closes_at_last_price():
+    store = MemoryStore()
+    closed: list[str] = []
+
+    async def _on_close(msg: str) -> None:
+        closed.append(msg)
+
+    watcher = PositionWatcher(_Config(), store, _on_close)
+    for strategy in ("s1", "s2"):
+        pos = VirtualPosition(1, "AAAUSDT", "LONG", 100.0, 110.0, 90.0, strategy=strategy)
+        watcher._positions[pos.key] = pos
+    other = VirtualPosition(2, "BBBUSDT", "SHORT", 50.0, 45.0, 55.0, strategy="s1")
+    watcher._positions[other.key] = other
+    store.update_price_nowait("AAAUSDT", 105.0)
+
+    assert asyncio.run(watcher.close_symbol("AAAUSDT")) == 2
+
+    assert watcher.tracked_symbols == {"BBBUSDT"}
+    assert len(closed) == 2
+    assert all("DELISTED" in msg and "+5.00%" in msg for msg in closed)
+    # Fiyat hiç gelmediyse giriş fiyatından kapanır
+    assert asyncio.run(watcher.close_symbol("BBBUSDT")) == 1
+    assert "+0.00%" in closed[-1]
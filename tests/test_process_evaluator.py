@@ -0,0 +1,161 @@
+"""ProcessEvaluator: süreç havuzu, süreç içi değerlendirmeyle aynı sinyalleri üretir."""
+from __future__ import annotations
+
+import asyncio
+import importlib
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from conftest import make_candles
+from core.clock import VirtualClock
+from core.config import TradingConfig
+from data.memory_store import MemoryStore
+from strategies.ema_volume_strategy import EmaVolumeStrategy
+from strategies.process_evaluator import ProcessEvaluator
+
+_TIMEFRAMES = [("1m", 60_000), ("5m", 300_000)]
+_NOW = 1_800_000_000  # saniye — sinyal zaman damgaları bu sanal andan gelir
+
+_PROBE = '''
+from strategies.base_strategy import BaseStrategy, Signal
+from strategies.ema_volume_strategy import EmaVolumeStrategy
+
+SIDE = "{side}"
+
+
+class SingleEmaVolume(EmaVolumeStrategy):
+    """Toplu API'si kapalı EmaVolume: işçide sembol bazlı yol sınansın."""
+    SUPPORTS_BATCH = False
+
+
+class Probe(BaseStrategy):
+    REQUIRED_TIMEFRAMES = ["1m"]
+
+    async def evaluate(self, symbol):
+        candles = self.store.get_candles_nowait(symbol, "1m")
+        if not len(candles):
+            return None
+        close = float(candles[-1, 4])
+        return Signal(symbol, SIDE, close, close * 0.99, close * 1.01, 1.0, 0.0, 0.0,
+                      float(candles[-1, 5]), 0.0, self._clock.now())
+'''
+
+
+def _store(symbols: list[str], columnar: bool) -> MemoryStore:
+    store = MemoryStore(maxlen=200, columnar=columnar)
+    rng = np.random.default_rng(8)
+    for symbol in symbols:
+        for tf, step in _TIMEFRAMES:
+            n = int(rng.choice([250, 250, 90, 30]))
+            candles = make_candles(n, step=step, seed=int(rng.integers(1 << 32)))
+            candles[-1, 5] *= rng.choice([1, 4, 8])  # hacim sıçramaları
+            store.load_history_nowait(symbol, tf, candles)
+        if rng.random() < 0.5:
+            store.update_price_nowait(symbol, float(candles[-1, 4]) * (1 + rng.normal() * 0.01))
+    return store
+
+
+def _sorted(signals) -> list:
+    return sorted(signals, key=lambda sig: sig.symbol)
+
+
+def _in_process(strategy, symbols: list[str]) -> list:
+    if strategy.supports_batch:
+        return _sorted(strategy.evaluate_batch(strategy.build_market(symbols)))
+
+    async def _run() -> list:
+        return [await strategy.evaluate(s) for s in symbols]
+
+    return _sorted(sig for sig in asyncio.run(_run()) if sig is not None)
+
+
+@pytest.fixture
+def probe_module(tmp_path, monkeypatch):
+    """İşçilerin de import edebileceği geçici strateji modülü (spawn sys.path'i kopyalar)."""
+    path = tmp_path / "pe_probe_strategies.py"
+    path.write_text(_PROBE.format(side="LONG"), encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module("pe_probe_strategies")
+    yield module, path
+    sys.modules.pop("pe_probe_strategies", None)
+
+
+def _evaluator(store: MemoryStore) -> ProcessEvaluator:
+    return ProcessEvaluator(TradingConfig(), store, processes=2, clock=VirtualClock(start=_NOW))
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_pool_matches_batch_and_survives_block_growth(columnar):
+    symbols = [f"S{i}USDT" for i in range(240)]
+    store = _store(symbols, columnar)
+    strategy = EmaVolumeStrategy(TradingConfig(), store)
+    strategy.attach_clock(VirtualClock(start=_NOW))
+    evaluator = _evaluator(store)
+
+    async def _run() -> tuple[list, list, str, str]:
+        small = await evaluator.evaluate(strategy, symbols[:8])
+        first_block = evaluator._blocks["1m"].shm.name
+        # 8 sembollük blok yetmez → yenisi açılır, işçiler eski bağlantıyı bırakıp yeniye bağlanır
+        full = await evaluator.evaluate(strategy, symbols)
+        return small, full, first_block, evaluator._blocks["1m"].shm.name
+
+    try:
+        small, full, first_block, second_block = asyncio.run(_run())
+    finally:
+        evaluator.close()
+
+    assert second_block != first_block
+    assert _sorted(small) == _in_process(strategy, symbols[:8])
+    expected = _in_process(strategy, symbols)
+    assert expected  # karşılaştırma boş kümeler üzerinde olmasın
+    assert _sorted(full) == expected
+
+
+def test_pool_matches_per_symbol_evaluate(probe_module):
+    module, _path = probe_module
+    symbols = [f"S{i}USDT" for i in range(60)]
+    store = _store(symbols, columnar=False)
+    strategy = module.SingleEmaVolume(TradingConfig(), store)
+    strategy.attach_clock(VirtualClock(start=_NOW))
+    assert not strategy.supports_batch
+    evaluator = _evaluator(store)
+
+    try:
+        pooled = asyncio.run(evaluator.evaluate(strategy, symbols))
+    finally:
+        evaluator.close()
+
+    expected = _in_process(strategy, symbols)
+    assert expected
+    assert _sorted(pooled) == expected
+
+
+def test_invalidate_reloads_strategy_modules_in_workers(probe_module):
+    module, path = probe_module
+    symbols = ["AAAUSDT", "BBBUSDT", "CCCUSDT"]
+    store = _store(symbols, columnar=False)
+    strategy = module.Probe(TradingConfig(), store)
+    evaluator = _evaluator(store)
+
+    def _rewrite(side: str) -> None:
+        path.write_text(_PROBE.format(side=side), encoding="utf-8")
+        # Aynı saniyede yeniden yazılan kaynağın eski .pyc'si kullanılmasın
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+
+    async def _run() -> list[set[str]]:
+        sides = [{sig.side for sig in await evaluator.evaluate(strategy, symbols)}]
+        _rewrite("SHORT")
+        evaluator.invalidate(TradingConfig())
+        sides.append({sig.side for sig in await evaluator.evaluate(strategy, symbols)})
+        return sides
+
+    try:
+        sides = asyncio.run(_run())
+    finally:
+        evaluator.close()
+
+    assert sides == [{"LONG"}, {"SHORT"}]
@@ -0,0 +1,128 @@
+"""Kaydedici → replay: aynı kayıt VirtualClock ile her oynatmada aynı sinyalleri üretir."""
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+import data.feed_recorder as feed_recorder
+from backtest.replay import compare_signals, run_replay
+from conftest import make_candles
+from core.config import TradingConfig
+from data.feed_recorder import FeedRecorder, iter_feed
+from data.kline_cache import KlineCache
+
+_MIN = 60_000
+_T0 = 1_790_002_800_000  # saat başına hizalı kayıt başlangıcı
+_SYMBOLS = [f"S{i}USDT" for i in range(12)]
+_MINUTES = 45
+
+
+def _kline(symbol: str, t: int, bar: list[float], closed: bool) -> str:
+    o, h, l, c, v = bar
+    return json.dumps({
+        "stream": f"{symbol.lower()}@kline_1m",
+        "data": {"e": "kline", "E": 0, "s": symbol, "k": {
+            "t": t, "T": t + _MIN - 1, "s": symbol, "i": "1m",
+            "o": str(o), "c": str(c), "h": str(h), "l": str(l), "v": str(round(v, 3)), "x": closed,
+        }},
+    }, separators=(",", ":"))
+
+
+def _write_history(cache_dir) -> dict[str, float]:
+    """Kayıt öncesi 1m/5m geçmişi kline önbelleğine yazar (preload ağa çıkmaz)."""
+    cache = KlineCache(cache_dir)
+    last = {}
+    n = 300 * 5
+    for i, symbol in enumerate(_SYMBOLS):
+        one = make_candles(n, start=_T0 - n * _MIN, step=_MIN, seed=i, scale=0.1)
+        cache.write(symbol, "1m", one, int(one[0, 0]), _T0)
+        five = np.array([
+            [b[0, 0], b[0, 1], b[:, 2].max(), b[:, 3].min(), b[-1, 4], b[:, 5].sum()]
+            for b in (one[k:k + 5] for k in range(0, n, 5))
+        ])
+        cache.write(symbol, "5m", five, int(one[0, 0]), _T0)
+        last[symbol] = float(one[-1, 4])
+    return last
+
+
+def _record_feed(feed_dir, price: dict[str, float], rng: np.random.Generator, monkeypatch) -> None:
+    """Sentetik borsa akışını FeedRecorder.record() ile kaydeder (alım zamanı sahte saatten)."""
+    now_ns = [0]
+    monkeypatch.setattr(feed_recorder.time, "time_ns", lambda: now_ns[0])
+    recorder = FeedRecorder(feed_dir, segment_minutes=20)
+    recorder.start()
+    for m in range(_MINUTES):
+        t = _T0 + m * _MIN
+        bars = {s: [price[s]] * 4 + [0.0] for s in _SYMBOLS}
+        spike = {s: rng.random() < 0.08 for s in _SYMBOLS}
+        for sec in range(0, 60, 5):
+            base_ns = (t + sec * 1000) * 1_000_000
+            for j, symbol in enumerate(_SYMBOLS):
+                bar = bars[symbol]
+                p = bar[3] + rng.normal() * 0.1
+                bar[1], bar[2], bar[3] = max(bar[1], p), min(bar[2], p), p
+                bar[4] += rng.random() * 10 * (8 if spike[symbol] else 1)
+                now_ns[0] = base_ns + j * 1000
+                recorder.record("kline", _kline(symbol, t, bar, sec == 55))
+            now_ns[0] = base_ns + 500_000
+            recorder.record("markprice", json.dumps(
+                [{"s": s, "p": str(bars[s][3]), "E": t + sec * 1000} for s in _SYMBOLS]
+            ))
+        for symbol in _SYMBOLS:
+            price[symbol] = bars[symbol][3]
+    recorder.stop()
+
+
+@pytest.fixture(scope="module")
+def recorded(tmp_path_factory):
+    root = tmp_path_factory.mktemp("replay")
+    rng = np.random.default_rng(3)
+    price = _write_history(root / "cache")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        _record_feed(root / "feed", price, rng, monkeypatch)
+    config = replace(
+        TradingConfig(),
+        active_strategy="ema_volume_strategy.EmaVolumeStrategy",
+        kline_cache_dir=str(root / "cache"),
+        ws_kline_timeframes=["1m"],
+        resample_from_1m=True,
+        scan_mode="event",
+        db_url=f"sqlite+aiosqlite:///{root / 'replay.db'}",
+    )
+    return root / "feed", config
+
+
+def test_recorder_keeps_frames_in_receive_order(recorded):
+    feed_dir, _config = recorded
+    frames = list(iter_feed(feed_dir))
+
+    assert len(frames) == _MINUTES * 12 * (len(_SYMBOLS) + 1)
+    assert len(list(feed_dir.glob("*.gz"))) == 3  # 20 dakikalık segmentler
+    times = [recv_ns for recv_ns, _stream, _raw in frames]
+    assert times == sorted(times)
+    assert times[0] == _T0 * 1_000_000
+
+
+def test_replay_is_deterministic(recorded):
+    feed_dir, config = recorded
+
+    first = asyncio.run(run_replay(config, feed_dir, speed=0))
+    second = asyncio.run(run_replay(config, feed_dir, speed=0))
+
+    assert first  # karşılaştırma boş kümeler üzerinde olmasın
+    assert second == first
+    # Sinyal zamanları duvar saatinden değil kayıttaki alım zamanından gelir
+    assert all(sig["timestamp"].startswith("2026-09-21") for sig in first)
+
+
+def test_replay_speed_does_not_change_signals(recorded):
+    feed_dir, config = recorded
+
+    fast = asyncio.run(run_replay(config, feed_dir, speed=0))
+    paced = asyncio.run(run_replay(config, feed_dir, speed=3000))
+
+    assert compare_signals(paced, fast) == {"matched": len(fast), "only_current": [], "only_baseline": []}
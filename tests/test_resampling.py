@@ -0,0 +1,112 @@
+"""1m akışından türetilen yüksek timeframe mumları ↔ REST klines (Binance toplaması)."""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from conftest import make_candles
+from data.memory_store import MemoryStore, timeframe_ms
+
+_MIN = 60_000
+# 2024-01-01 00:00 UTC — tüm kovaların başına hizalı
+_T0 = 1_704_067_200_000
+
+
+def _rest_klines(minutes: np.ndarray, timeframe: str) -> np.ndarray:
+    """Binance'in /klines ile döndürdüğü toplamayla aynı referans OHLCV."""
+    step = timeframe_ms(timeframe)
+    buckets = minutes[:, 0] - minutes[:, 0] % step
+    out = []
+    for bucket in np.unique(buckets):
+        rows = minutes[buckets == bucket]
+        out.append([bucket, rows[0, 1], rows[:, 2].max(), rows[:, 3].min(), rows[-1, 4], rows[:, 5].sum()])
+    return np.array(out)
+
+
+def _stream(store: MemoryStore, minutes: np.ndarray, ticks: int = 2) -> None:
+    """Her dakikayı önce açık (kısmi) güncellemeler, sonra kapanış olarak yollar."""
+    for row in minutes:
+        for k in range(1, ticks + 1):
+            partial = row.copy()
+            partial[4] = row[1] + (row[4] - row[1]) * k / (ticks + 1)
+            partial[5] = row[5] * k / (ticks + 1)
+            store.update_candle_nowait("AAAUSDT", "1m", list(partial), is_closed=False)
+        store.update_candle_nowait("AAAUSDT", "1m", list(row), is_closed=True)
+
+
+@pytest.mark.parametrize("timeframe", ["5m", "15m", "1h"])
+def test_streamed_buckets_match_rest_klines(timeframe):
+    store = MemoryStore(maxlen=500)
+    store.enable_resampling([timeframe])
+    minutes = make_candles(180, _T0, seed=1)
+
+    _stream(store, minutes)
+
+    np.testing.assert_allclose(
+        store.get_candles_nowait("AAAUSDT", timeframe), _rest_klines(minutes, timeframe), rtol=1e-12
+    )
+
+
+def test_first_bucket_is_seeded_from_1m_history():
+    store = MemoryStore(maxlen=500)
+    store.enable_resampling(["15m"])
+    minutes = make_candles(60, _T0, seed=2)
+    # Açılışta 15m geçmişi REST'ten, kovanın ilk 7 dakikası ise 1m geçmişinden gelir
+    rest_15m = _rest_klines(minutes, "15m")
+    store.load_history_nowait("AAAUSDT", "15m", rest_15m[:1])
+    store.load_history_nowait("AAAUSDT", "1m", minutes[:22])
+
+    _stream(store, minutes[22:])
+
+    np.testing.assert_allclose(store.get_candles_nowait("AAAUSDT", "15m"), rest_15m, rtol=1e-12)
+
+
+def test_open_bucket_tracks_partial_aggregate():
+    store = MemoryStore(maxlen=500)
+    store.enable_resampling(["5m"])
+    events: list[tuple[float, bool]] = []
+    store.add_candle_listener(
+        lambda sym, tf, candle, closed: events.append((candle[0], closed)) if tf == "5m" else None
+    )
+    minutes = make_candles(8, _T0, seed=3)
+
+    _stream(store, minutes[:5])
+    # Kovanın son dakikasının kapanış mesajı tekrar gelirse kova iki kez sayılmaz
+    store.update_candle_nowait("AAAUSDT", "1m", list(minutes[4]), is_closed=True)
+    _stream(store, minutes[5:])
+
+    live = store.get_candles_nowait("AAAUSDT", "5m")
+    rest = _rest_klines(minutes, "5m")
+    np.testing.assert_allclose(live[0], rest[0], rtol=1e-12)
+    # Açık kova, şimdiye kadarki dakikaların toplamıdır
+    np.testing.assert_allclose(live[-1], rest[-1], rtol=1e-12)
+    assert len(live) == 2
+    assert {ts for ts, closed in events if closed} == {_T0}
+
+
+
+def test_bucket_with_lost_final_close_frame_is_closed_by_next_bucket():
+    store = MemoryStore(maxlen=500)
+    store.enable_resampling(["5m"])
+    events: list[tuple[float, bool]] = []
+    store.add_candle_listener(
+        lambda sym, tf, candle, closed: events.append((candle[0], closed)) if tf == "5m" else None
+    )
+    minutes = make_candles(10, _T0, seed=4)
+
+    _stream(store, minutes[:4])
+    # Kovanın son dakikası yalnızca açık güncellemeyle gelir, kapanış mesajı kaybolur
+    last_tick = minutes[4].copy()
+    last_tick[4], last_tick[5] = (last_tick[1] + last_tick[4]) / 2, last_tick[5] / 2
+    store.update_candle_nowait("AAAUSDT", "1m", list(last_tick), is_closed=False)
+    assert not any(closed for _ts, closed in events)
+    _stream(store, minutes[5:])
+
+    live = store.get_candles_nowait("AAAUSDT", "5m")
+    seen = minutes.copy()
+    seen[4] = last_tick
+    np.testing.assert_allclose(live, _rest_klines(seen, "5m"), rtol=1e-12)
+    # Eski kova, yeni kovanın ilk mesajından önce kapalı olarak bildirilir
+    closes = [ts for ts, closed in events if closed]
+    assert closes == [_T0, _T0 + 5 * _MIN]
+    assert events.index((_T0, True)) < events.index((_T0 + 5 * _MIN, False))
@@ -0,0 +1,138 @@
+"""data.rest_client — sayfalı aralık çekimi: sayfa sınırları, tekilleştirme, yeniden deneme ve iptal."""
+import asyncio
+
+import numpy as np
+import pytest
+
+import data.rest_client as rc
+from conftest import make_candles
+
+STEP = 60_000
+PAGE = rc._PAGE_LIMIT * STEP
+T0 = 1_699_980_000_000   # dakika başına hizalı
+
+
+class FakeKlines:
+    """request_klines yerine geçer: sabit sentetik geçmişten [start, end] aralığını döndürür."""
+
+    def __init__(self, pages=5, overlap=0):
+        self.history = make_candles(pages * rc._PAGE_LIMIT + 10, start=T0 - 5 * STEP, seed=4)
+        self.overlap = overlap
+        self.calls = []
+        self.fail = {}          # {start_ms: kalan hata sayısı}
+        self.gate = None        # asyncio.Event — verilirse ilk sayfa dışındakiler bekler
+        self.cancelled = 0
+
+    async def __call__(self, session, symbol, interval="1m", limit=1000, start_ms=None, end_ms=None, budget=None):
+        self.calls.append((start_ms, end_ms, limit))
+        try:
+            if self.gate is not None and len(self.calls) > 1:
+                await self.gate.wait()
+            await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail.get(start_ms):
+            self.fail[start_ms] -= 1
+            raise RuntimeError("HTTP 502")
+        ts = self.history[:, 0]
+        # overlap > 0 → borsa sayfa sınırının iki yanından fazladan mum döndürür
+        lo, hi = start_ms - self.overlap * STEP, end_ms + self.overlap * STEP
+        return self.history[(ts >= lo) & (ts <= hi)][:limit + 2 * self.overlap]
+
+    def expected(self, start_ms, end_ms):
+        ts = self.history[:, 0]
+        return self.history[(ts >= start_ms) & (ts < end_ms)]
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    fake = FakeKlines()
+    monkeypatch.setattr(rc, "request_klines", fake)
+    return fake
+
+
+def _fetch(start_ms, end_ms, **kwargs):
+    return asyncio.run(rc.fetch_klines_range(None, "BTCUSDT", "1m", start_ms, end_ms, **kwargs))
+
+
+def test_overlapping_pages_are_deduplicated(fake):
+    fake.overlap = 3
+    end = T0 + 3 * PAGE + 17 * STEP
+
+    rows = _fetch(T0, end, max_concurrent=2)
+
+    np.testing.assert_array_equal(rows, fake.expected(T0, end))
+    assert (np.diff(rows[:, 0]) == STEP).all()
+    # Sayfalar tam sınırlarda bölünür, son sayfa aralığın sonunda biter
+    assert [(lo, hi) for lo, hi, _limit in fake.calls] == [
+        (T0, T0 + PAGE - 1), (T0 + PAGE, T0 + 2 * PAGE - 1),
+        (T0 + 2 * PAGE, T0 + 3 * PAGE - 1), (T0 + 3 * PAGE, end - 1),
+    ]
+
+
+def test_unaligned_start_aligns_later_pages_to_candles(fake):
+    start = T0 + 250 * STEP + 30_000   # mum ortası
+    end = T0 + 2 * PAGE + 300 * STEP
+
+    rows = _fetch(start, end)
+
+    np.testing.assert_array_equal(rows, fake.expected(start, end))
+    assert rows[0, 0] == T0 + 251 * STEP
+    # İlk sayfa istenen andan başlar; sonrakiler mum başına hizalı 1000'er mumluk adımlarla
+    first = T0 + 250 * STEP
+    assert [lo for lo, _hi, _limit in fake.calls] == [start, first + PAGE, first + 2 * PAGE]
+
+
+def test_failed_page_is_retried(fake, monkeypatch):
+    delays = []
+    real_sleep = asyncio.sleep
+
+    async def _sleep(delay, *args):
+        delays.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(rc.asyncio, "sleep", _sleep)
+    fake.fail[T0 + PAGE] = 2
+    end = T0 + 3 * PAGE
+
+    rows = _fetch(T0, end)
+
+    np.testing.assert_array_equal(rows, fake.expected(T0, end))
+    assert [lo for lo, _hi, _limit in fake.calls].count(T0 + PAGE) == 3
+    assert [d for d in delays if d] == [1, 2]   # üstel bekleme
+
+
+def test_page_failing_every_retry_raises(fake, monkeypatch):
+    real_sleep = asyncio.sleep
+    monkeypatch.setattr(rc.asyncio, "sleep", lambda delay, *args: real_sleep(0))
+    fake.fail[T0] = 10
+
+    async def run():
+        return [
+            rows async for _lo, _hi, rows in rc.iter_klines_range(
+                None, "BTCUSDT", "1m", T0, T0 + 2 * PAGE, retries=1
+            )
+        ]
+
+    with pytest.raises(RuntimeError, match="502"):
+        asyncio.run(run())
+    assert [lo for lo, _hi, _limit in fake.calls].count(T0) == 2
+
+
+def test_early_exit_cancels_pending_pages(fake):
+    fake.gate = asyncio.Event()   # ilk sayfa dışındakiler askıda kalır
+
+    async def run():
+        pages = rc.iter_klines_range(None, "BTCUSDT", "1m", T0, T0 + 5 * PAGE, max_concurrent=3)
+        lo, _hi, rows = await anext(pages)
+        await pages.aclose()
+        await asyncio.sleep(0)
+        return lo, len(rows)
+
+    lo, n = asyncio.run(run())
+
+    assert (lo, n) == (T0, rc._PAGE_LIMIT)
+    # En fazla max_concurrent sayfa istenmiştir; uçuştaki iki sayfa iptal edilir
+    assert len(fake.calls) == 3
+    assert fake.cancelled == 2
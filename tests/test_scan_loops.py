@@ -0,0 +1,133 @@
+"""main.strategy_event_loop: kapanış olaylarının gruplanması, timeframe süzgeci ve cooldown'lar."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+
+import pytest
+
+import main
+from core.clock import VirtualClock
+from core.config import TradingConfig
+from data.memory_store import MemoryStore
+from execution.position_watcher import PositionWatcher
+from strategies.base_strategy import BaseStrategy, Signal
+
+_MIN = 60_000
+_T0 = 1_800_000_000_000
+
+
+class _Recording(BaseStrategy):
+    """Her toplu değerlendirmede sembolleri kaydeder ve hepsi için sinyal üretir."""
+    REQUIRED_TIMEFRAMES = ["1m", "5m"]
+    SUPPORTS_BATCH = True
+
+    def __init__(self, config, store) -> None:
+        super().__init__(config, store)
+        self.batches: list[list[str]] = []
+
+    async def evaluate(self, symbol: str):
+        return None
+
+    def evaluate_batch(self, market):
+        symbols = next(iter(market.values())).symbols
+        self.batches.append(sorted(symbols))
+        return [
+            Signal(s, "LONG", 1.0, 0.9, 1.1, 3.0, 0.0, 0.0, 1.0, 1.0, self._clock.now())
+            for s in symbols
+        ]
+
+
+class _OnOneMinute(_Recording):
+    INVALIDATING_TIMEFRAMES = ["1m"]
+
+
+class _OnFiveMinute(_Recording):
+    INVALIDATING_TIMEFRAMES = ["5m"]
+
+
+class _Dispatcher:
+    def __init__(self) -> None:
+        self.sent: list[tuple[str, str]] = []
+
+    async def dispatch(self, sig: Signal) -> None:
+        self.sent.append((sig.strategy, sig.symbol))
+
+
+def _close(store: MemoryStore, symbol: str, tf: str, ts: int, closed: bool = True) -> None:
+    store.update_candle_nowait(symbol, tf, [ts, 1.0, 1.0, 1.0, 1.0, 1.0], is_closed=closed)
+
+
+def test_event_loop_batches_filters_and_cools_down():
+    async def run():
+        config = replace(TradingConfig(), cooldown_minutes=30, max_tracked_signals=10)
+        clock = VirtualClock(start=_T0 / 1000)
+        store = MemoryStore(maxlen=20)
+        one, five = _OnOneMinute(config, store), _OnFiveMinute(config, store)
+        for strategy in (one, five):
+            strategy.attach_clock(clock)
+        dispatcher = _Dispatcher()
+        watcher = PositionWatcher(config, store, clock=clock)
+        symbols = ["AUSDT", "BUSDT", "CUSDT", "DUSDT"]
+        loop = asyncio.create_task(main.strategy_event_loop(
+            config, [one, five], dispatcher, watcher, store, symbols, clock=clock
+        ))
+        await asyncio.sleep(0)
+
+        async def _settle() -> None:
+            for _ in range(5):
+                await asyncio.sleep(0)
+
+        # 1) Aynı anda kapanan üç 1m mumu tek turda; açık mum ve listede olmayan sembol olay değildir
+        for symbol in ("AUSDT", "BUSDT", "CUSDT"):
+            _close(store, symbol, "1m", _T0)
+        _close(store, "DUSDT", "1m", _T0, closed=False)
+        _close(store, "ZUSDT", "1m", _T0)
+        await _settle()
+        steps = [(list(one.batches), list(five.batches), list(dispatcher.sent))]
+
+        # 2) Cooldown içinde A tekrar kapanır → atlanır; 5m kapanışı sadece 5m stratejisini tetikler
+        await clock.advance(10 * 60)
+        _close(store, "AUSDT", "1m", _T0 + _MIN)
+        _close(store, "BUSDT", "5m", _T0)
+        await _settle()
+        steps.append((list(one.batches), list(five.batches), list(dispatcher.sent)))
+
+        # 3) Cooldown dolduktan sonra A yeniden değerlendirilir
+        await clock.advance(25 * 60)
+        _close(store, "AUSDT", "1m", _T0 + 2 * _MIN)
+        await _settle()
+        steps.append((list(one.batches), list(five.batches), list(dispatcher.sent)))
+
+        loop.cancel()
+        await asyncio.gather(loop, return_exceptions=True)
+        return steps, store._listeners
+
+    steps, listeners = asyncio.run(run())
+
+    one_name, five_name = _OnOneMinute.__name__, _OnFiveMinute.__name__
+    assert steps[0] == (
+        [["AUSDT", "BUSDT", "CUSDT"]],
+        [],
+        [(one_name, "AUSDT"), (one_name, "BUSDT"), (one_name, "CUSDT")],
+    )
+    assert steps[1][0] == steps[0][0]
+    assert steps[1][1] == [["BUSDT"]]
+    assert steps[1][2][-1] == (five_name, "BUSDT")
+    assert steps[2][0][-1] == ["AUSDT"]
+    assert steps[2][2][-1] == (one_name, "AUSDT")
+    assert listeners == []  # iptalde dinleyici kaldırılır
+
+
+@pytest.mark.parametrize("mode, expected", [
+    ("interval", main.strategy_scan_loop),
+    ("event", main.strategy_event_loop),
+    (" Event ", main.strategy_event_loop),
+])
+def test_select_scan_loop(mode, expected):
+    assert main.select_scan_loop(replace(TradingConfig(), scan_mode=mode)) is expected
+
+
+def test_unknown_scan_mode_is_rejected():
+    with pytest.raises(ValueError, match="events"):
+        main.select_scan_loop(replace(TradingConfig(), scan_mode="events"))
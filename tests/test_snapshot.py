@@ -0,0 +1,77 @@
+"""Disk snapshot'ı: MemoryStore → diske → yeni MemoryStore gidiş-dönüşü."""
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+
+from conftest import make_candles
+from data.memory_store import MemoryStore
+from data.snapshot import load_snapshot, save_snapshot
+
+
+def _filled_store(maxlen: int = 20) -> MemoryStore:
+    store = MemoryStore(maxlen=maxlen)
+    store.load_history_nowait("AAAUSDT", "1m", make_candles(7, seed=1))             # kısmi
+    store.load_history_nowait("AAAUSDT", "5m", make_candles(20, step=300_000, seed=2))  # tam
+    store.load_history_nowait("BBBUSDT", "1m", make_candles(15, seed=3))
+    # Halkayı sardır: başı dizinin ortasında olan tampon
+    for row in make_candles(12, start=15 * 60_000, seed=4):
+        store.update_candle_nowait("BBBUSDT", "1m", list(row), is_closed=True)
+    store.update_price_nowait("AAAUSDT", 101.5)
+    store.update_price_nowait("BBBUSDT", 55.25)
+    return store
+
+
+_KEYS = [("AAAUSDT", "1m"), ("AAAUSDT", "5m"), ("BBBUSDT", "1m")]
+
+
+def test_round_trip_restores_candles_and_prices(tmp_path):
+    store = _filled_store()
+    asyncio.run(save_snapshot(store, tmp_path))
+
+    restored = MemoryStore(maxlen=20)
+    saved_at = load_snapshot(restored, tmp_path)
+
+    assert saved_at is not None
+    for symbol, tf in _KEYS:
+        np.testing.assert_array_equal(
+            restored.get_candles_nowait(symbol, tf), store.get_candles_nowait(symbol, tf)
+        )
+    assert restored.get_all_prices_nowait() == {"AAAUSDT": 101.5, "BBBUSDT": 55.25}
+
+
+def test_load_filters_symbols_and_keeps_latest_file(tmp_path):
+    store = _filled_store()
+    asyncio.run(save_snapshot(store, tmp_path))
+    store.update_candle_nowait("AAAUSDT", "1m", list(make_candles(1, start=7 * 60_000)[0]), is_closed=True)
+    asyncio.run(save_snapshot(store, tmp_path))
+
+    assert len(list(tmp_path.glob("candles-*.npy"))) == 1
+    restored = MemoryStore(maxlen=20)
+    load_snapshot(restored, tmp_path, symbols=["AAAUSDT"])
+
+    assert restored.get_candle_count_nowait("AAAUSDT", "1m") == 8
+    assert restored.get_candle_count_nowait("BBBUSDT", "1m") == 0
+    assert restored.get_price_nowait("BBBUSDT") is None
+
+
+def test_smaller_store_keeps_newest_candles(tmp_path):
+    store = _filled_store(maxlen=20)
+    asyncio.run(save_snapshot(store, tmp_path))
+
+    restored = MemoryStore(maxlen=5)
+    load_snapshot(restored, tmp_path)
+
+    np.testing.assert_array_equal(
+        restored.get_candles_nowait("BBBUSDT", "1m"), store.get_candles_nowait("BBBUSDT", "1m")[-5:]
+    )
+
+
+def test_missing_or_corrupt_snapshot_is_ignored(tmp_path):
+    store = MemoryStore()
+    assert load_snapshot(store, tmp_path) is None
+
+    (tmp_path / "header.json").write_text("{not json", encoding="utf-8")
+    assert load_snapshot(store, tmp_path) is None
+    assert store.get_all_prices_nowait() == {}
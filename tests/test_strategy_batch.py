@@ -0,0 +1,80 @@
+"""Stratejiler: sembol bazlı evaluate() ile evaluate_batch() aynı sinyalleri üretir."""
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from conftest import make_candles
+from core.config import TradingConfig
+from data.memory_store import MemoryStore
+from strategies.base_strategy import BaseStrategy
+from strategies.ema_volume_strategy import EmaVolumeStrategy
+from strategies.rsi_macd_strategy import RsiMacdStrategy
+from strategies.volatility_ema_strategy import VolatilityEmaStrategy
+
+_TIMEFRAMES = [("1m", 60_000), ("5m", 300_000), ("15m", 900_000)]
+
+
+def _store(columnar: bool, symbols: list[str]) -> MemoryStore:
+    store = MemoryStore(maxlen=200, columnar=columnar)
+    rng = np.random.default_rng(5)
+    for symbol in symbols:
+        for tf, step in _TIMEFRAMES:
+            # Kısa geçmişli (ısınmamış) semboller de karışık olsun
+            n = int(rng.choice([250, 250, 120, 45, 20]))
+            candles = make_candles(n, step=step, seed=int(rng.integers(1 << 32)))
+            candles[-1, 5] *= rng.choice([1, 4, 8])  # hacim sıçramaları
+            store.load_history_nowait(symbol, tf, candles)
+        if rng.random() < 0.5:
+            store.update_price_nowait(symbol, 100 + rng.normal())
+    return store
+
+
+def _key(sig) -> tuple:
+    return (
+        sig.symbol, sig.side, sig.entry_price, sig.sl_price, sig.tp_price, sig.spike_ratio,
+        sig.ema_fast_value, sig.ema_slow_value, sig.current_volume, sig.avg_volume,
+    )
+
+
+_STRATEGIES = {
+    "ema_volume": lambda config, store: EmaVolumeStrategy(config, store),
+    # Eşikler gevşetildi → rastgele veride de sinyal çıksın
+    "rsi_macd": lambda config, store: RsiMacdStrategy(
+        config, store, rsi_oversold=60, rsi_overbought=40
+    ),
+    "volatility_ema": lambda config, store: VolatilityEmaStrategy(config, store),
+}
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+@pytest.mark.parametrize("name", sorted(_STRATEGIES))
+def test_evaluate_batch_matches_evaluate(name, columnar):
+    symbols = [f"S{i}USDT" for i in range(300)]
+    store = _store(columnar, symbols)
+    strategy = _STRATEGIES[name](TradingConfig(), store)
+    assert strategy.supports_batch
+
+    async def _single() -> list:
+        return [await strategy.evaluate(s) for s in symbols]
+
+    single = sorted(_key(sig) for sig in asyncio.run(_single()) if sig is not None)
+    batch = sorted(_key(sig) for sig in strategy.evaluate_batch(strategy.build_market(symbols)))
+
+    assert single  # karşılaştırma boş kümeler üzerinde olmasın
+    assert batch == single
+
+
+class _SingleOnly(BaseStrategy):
+    REQUIRED_TIMEFRAMES = ["1m"]
+
+    async def evaluate(self, symbol: str):
+        return None
+
+
+def test_batch_is_opt_in():
+    strategy = _SingleOnly(TradingConfig(), MemoryStore())
+    assert not strategy.supports_batch
+    assert strategy.evaluate_batch({}) == []
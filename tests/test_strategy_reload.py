@@ -0,0 +1,118 @@
+"""Sıcak yeniden yükleme: stratejiler tek adımda değişir, hatalı modül eski seti korur, store'a dokunulmaz."""
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+import main
+import strategies
+from conftest import make_candles
+from core.config import TradingConfig
+from data.memory_store import MemoryStore
+from strategies.indicator_cache import IndicatorCache
+from strategies.indicator_engine import IndicatorEngine
+from strategies.loader import load_strategies
+
+_MODULE = "tmp_reload_strategy"
+_SYMBOLS = ["AAAUSDT", "BBBUSDT"]
+
+_SOURCE = '''
+from strategies.base_strategy import BaseStrategy
+from strategies.indicators import StreamingEma
+
+VERSION = {version}
+
+
+class Probe(BaseStrategy):
+    REQUIRED_TIMEFRAMES = ["1m"]
+
+    def streaming_indicators(self):
+        return {{"ema": ("1m", lambda: StreamingEma(5))}}
+
+    async def evaluate(self, symbol):
+        return None
+
+
+class Other(BaseStrategy):
+    REQUIRED_TIMEFRAMES = ["1m"]
+
+    async def evaluate(self, symbol):
+        return None
+'''
+
+
+@pytest.fixture
+def module_file(tmp_path, monkeypatch):
+    """strategies paketine geçici bir modül dizini ekler; yeniden yazma .pyc'yi geçersiz kılar."""
+    monkeypatch.setattr(strategies, "__path__", [*strategies.__path__, str(tmp_path)])
+    path = tmp_path / f"{_MODULE}.py"
+    stamp = [1_000_000_000 * 10**9]
+
+    def write(source: str) -> None:
+        path.write_text(source, encoding="utf-8")
+        stamp[0] += 5_000_000_000
+        os.utime(path, ns=(stamp[0], stamp[0]))
+
+    write(_SOURCE.format(version=1))
+    yield write
+    sys.modules.pop(f"strategies.{_MODULE}", None)
+
+
+def _state(store: MemoryStore) -> dict:
+    return {
+        "candles": {s: store.get_candles_nowait(s, "1m").copy() for s in _SYMBOLS},
+        "versions": {s: store.get_version_nowait(s, "1m") for s in _SYMBOLS},
+        "prices": store.get_all_prices_nowait(),
+    }
+
+
+def test_reload_swaps_atomically_and_keeps_old_set_on_failure(module_file, monkeypatch):
+    config = replace(TradingConfig(), active_strategy=f"{_MODULE}.Probe,{_MODULE}.Other")
+    monkeypatch.setattr(main, "reload_config", lambda: config)
+    store = MemoryStore(maxlen=100)
+    for i, symbol in enumerate(_SYMBOLS):
+        store.load_history_nowait(symbol, "1m", make_candles(60, seed=i))
+        store.update_price_nowait(symbol, 100.0 + i)
+    engine, cache = IndicatorEngine(store), IndicatorCache()
+    running = load_strategies(config, store)
+    for strategy in running:
+        strategy.attach_indicator_engine(engine)
+    before = _state(store)
+
+    def _reload() -> bool:
+        return asyncio.run(main._reload_strategies(
+            running, store, _SYMBOLS, {"1m"}, engine, cache, None, "test",
+        ))
+
+    # Başarılı yükleme: liste nesnesi aynı, içeriği yeni sürümün örnekleri
+    module_file(_SOURCE.format(version=2))
+    old = list(running)
+    assert _reload()
+    assert [type(s).__name__ for s in running] == ["Probe", "Other"]
+    assert all(new is not prev for new, prev in zip(running, old))
+    assert sys.modules[f"strategies.{_MODULE}"].VERSION == 2
+    assert set(engine._owners.values()) == {running[0]}
+    current = list(running)
+
+    broken = [
+        _SOURCE.format(version=3) + "\ndef oops(:\n",                       # sözdizimi hatası
+        _SOURCE.format(version=3).replace("class Other(BaseStrategy)", "class Other"),  # BaseStrategy değil
+        _SOURCE.format(version=3).replace("class Other(", "class Renamed("),  # ikinci sınıf yok
+    ]
+    for source in broken:
+        module_file(source)
+        assert not _reload()
+        # Yarım yükleme yok: iki strateji de çalışan eski örnekler olarak kalır
+        assert running == current
+        assert set(engine._owners.values()) == {current[0]}
+
+    after = _state(store)
+    for symbol in _SYMBOLS:
+        np.testing.assert_array_equal(after["candles"][symbol], before["candles"][symbol])
+    assert after["versions"] == before["versions"]
+    assert after["prices"] == before["prices"]
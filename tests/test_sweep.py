@@ -0,0 +1,79 @@
+"""backtest.sweep — ızgara açılımı, sıralama ve memory map ile işçiye aktarılan veri ↔ seri BacktestEngine."""
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+import backtest.sweep as sweep
+from backtest.engine import BacktestEngine
+from conftest import make_candles
+from core.config import TradingConfig
+
+_STRATEGY = "ema_volume_strategy.EmaVolumeStrategy"
+_T0 = 1_699_999_200_000  # saat başına hizalı
+_GRID = {"volume_spike_min": [2.0, 2.8], "rr_ratio": [1.2, 2.0]}
+
+
+@pytest.fixture(scope="module")
+def data():
+    data = {}
+    for i in range(3):
+        candles = make_candles(3000, start=_T0, seed=i, scale=0.3)
+        candles[::37, 5] *= 6  # düzenli hacim sıçramaları → her kombinasyonda işlem
+        data[f"S{i}USDT"] = candles
+    return data
+
+
+def _serial(data, params):
+    result = BacktestEngine(replace(TradingConfig(), **params), _STRATEGY).run(data).summary()
+    return {**params, **{m: result[m] for m in sweep.METRICS}}
+
+
+def test_expand_grid_is_cartesian_and_skips_unordered_pairs():
+    assert sweep.expand_grid(_GRID) == [
+        {"volume_spike_min": 2.0, "rr_ratio": 1.2}, {"volume_spike_min": 2.0, "rr_ratio": 2.0},
+        {"volume_spike_min": 2.8, "rr_ratio": 1.2}, {"volume_spike_min": 2.8, "rr_ratio": 2.0},
+    ]
+    assert sweep.expand_grid({"ema_fast": [9, 21], "ema_slow": [21, 34]}) == [
+        {"ema_fast": 9, "ema_slow": 21}, {"ema_fast": 9, "ema_slow": 34}, {"ema_fast": 21, "ema_slow": 34},
+    ]
+    grid = sweep.parse_grid(["rr_ratio=1.2:2.0:0.4", "ema_fast=13,5"], TradingConfig())
+    assert grid == {"rr_ratio": [1.2, 1.6, 2.0], "ema_fast": [5, 13]}
+
+
+def test_worker_runs_on_memmapped_npy(data, tmp_path, monkeypatch):
+    monkeypatch.setattr(sweep, "_worker", {})
+    paths = sweep._dump(data, tmp_path)
+    sweep._init_worker(TradingConfig(), _STRATEGY, {}, paths)
+
+    for symbol, candles in data.items():
+        mapped = sweep._worker["data"][symbol]
+        assert isinstance(mapped, np.memmap) and not mapped.flags.writeable
+        np.testing.assert_array_equal(mapped, candles)
+    params = {"volume_spike_min": 2.0, "rr_ratio": 2.0}
+    summary = sweep._run_combo(params)
+    assert {**params, **{m: summary[m] for m in sweep.METRICS}} == _serial(data, params)
+
+
+@pytest.mark.parametrize("sort_by", ["avg_pnl", "max_drawdown"])
+def test_sweep_matches_serial_engine_and_ranks(data, sort_by):
+    rows = sweep.ParameterSweep(TradingConfig(), _STRATEGY, processes=2).run(data, _GRID, sort_by=sort_by)
+
+    expected = [_serial(data, params) for params in sweep.expand_grid(_GRID)]
+    assert all(row["trades"] for row in expected)
+    # Python'un kararlı sıralaması: eşit metrikli kombinasyonlar ızgara sırasında kalır
+    expected.sort(key=lambda r: r[sort_by], reverse=sort_by != "max_drawdown")
+    assert rows == expected
+
+
+def test_min_trades_pushes_thin_combos_last(data):
+    serial = {(p["volume_spike_min"], p["rr_ratio"]): _serial(data, p) for p in sweep.expand_grid(_GRID)}
+    threshold = sorted(r["trades"] for r in serial.values())[1] + 1
+
+    rows = sweep.ParameterSweep(TradingConfig(), _STRATEGY, processes=2).run(
+        data, _GRID, sort_by="avg_pnl", min_trades=threshold
+    )
+
+    thin = [r["trades"] < threshold for r in rows]
+    assert any(thin) and not all(thin)
+    assert thin == sorted(thin)
@@ -0,0 +1,91 @@
+"""main.symbol_refresh_loop: sıralamadan düşen sembol pozisyonu kapanana kadar bekletilir."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+
+import main
+from core.config import TradingConfig
+from data.memory_store import MemoryStore
+from execution.position_watcher import PositionWatcher, VirtualPosition
+
+
+class _FakeWs:
+    def __init__(self):
+        self.calls: list[tuple[list[str], set[str]]] = []
+
+    async def update_symbols(self, symbols, price_symbols=()):
+        self.calls.append((list(symbols), set(price_symbols)))
+
+
+def _run_refresh(rounds, watcher, store, monkeypatch, between=None):
+    """Her turda exchangeInfo'nun TRADING listesi olarak ``rounds`` elemanlarını döndürür."""
+    config = replace(TradingConfig(), market_refresh_hours=0, top_volume_limit=2)
+    pending = list(rounds)
+
+    async def _fetch():
+        if between is not None and len(pending) < len(rounds):
+            await between(len(rounds) - len(pending))
+        if not pending:
+            raise asyncio.CancelledError  # döngü temiz çıkar
+        return pending.pop(0)
+
+    async def _preload(symbols, store, **_kwargs):
+        for symbol in symbols:
+            store.load_history_nowait(symbol, "1m", [[0, 1, 1, 1, 1, 1]])
+
+    monkeypatch.setattr(main, "fetch_trading_symbols", _fetch)
+    monkeypatch.setattr(main, "preload_history", _preload)
+    ws = _FakeWs()
+    symbols = ["AUSDT", "BUSDT"]
+    asyncio.run(main.symbol_refresh_loop(config, ws, symbols, store, ["1m"], watcher=watcher))
+    return ws, symbols
+
+
+def _watcher(store, closed):
+    async def _on_close(msg: str) -> None:
+        closed.append(msg)
+
+    watcher = PositionWatcher(replace(TradingConfig(), time_stop_hours=24), store, _on_close)
+    pos = VirtualPosition(1, "BUSDT", "LONG", 100.0, 110.0, 90.0, strategy="s1")
+    watcher._positions[pos.key] = pos
+    return watcher
+
+
+def test_ranking_drop_keeps_position_open_until_it_closes(monkeypatch):
+    store = MemoryStore()
+    for symbol in ("AUSDT", "BUSDT"):
+        store.load_history_nowait(symbol, "1m", [[0, 1, 1, 1, 1, 1]])
+    store.update_price_nowait("BUSDT", 105.0)
+    closed: list[str] = []
+    watcher = _watcher(store, closed)
+
+    async def _between(done_rounds):
+        if done_rounds == 2:
+            # Pozisyon kendi çıkış kuralıyla kapanır
+            await watcher._close_position(watcher._positions[("s1", "BUSDT")], 110.0, "TP")
+
+    # B hâlâ TRADING ama ilk 2'de değil
+    rounds = [["AUSDT", "CUSDT", "BUSDT"]] * 3
+    ws, symbols = _run_refresh(rounds, watcher, store, monkeypatch, between=_between)
+
+    assert symbols == ["AUSDT", "CUSDT"]
+    # İlk iki turda B'nin fiyatı akmaya devam eder, pozisyon kapanınca bırakılır
+    assert [held for _symbols, held in ws.calls] == [{"BUSDT"}, {"BUSDT"}, set()]
+    assert len(closed) == 1 and "TP" in closed[0]
+    assert store.get_candle_count_nowait("BUSDT", "1m") == 0
+    assert store.get_price_nowait("BUSDT") is None
+
+
+def test_delisted_symbol_positions_are_force_closed(monkeypatch):
+    store = MemoryStore()
+    store.update_price_nowait("BUSDT", 95.0)
+    closed: list[str] = []
+    watcher = _watcher(store, closed)
+
+    ws, _symbols = _run_refresh([["AUSDT", "CUSDT"]], watcher, store, monkeypatch)
+
+    assert ws.calls == [(["AUSDT", "CUSDT"], set())]
+    assert watcher.tracked_symbols == set()
+    assert len(closed) == 1 and "DELISTED" in closed[0] and "-5.00%" in closed[0]
+    assert store.get_price_nowait("BUSDT") is None
@@ -0,0 +1,193 @@
+"""data.websocket_client — stream bölme, SUBSCRIBE/UNSUBSCRIBE farkı ve görev denetimi."""
+import asyncio
+import json
+from dataclasses import replace
+
+import websockets
+
+import data.websocket_client as wsc
+from core.config import TradingConfig
+from data.memory_store import MemoryStore
+
+
+class FakeSocket:
+    """Gönderilen kontrol mesajlarını kaydeden sahte soket."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, text):
+        self.sent.append(json.loads(text))
+
+
+def _client(symbols, per_conn=4, timeframes=("1m",)):
+    config = replace(TradingConfig(), ws_streams_per_connection=per_conn, ws_reconnect_delay=0.05)
+    return wsc.BinanceWebSocketClient(config, MemoryStore(maxlen=10), symbols, timeframes=list(timeframes))
+
+
+async def _idle(*_args):
+    await asyncio.Event().wait()
+
+
+def _attach_sockets(client):
+    """Her bağlantıyı mevcut stream listesine abone olmuş sahte bir sokete bağlar."""
+    for conn in client._kline_conns:
+        conn.ws = FakeSocket()
+        conn.live = set(conn.streams)
+        conn.connected = True
+
+
+def _messages(conn, method):
+    return [p for m in conn.ws.sent if m["method"] == method for p in m["params"]]
+
+
+def test_streams_sharded_by_capacity():
+    async def run():
+        client = _client([f"S{i}USDT" for i in range(5)], per_conn=4, timeframes=("1m", "5m"))
+        client._run_kline_stream = _idle
+        client._running = True
+        client._assign_streams()
+        sizes = [len(c.streams) for c in client._kline_conns]
+        for t in client._tasks:
+            t.cancel()
+        return sizes, client._kline_streams()
+
+    sizes, streams = asyncio.run(run())
+    assert sizes == [4, 4, 2]
+    assert streams[:2] == ["s0usdt@kline_1m", "s0usdt@kline_5m"]
+
+
+def test_update_symbols_sends_only_the_diff():
+    async def run():
+        client = _client(["AUSDT", "BUSDT", "CUSDT", "DUSDT", "EUSDT"], per_conn=4)
+        client._run_kline_stream = _idle
+        client._running = True
+        client._assign_streams()
+        _attach_sockets(client)
+        first, second = client._kline_conns
+
+        await client.update_symbols(["AUSDT", "CUSDT", "DUSDT", "EUSDT", "FUSDT", "GUSDT", "HUSDT", "IUSDT"])
+        result = {
+            "first_unsub": _messages(first, "UNSUBSCRIBE"),
+            "first_sub": _messages(first, "SUBSCRIBE"),
+            "second_sub": _messages(second, "SUBSCRIBE"),
+            "second_unsub": _messages(second, "UNSUBSCRIBE"),
+            "streams": [list(c.streams) for c in client._kline_conns],
+            "ids": [m["id"] for c in (first, second) for m in c.ws.sent],
+        }
+        for t in client._tasks:
+            t.cancel()
+        return result
+
+    r = asyncio.run(run())
+    # Kalkan sembol kendi bağlantısından çıkarılır, boşalan yer ilk yeni stream'le dolar
+    assert r["first_unsub"] == ["busdt@kline_1m"]
+    assert r["first_sub"] == ["fusdt@kline_1m"]
+    assert r["second_unsub"] == []
+    assert r["second_sub"] == ["gusdt@kline_1m", "husdt@kline_1m", "iusdt@kline_1m"]
+    # Değişmeyen stream'ler bağlantılarında kalır
+    assert r["streams"] == [
+        ["ausdt@kline_1m", "cusdt@kline_1m", "dusdt@kline_1m", "fusdt@kline_1m"],
+        ["eusdt@kline_1m", "gusdt@kline_1m", "husdt@kline_1m", "iusdt@kline_1m"],
+    ]
+    assert len(set(r["ids"])) == len(r["ids"])
+
+
+def test_update_symbols_overflow_opens_connection_and_syncs_late_socket():
+    async def run():
+        client = _client(["AUSDT", "BUSDT"], per_conn=2)
+        client._run_kline_stream = _idle
+        client._running = True
+        client._assign_streams()
+        _attach_sockets(client)
+        await client.update_symbols(["AUSDT", "BUSDT", "CUSDT", "DUSDT", "EUSDT"])
+        conns = client._kline_conns
+        # Yeni bağlantı henüz bağlanmadı: URL'si güncel listeden kurulacak
+        pending = [list(c.streams) for c in conns[1:]]
+        assert all(c.ws is None for c in conns[1:])
+        # Bağlandıktan sonra gelen güncelleme farkı yeni sokete de uygular
+        conns[1].ws, conns[1].live = FakeSocket(), set(conns[1].streams)
+        await client.update_symbols(["AUSDT", "BUSDT", "CUSDT"])
+        unsub = _messages(conns[1], "UNSUBSCRIBE")
+        for t in client._tasks:
+            t.cancel()
+        return pending, unsub, len(conns[0].ws.sent)
+
+    pending, unsub, first_sent = asyncio.run(run())
+    assert pending == [["cusdt@kline_1m", "dusdt@kline_1m"], ["eusdt@kline_1m"]]
+    assert unsub == ["dusdt@kline_1m"]
+    assert first_sent == 0
+
+
+def test_untracked_and_control_frames_are_ignored():
+    async def run():
+        client = _client(["AUSDT"])
+        store = client._store
+        frame = {"stream": "x", "data": {"E": 5, "k": {
+            "t": 0, "s": "BUSDT", "i": "1m", "o": "1", "h": "1", "l": "1", "c": "1", "v": "1", "x": True,
+        }}}
+        assert await client._handle_kline_msg(json.dumps(frame)) is None
+        assert await client._handle_kline_msg(json.dumps({"result": None, "id": 1})) is None
+        frame["data"]["k"]["s"] = "AUSDT"
+        assert await client._handle_kline_msg(json.dumps(frame)) == 5
+        return store.get_candle_count_nowait("BUSDT", "1m"), store.get_candle_count_nowait("AUSDT", "1m")
+
+    assert asyncio.run(run()) == (0, 1)
+
+
+def test_price_only_symbols_keep_mark_price_without_klines():
+    async def run():
+        client = _client(["AUSDT", "BUSDT"])
+        await client.update_symbols(["AUSDT"], price_symbols=["BUSDT"])
+        marks = [{"s": s, "p": "2.5", "E": 7} for s in ("AUSDT", "BUSDT", "CUSDT")]
+        await client._handle_mark_price_msg(json.dumps(marks))
+        frame = {"stream": "x", "data": {"E": 5, "k": {
+            "t": 0, "s": "BUSDT", "i": "1m", "o": "1", "h": "1", "l": "1", "c": "1", "v": "1", "x": True,
+        }}}
+        await client._handle_kline_msg(json.dumps(frame))
+        return client._store, client._kline_streams()
+
+    store, streams = asyncio.run(run())
+    assert store.get_all_prices_nowait() == {"AUSDT": 2.5, "BUSDT": 2.5}
+    assert store.get_candle_count_nowait("BUSDT", "1m") == 0
+    assert streams == ["ausdt@kline_1m"]
+
+
+def test_failed_shard_added_after_start_is_restarted(monkeypatch):
+    """update_symbols ile sonradan açılan bağlantı çökerse loglanıp yeniden başlatılır."""
+
+    async def serve(ws):
+        async for _ in ws:   # bağlantı kapanınca döner
+            pass
+
+    async def run():
+        server = await websockets.serve(serve, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        monkeypatch.setattr(wsc, "_WS_BASE", f"ws://127.0.0.1:{port}")
+        client = _client(["AUSDT"], per_conn=1)
+        original = client._run_kline_stream
+        calls = []
+
+        async def flaky(conn):
+            calls.append(conn.name)
+            if conn.name == "kline-1" and calls.count("kline-1") == 1:
+                raise RuntimeError("boom")
+            await original(conn)
+
+        client._run_kline_stream = flaky
+        task = asyncio.create_task(client.start())
+        await asyncio.sleep(0.1)
+        await client.update_symbols(["AUSDT", "BUSDT"])
+        await asyncio.sleep(0.4)
+        names = sorted(t.get_name() for t in client._tasks)
+        connected = [c.connected for c in client._kline_conns]
+        await client.stop()
+        await asyncio.wait_for(task, 2)
+        server.close()
+        await server.wait_closed()
+        return calls, names, connected
+
+    calls, names, connected = asyncio.run(run())
+    assert calls.count("kline-1") == 2
+    assert "ws_kline-1" in names
+    assert connected == [True, True]